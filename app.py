@@ -4,8 +4,11 @@ import plotly.express as px
 import plotly.graph_objects as go
 import os
 from dotenv import load_dotenv
-from src.loader import load_all_salaries
+from src.loader import load_all_salaries, load_category_index, load_results_cube
 from src.logic import calculate_taxes, project_savings, calculate_thriving_score, format_currency, project_5yr_wealth
+from src.logic import score_dataframe, project_wealth_timeline, lookup_results, GROWTH_SCENARIOS
+from src.simulation import simulate_wealth
+from src.utils.keyword_matcher import career_match, get_career_scorer, keywords_for_career
 
 # Load environment variables from .env file
 load_dotenv()
@@ -16,6 +19,8 @@ st.set_page_config(page_title="NextStep", page_icon="🎓", layout="wide")
 # --- LOAD DATA ---
 try:
     df = load_all_salaries()
+    category_index = load_category_index()
+    results_cube = load_results_cube()
     if df.empty:
         st.error("⚠️ No data loaded. Please check your data source.")
         st.stop()
@@ -68,7 +73,7 @@ with st.sidebar:
     st.write("Plan your life after the cap and gown.")
     
     # Get available categories from data
-    available_categories = df['Category'].unique()
+    available_categories = list(category_index.keys())
     selected_category = st.selectbox("Select your Career Path", available_categories)
     debt = st.number_input("Student Loan Debt ($)", min_value=0, max_value=500000, value=30000, step=1000)
     lifestyle = st.select_slider("Lifestyle Preference", options=["Frugal", "Balanced", "Boujee"])
@@ -84,18 +89,59 @@ with st.sidebar:
         
         # If resume is uploaded, trigger AI analysis
         if uploaded_file is not None:
-            with st.spinner("🤖 AI is analyzing your resume..."):
+            with st.status("🤖 AI is analyzing your resume...", expanded=True) as ai_status:
                 try:
-                    from src.utils.resume_parser import parse_resume_with_ai
+                    from src.utils.agent_runner import stream_agents
                     
                     api_key = os.getenv('GEMINI_API_KEY')
                     if not api_key:
-                        st.warning("⚠️ API key not found. Resume analysis will be limited.")
-                        st.session_state['ai_results'] = None
+                        # Offline mode: local rule-based parse only
+                        from src.utils.resume_parser import parse_resume_with_ai
+                        st.warning("⚠️ API key not found. Using offline resume analysis.")
+                        st.session_state['ai_results'] = parse_resume_with_ai(uploaded_file, offline=True)
+                        st.session_state['show_results'] = True
                     else:
-                        # Run AI analysis
-                        ai_results = parse_resume_with_ai(uploaded_file, api_key)
-                        st.session_state['ai_results'] = ai_results
+                        # Run resume analysis, suggestions, Reality Check and career advice concurrently,
+                        # rendering each piece the moment it streams in
+                        agent_city = category_index[selected_category]['top']['City']
+                        field_labels = {
+                            'personal_info': "👤 Contact info",
+                            'education': "🎓 Education",
+                            'experience': "💼 Experience",
+                            'technical_skills': "🛠️ Technical skills",
+                            'soft_skills': "🤝 Soft skills",
+                            'career_summary': "📝 Career summary",
+                            'recommended_roles': "🎯 Recommended roles",
+                            'skill_level': "📈 Skill level"
+                        }
+                        fields_box = st.empty()
+                        reality_box = st.empty()
+                        advice_box = st.empty()
+                        fields_done, streamed_text = [], {'reality_check': "", 'career_advice': ""}
+                        agent_results = None
+                        
+                        for event, payload in stream_agents(
+                            uploaded_file, city=agent_city, debt=debt, lifestyle=lifestyle, api_key=api_key
+                        ):
+                            if event == 'resume_field':
+                                if payload[0] in field_labels:
+                                    fields_done.append(f"✅ {field_labels[payload[0]]}")
+                                    fields_box.markdown("  \n".join(fields_done))
+                            elif event == 'reality_check':
+                                streamed_text['reality_check'] += payload
+                                reality_box.info(f"**🧐 Reality Check:** {streamed_text['reality_check']}")
+                            elif event == 'career_advice':
+                                streamed_text['career_advice'] += payload
+                                advice_box.markdown(f"**🧭 Career Coach:**\n\n{streamed_text['career_advice']}")
+                            elif event == 'done':
+                                agent_results = payload
+                        
+                        ai_status.update(label="✅ AI analysis complete", state="complete", expanded=False)
+                        st.session_state['ai_results'] = agent_results['resume']
+                        st.session_state['resume_suggestions'] = agent_results['suggestions']
+                        st.session_state['reality_check'] = agent_results['reality_check']
+                        st.session_state['career_advice'] = agent_results['career_advice']
+                        st.session_state['agent_city'] = agent_city
                         st.session_state['show_results'] = True
                 except Exception as e:
                     st.error(f"❌ AI Analysis failed: {e}")
@@ -105,31 +151,35 @@ with st.sidebar:
             st.session_state['show_results'] = True
 
 # --- FILTER DATA BASED ON SELECTION ---
-filtered_data = df[df['Category'] == selected_category].copy()
+# O(1) lookup into the prebuilt per-career index (rows sorted by salary, indexed by City)
+category_entry = category_index.get(selected_category)
 
 # Check if filtered data is empty
-if filtered_data.empty:
+if category_entry is None:
     st.error(f"⚠️ No data found for {selected_category}. Please select a different career path.")
     st.stop()
 
+filtered_data = category_entry['frame']
+
 # --- DYNAMIC METRICS CALCULATION ---
 # Find the city with highest salary
-top_city_row = filtered_data.loc[filtered_data['Salary'].idxmax()]
+top_city_row = category_entry['top']
 top_city = top_city_row['City']
 top_city_salary = top_city_row['Salary']
 top_city_state = top_city_row['State']
 top_city_rent = top_city_row['Rent']
 top_city_col = top_city_row['COL']
-avg_salary = filtered_data['Salary'].mean()
+avg_salary = category_entry['avg_salary']
 
 # Calculate 5-year wealth for the top city
-top_city_monthly_net = calculate_taxes(top_city_salary, top_city_state)
+top_city_monthly_net = calculate_taxes(top_city_salary, top_city_state, top_city)
 wealth_5yr = project_5yr_wealth(top_city_monthly_net, top_city_rent, top_city_col)
 
+# Score every city for this role in one batched pass
+scored_data = score_dataframe(filtered_data)
+
 # Calculate average monthly savings across all cities for this role
-avg_monthly_net = filtered_data.apply(
-    lambda row: calculate_taxes(row['Salary'], row['State']), axis=1
-).mean()
+avg_monthly_net = scored_data['Monthly_Net'].mean()
 avg_savings_estimate = int(avg_monthly_net - filtered_data['Rent'].mean() - 1500)  # 1500 = avg expenses
 
 # For display purposes
@@ -232,7 +282,7 @@ with tab1:
     map_data = filtered_data
     
     # Get top city from filtered data
-    top_row = filtered_data.loc[filtered_data['Salary'].idxmax()]
+    top_row = category_entry['top']
     spotlight_city = top_row['City']
     spotlight_salary = f"${top_row['Salary']:,.0f}"
     spotlight_text = f"Highest salary for {selected_category}: **{spotlight_salary}/year**"
@@ -298,38 +348,23 @@ with tab1:
 with tab2:
     st.subheader("Financial Reality Check")
     
-    # Add city selector for deep dive analysis
-    target_city = st.selectbox('🎯 Analyze a City', filtered_data['City'].unique())
-    
-    # Get the specific city data
-    city_data = filtered_data[filtered_data['City'] == target_city].iloc[0]
+    if st.session_state.get('reality_check'):
+        st.info(f"**🧐 Big Sibling's Take on {st.session_state.get('agent_city', 'Your Top City')}:** "
+                f"{st.session_state['reality_check']}")
     
-    # Extract city-specific values
-    city_salary = city_data['Salary']
-    city_rent = city_data['Rent']
-    city_state = city_data['State']
-    city_col = city_data['COL']
-    
-    # Calculate real financial metrics using logic functions
-    monthly_net = calculate_taxes(city_salary, city_state)
-    
-    # Estimate monthly loan payment (10-year standard repayment)
-    monthly_loan_payment = (debt / 10000) * 115
-    
-    # Estimate lifestyle costs based on user's preference
-    lifestyle_costs = {
-        'Frugal': 900,
-        'Balanced': 1700,
-        'Boujee': 3000
-    }
-    lifestyle_cost = lifestyle_costs.get(lifestyle, 1700)
-    
-    # Calculate projected savings
-    monthly_savings = project_savings(monthly_net, city_rent, monthly_loan_payment, lifestyle_cost)
-    
-    # Calculate taxes paid (for donut chart)
-    gross_monthly = city_salary / 12
-    taxes_paid = gross_monthly - monthly_net
+    # Add city selector for deep dive analysis
+    # Options are "City, ST" keys, unique even when city names repeat
+    target_city = st.selectbox('🎯 Analyze a City', filtered_data.index)
+    
+    # Every number below is an index into the precomputed results cube
+    # (built once per dataset version), not a recomputation
+    budget = lookup_results(results_cube, selected_category, target_city, lifestyle, debt)
+    city_rent = budget['Rent']
+    monthly_net = budget['Monthly_Net']
+    monthly_loan_payment = budget['Loan_Payment']
+    lifestyle_cost = budget['Lifestyle_Cost']
+    monthly_savings = budget['Monthly_Savings']
+    taxes_paid = budget['Taxes']
     
     left_col, right_col = st.columns([1, 1])
     
@@ -412,6 +447,63 @@ with tab2:
         st.checkbox("✅ Investment Portfolio Started", value=False)
         st.checkbox("✅ Health Insurance Secured", value=True)
 
+    st.divider()
+
+    # --- LONG-TERM WEALTH OUTLOOK ---
+    st.markdown("### 📈 Long-Term Wealth Outlook")
+    horizon = st.select_slider("Projection Horizon (years)", options=[5, 10, 20, 30], value=10)
+
+    # One batched projection for every city x scenario x year
+    scenario_names = list(GROWTH_SCENARIOS.keys())
+    wealth_grid = project_wealth_timeline(
+        scored_data['Monthly_Net'], scored_data['Rent'], scored_data['COL'],
+        years=horizon, scenarios=GROWTH_SCENARIOS
+    )
+    city_idx = filtered_data.index.get_loc(target_city)
+    city_curves = wealth_grid[:, city_idx, :]
+    years_axis = list(range(1, horizon + 1))
+
+    fig_outlook = go.Figure()
+    fig_outlook.add_trace(go.Scatter(
+        x=years_axis, y=city_curves[scenario_names.index('Optimistic')],
+        line=dict(width=0), showlegend=False, hoverinfo='skip'
+    ))
+    fig_outlook.add_trace(go.Scatter(
+        x=years_axis, y=city_curves[scenario_names.index('Pessimistic')],
+        fill='tonexty', fillcolor='rgba(0, 217, 255, 0.2)', line=dict(width=0),
+        name='Pessimistic – Optimistic'
+    ))
+    fig_outlook.add_trace(go.Scatter(
+        x=years_axis, y=city_curves[scenario_names.index('Expected')],
+        line=dict(color='#00D9FF', width=3), name='Expected'
+    ))
+    fig_outlook.update_layout(
+        height=400,
+        paper_bgcolor='#0E1117',
+        plot_bgcolor='#0E1117',
+        font=dict(color='white'),
+        xaxis_title='Year',
+        yaxis_title='Cumulative Wealth ($)',
+        title=f"{horizon}-Year Wealth in {target_city}"
+    )
+    st.plotly_chart(fig_outlook, use_container_width=True)
+
+    # --- MONTE CARLO MODE ---
+    with st.expander("🎲 Monte Carlo: How sure is this?"):
+        st.caption("Simulates random raises, rent shocks and market returns for every city at once. "
+                   "Long horizons run fewer paths to stay fast.")
+        n_paths = st.select_slider("Simulated Paths", options=[10_000, 50_000, 100_000], value=100_000)
+
+        if st.button("Run Simulation"):
+            bands = simulate_wealth(
+                scored_data['Monthly_Net'], scored_data['Rent'], scored_data['COL'],
+                years=horizon, n_paths=n_paths, seed=42
+            )
+            mc_col1, mc_col2, mc_col3 = st.columns(3)
+            mc_col1.metric("Bad Luck (P10)", f"${bands['P10'][city_idx, -1]:,.0f}", f"after {horizon} years")
+            mc_col2.metric("Typical (P50)", f"${bands['P50'][city_idx, -1]:,.0f}", f"after {horizon} years")
+            mc_col3.metric("Good Luck (P90)", f"${bands['P90'][city_idx, -1]:,.0f}", f"after {horizon} years")
+
 
 # ========== TAB 3: RESUME PIVOT ==========
 with tab3:
@@ -445,21 +537,19 @@ with tab3:
             for rec in ai_data['recommendations'][:5]:  # Show top 5
                 st.write(f"• {rec}")
         
+        if st.session_state.get('career_advice'):
+            st.markdown(f"### 🧭 Career Coach: Your Pivot in {st.session_state.get('agent_city', 'Your Top City')}")
+            st.markdown(st.session_state['career_advice'])
+        
+        if st.session_state.get('resume_suggestions'):
+            st.markdown("### ✍️ Resume Improvements")
+            for suggestion in st.session_state['resume_suggestions'][:5]:
+                st.write(f"• {suggestion}")
+        
         st.divider()
     
-    # Hardcoded dictionary of hot keywords for STEM careers
-    STEM_KEYWORDS = {
-        'Data Scientist': ['Python', 'SQL', 'TensorFlow', 'Machine Learning', 'Pandas', 'NumPy', 'Scikit-learn', 'Statistics', 'A/B Testing', 'PyTorch'],
-        'Cybersecurity Analyst': ['Firewalls', 'Penetration Testing', 'Security', 'SIEM', 'Risk Assessment', 'Encryption', 'Network Security', 'Incident Response', 'Compliance', 'Threat Analysis'],
-        'Software Engineer': ['Python', 'Java', 'JavaScript', 'React', 'Node.js', 'Git', 'API', 'AWS', 'Docker', 'Agile'],
-        'Machine Learning Engineer': ['Python', 'TensorFlow', 'PyTorch', 'Deep Learning', 'Neural Networks', 'MLOps', 'Kubernetes', 'Model Deployment', 'Computer Vision', 'NLP'],
-        'Cloud Architect': ['AWS', 'Azure', 'GCP', 'Kubernetes', 'Docker', 'Terraform', 'CI/CD', 'Microservices', 'Cloud Security', 'DevOps'],
-        'Data Engineer': ['Python', 'SQL', 'Spark', 'Hadoop', 'ETL', 'Data Pipeline', 'Airflow', 'Kafka', 'Snowflake', 'BigQuery'],
-        'DevOps Engineer': ['Docker', 'Kubernetes', 'Jenkins', 'CI/CD', 'Linux', 'Terraform', 'Ansible', 'Git', 'AWS', 'Monitoring']
-    }
-    
     # Get relevant keywords for selected career
-    relevant_keywords = STEM_KEYWORDS.get(selected_category, ['Python', 'SQL', 'Git', 'Communication', 'Problem Solving'])
+    relevant_keywords = keywords_for_career(selected_category)
     
     if uploaded_file is not None:
         st.success(f"✅ Resume uploaded: **{uploaded_file.name}**")
@@ -467,11 +557,9 @@ with tab3:
         # Try to extract text from PDF
         resume_text = ""
         try:
-            # Attempt to use pypdf if available
-            import pypdf
-            pdf_reader = pypdf.PdfReader(uploaded_file)
-            for page in pdf_reader.pages:
-                resume_text += page.extract_text().upper()
+            # Same cached extraction the AI parser used for this upload
+            from src.utils.pdf_text import extract_pdf_text
+            resume_text = extract_pdf_text(uploaded_file).normalized
         except ImportError:
             # Fallback: Mock resume text for demo if pypdf not installed
             st.info("📝 Using demo analysis mode (install pypdf for real PDF parsing)")
@@ -485,6 +573,20 @@ with tab3:
             st.warning(f"Could not parse PDF: {e}. Using demo mode.")
             resume_text = "PYTHON SQL AWS DOCKER GIT".upper()
         
+        # Score every career once per resume (keyword lists only for the top 3
+        # shown below); switching careers is then one matrix row
+        scorer = get_career_scorer()
+        match_key = hash(resume_text)
+        if st.session_state.get('career_match_key') != match_key:
+            st.session_state['career_matches'] = scorer.rank(resume_text, top_n=3)
+            st.session_state['career_match_key'] = match_key
+        career_matches = st.session_state['career_matches']
+        
+        selected_match = scorer.match(career_matches['found'], selected_category) or \
+            career_match(career_matches['found'], relevant_keywords)
+        found_keywords = selected_match['found']
+        missing_keywords = selected_match['missing']
+        
         st.divider()
         
         # Keyword Analysis Section
@@ -494,11 +596,8 @@ with tab3:
             st.markdown("### 🎯 Keywords Found")
             st.caption("Skills detected in your resume")
             
-            found_keywords = []
-            for keyword in relevant_keywords:
-                if keyword.upper() in resume_text:
-                    found_keywords.append(keyword)
-                    st.markdown(f"<div style='background-color: #1a4d2e; padding: 8px; margin: 4px 0; border-radius: 5px; border-left: 4px solid #00ff88;'>✅ <b>{keyword}</b> detected</div>", unsafe_allow_html=True)
+            for keyword in found_keywords:
+                st.markdown(f"<div style='background-color: #1a4d2e; padding: 8px; margin: 4px 0; border-radius: 5px; border-left: 4px solid #00ff88;'>✅ <b>{keyword}</b> detected</div>", unsafe_allow_html=True)
             
             if not found_keywords:
                 st.warning("No keywords detected. Make sure your resume includes technical skills!")
@@ -507,11 +606,8 @@ with tab3:
             st.markdown("### 📈 Skills to Add")
             st.caption("Boost your resume with these")
             
-            missing_keywords = []
-            for keyword in relevant_keywords:
-                if keyword.upper() not in resume_text:
-                    missing_keywords.append(keyword)
-                    st.markdown(f"<div style='background-color: #4d1a1a; padding: 8px; margin: 4px 0; border-radius: 5px; border-left: 4px solid #ff4444;'>❌ <b>{keyword}</b> - Recommended</div>", unsafe_allow_html=True)
+            for keyword in missing_keywords:
+                st.markdown(f"<div style='background-color: #4d1a1a; padding: 8px; margin: 4px 0; border-radius: 5px; border-left: 4px solid #ff4444;'>❌ <b>{keyword}</b> - Recommended</div>", unsafe_allow_html=True)
             
             if not missing_keywords:
                 st.success("🎉 You have all the key skills!")
@@ -520,17 +616,21 @@ with tab3:
         
         # Analysis Summary
         st.markdown("### 📊 Analysis Summary")
-        match_percentage = (len(found_keywords) / len(relevant_keywords)) * 100 if relevant_keywords else 0
+        # Headline numbers use the weighted score; raw keyword counts are
+        # labelled as counts so the two never look like competing scores
+        match_percentage = selected_match['score']
+        keyword_count = f"{len(found_keywords)}/{len(found_keywords) + len(missing_keywords)} keywords"
         
         col1, col2, col3 = st.columns(3)
-        col1.metric("Keywords Found", f"{len(found_keywords)}/{len(relevant_keywords)}", f"{match_percentage:.0f}% match")
+        col1.metric("Weighted Skill Match", f"{match_percentage:.0f}%", keyword_count, delta_color="off")
         col2.metric("Skills Gap", len(missing_keywords), "to learn")
         col3.metric("Career Fit", "Strong" if match_percentage > 60 else ("Medium" if match_percentage > 30 else "Growing"), 
                    "🎯" if match_percentage > 60 else "📈")
         
         # Progress bar
         st.progress(match_percentage / 100)
-        st.caption(f"Your resume matches {match_percentage:.0f}% of key skills for {selected_category} roles")
+        st.caption(f"Your resume covers {match_percentage:.0f}% of the weighted key skills for "
+                   f"{selected_category} roles ({keyword_count} found)")
         
         # Action items
         if missing_keywords:
@@ -542,7 +642,13 @@ with tab3:
                 st.write("- Online courses: Coursera, Udemy, freeCodeCamp")
                 st.write("- Practice projects: GitHub, Kaggle, personal portfolio")
                 st.write("- Certifications: AWS, Google Cloud, CompTIA")
-    
+
+        # Ranked fit across every career from the same scan
+        st.markdown("### 🏆 Best-Fit Career Paths")
+        for rank, entry in enumerate(career_matches['ranking'][:3], 1):
+            st.write(f"{rank}. **{entry['career']}** - {entry['score']:.0f}% weighted match "
+                     f"({len(entry['found'])}/{len(entry['found']) + len(entry['missing'])} keywords)")
+
     else:
         # No file uploaded - show prompt
         st.warning("📄 Upload your resume in the sidebar to get an instant keyword analysis!")
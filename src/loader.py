@@ -1,6 +1,16 @@
 # src/loader.py
+import hashlib
+import json
+import logging
+import os
+import threading
 import pandas as pd
-import streamlit as st
+
+from src.logic import build_results_cube, city_key
+from src.model import MODEL_PATH, get_model_service
+from src.model_artifact import METADATA_FILE, ArtifactError
+
+logger = logging.getLogger(__name__)
 
 # --- CONFIGURATION ---
 CAREER_BASE_SALARIES = {
@@ -42,29 +52,376 @@ BASE_CITIES = [
     {'City': 'Ann Arbor', 'State': 'MI', 'Tier': 4, 'Lat': 42.28, 'Lon': -83.74, 'Rent': 1800, 'COL': 68},
 ]
 
-@st.cache_data
+# Typed columns for the city x career grid
+GRID_DTYPES = {
+    'City': 'category',
+    'State': 'category',
+    'Lat': 'float32',
+    'Lon': 'float32',
+    'Rent': 'int32',
+    'COL': 'int16',
+    'Category': 'category',
+    'Salary': 'int32'
+}
+
+DATA_DIR = 'data'
+SALARIES_CSV = os.path.join(DATA_DIR, 'salaries.csv')
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def model_signature(model_path=MODEL_PATH):
+    """
+    sha256 of the salary model's metadata (which records every file's
+    checksum), or None if no model has been trained.
+    """
+    try:
+        return _file_sha256(os.path.join(model_path, METADATA_FILE))
+    except OSError:
+        return None
+
+
+def _grid_signature(csv_hash=None, model_hash=None):
+    """
+    Short hash of the inputs the grid is built from, so a persisted grid is
+    rebuilt whenever the constants above, data/salaries.csv or the salary
+    model change.
+    """
+    inputs = json.dumps([CAREER_BASE_SALARIES, TIER_MULTIPLIERS, BASE_CITIES, GRID_DTYPES, csv_hash, model_hash],
+                        sort_keys=True)
+    return hashlib.sha256(inputs.encode()).hexdigest()[:12]
+
+
+def grid_path(csv_hash=None, model_hash=None):
+    return os.path.join(DATA_DIR, f"salary_grid-{_grid_signature(csv_hash, model_hash)}.parquet")
+
+
+def build_salary_grid():
+    """
+    Generates the Cross-Product of Cities X Careers with vectorized merges.
+
+    Returns:
+        pd.DataFrame: One typed row per (city, career)
+    """
+    cities = pd.DataFrame(BASE_CITIES)
+    careers = pd.DataFrame({
+        'Category': list(CAREER_BASE_SALARIES.keys()),  # Replaces 'Role'
+        'Base_Salary': list(CAREER_BASE_SALARIES.values())
+    })
+
+    grid = cities.merge(careers, how='cross')
+
+    # Calculate Localized Salary
+    tier_adjust = grid['Tier'].map(TIER_MULTIPLIERS).fillna(1.0)
+    grid['Salary'] = grid['Base_Salary'] * tier_adjust
+
+    return grid[list(GRID_DTYPES)].astype(GRID_DTYPES)
+
+
+def apply_model_salaries(grid, service):
+    """
+    Replace grid salaries with the salary model's predictions.
+
+    The whole grid is scored in one batched predict() call. Only rows whose
+    career and state both appear in the model's training data are replaced;
+    the model works per state, so cities in the same state share a salary.
+
+    Args:
+        grid: City x career grid
+        service: SalaryModelService (see get_model_service())
+
+    Returns:
+        pd.DataFrame: The grid with model salaries where the model applies
+    """
+    categories = service.load().metadata['categories']
+    pairs = pd.DataFrame({'Role': grid['Category'].astype(str), 'State': grid['State'].astype(str)})
+    known = (pairs['Role'].isin(categories['Role']) & pairs['State'].isin(categories['State'])).to_numpy()
+    if not known.any():
+        return grid
+
+    grid = grid.copy()
+    grid.loc[known, 'Salary'] = service.predict(pairs[known]).astype(grid['Salary'].dtype)
+    return grid
+
+
+def read_salary_csv(file_path=SALARIES_CSV):
+    """
+    Read a salaries CSV straight into typed columns.
+
+    Only the columns present in GRID_DTYPES get a dtype, so partial files
+    (e.g. just Category, City, Salary) load too.
+    """
+    header = pd.read_csv(file_path, nrows=0).columns
+    dtypes = {col: dtype for col, dtype in GRID_DTYPES.items() if col in header}
+    return pd.read_csv(file_path, dtype=dtypes)
+
+
+def apply_salary_csv(grid, salaries):
+    """
+    Combine the built grid with a salaries CSV.
+
+    A CSV with every grid column replaces the grid outright; a partial one
+    (Category, City, State, Salary) overrides the matching grid salaries.
+    State is part of the match when present, since city names repeat across
+    states (Columbus, OH / Columbus, GA).
+    """
+    if set(GRID_DTYPES).issubset(salaries.columns):
+        return salaries[list(GRID_DTYPES)].astype(GRID_DTYPES)
+
+    keys = [col for col in ('City', 'State', 'Category') if col in salaries.columns]
+    overrides = salaries[keys + ['Salary']].astype(str).astype({'Salary': 'float64'})
+    merged = grid.astype({key: str for key in keys}).merge(
+        overrides, on=keys, how='left', suffixes=('', '_csv')
+    )
+    merged['Salary'] = merged['Salary_csv'].fillna(merged['Salary'])
+    return merged[list(GRID_DTYPES)].astype(GRID_DTYPES)
+
+
+def load_dataset(csv_hash=None, model_hash=None):
+    """
+    Load the city x career grid from its Parquet file, building and
+    persisting it first if needed (grids from older inputs are deleted).
+
+    Parquet keeps the column types (categoricals included) and is read with
+    memory mapping, so large grids load without a CSV parse. If no Parquet
+    engine (pyarrow) is installed, or the file cannot be written (e.g. a
+    read-only data/ directory), the grid is just built in memory. A
+    salaries.csv that cannot be read or applied is skipped with a warning.
+
+    Args:
+        csv_hash: sha256 of data/salaries.csv if it exists (mixed into the
+                  Parquet file name so CSV edits produce a fresh grid)
+        model_hash: model_signature() if a salary model was trained; its
+                    predictions then replace the built-in salaries (the
+                    CSV still overrides both)
+
+    Returns:
+        pd.DataFrame: Typed city x career grid
+    """
+    csv_failed = False
+
+    def build():
+        nonlocal csv_failed
+        grid = build_salary_grid()
+        if model_hash is not None:
+            try:
+                grid = apply_model_salaries(grid, get_model_service())
+            except (ArtifactError, ValueError, KeyError) as e:
+                logger.warning("Salary model not applied to the grid: %s", e)
+        if csv_hash is not None:
+            try:
+                grid = apply_salary_csv(grid, read_salary_csv(SALARIES_CSV))
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                # A malformed CSV must not take the app down
+                logger.warning("Could not apply %s, using the built-in grid: %s", SALARIES_CSV, e)
+                csv_failed = True
+        return grid
+
+    path = grid_path(csv_hash, model_hash)
+    try:
+        if os.path.exists(path):
+            return pd.read_parquet(path, memory_map=True)
+    except ImportError:
+        return build()
+
+    grid = build()
+    if csv_failed:
+        # Not the grid this signature stands for, so don't persist it
+        return grid
+
+    # The Parquet file is only a cache: a read-only data/ must not stop the app
+    tmp_path = f"{path}.tmp"
+    try:
+        grid.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    except ImportError:
+        pass
+    except OSError as e:
+        logger.warning("Could not write grid cache %s: %s", path, e)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    else:
+        _remove_stale_grids(path)
+    return grid
+
+
+def _remove_stale_grids(keep):
+    """Delete persisted grids built from older inputs"""
+    directory = os.path.dirname(keep)
+    for name in os.listdir(directory):
+        stale = os.path.join(directory, name)
+        if name.startswith('salary_grid-') and name.endswith('.parquet') and stale != keep:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+
+def build_category_index(df):
+    """
+    Pre-split the grid per career so widget changes are dict lookups.
+
+    Args:
+        df: City x career grid
+
+    Returns:
+        dict: {category: {'frame': rows sorted by Salary (highest first) and
+                                   indexed by city_key() ("City, ST"; city
+                                   names alone repeat across states),
+                          'top': highest-salary row,
+                          'avg_salary': mean salary}}
+    """
+    index = {}
+    for category, frame in df.groupby('Category', observed=True, sort=False):
+        frame = frame.sort_values('Salary', ascending=False, kind='stable')
+        frame.index = pd.Index(city_key(frame['City'], frame['State']), name=None)
+        index[category] = {
+            'frame': frame,
+            'top': frame.iloc[0],
+            'avg_salary': frame['Salary'].mean()
+        }
+    return index
+
+
+class DatasetCache:
+    """
+    One read-only copy of the dataset shared by every Streamlit session.
+
+    st.cache_data pickles the cached DataFrame and hands each caller its own
+    copy; this hands out shallow views of a single DataFrame instead. pandas 3
+    always uses copy-on-write (requirements.txt pins pandas>=3), so writes to
+    a view never reach the shared data.
+    data/salaries.csv is checked on every get(): a changed mtime/size
+    triggers a hash comparison, and a changed hash reloads the grid.
+    """
+
+    def __init__(self, watch_path=SALARIES_CSV):
+        self.watch_path = watch_path
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.version = 0
+        self._df = None
+        self._stat = None
+        self._hash = None
+        self._index = None
+        self._index_version = None
+        self._cube = None
+        self._cube_version = None
+        self._lock = threading.Lock()
+
+    def _current_stat(self):
+        try:
+            info = os.stat(self.watch_path)
+        except FileNotFoundError:
+            return None
+        return (info.st_mtime_ns, info.st_size)
+
+    def _load(self, stat):
+        self._hash = _file_sha256(self.watch_path) if stat is not None else None
+        self._df = load_dataset(self._hash, model_signature())
+        self._stat = stat
+        self.version += 1
+
+    def _refresh(self):
+        stat = self._current_stat()
+        if self._df is None:
+            self.misses += 1
+            self._load(stat)
+        elif stat != self._stat:
+            new_hash = _file_sha256(self.watch_path) if stat is not None else None
+            if new_hash != self._hash:
+                self.reloads += 1
+                self._load(stat)
+            else:
+                # Touched but unchanged
+                self._stat = stat
+                self.hits += 1
+        else:
+            self.hits += 1
+
+    def get(self):
+        """
+        Returns:
+            pd.DataFrame: Zero-copy view of the shared dataset
+        """
+        with self._lock:
+            self._refresh()
+            return self._df.copy(deep=False)
+
+    def get_index(self):
+        """
+        Returns:
+            dict: build_category_index() of the current dataset, rebuilt only
+                  when the dataset is reloaded. Each call gets its own dict
+                  of zero-copy views, so callers cannot modify the shared
+                  frames (see get()).
+        """
+        with self._lock:
+            self._refresh()
+            if self._index_version != self.version:
+                self._index = build_category_index(self._df)
+                self._index_version = self.version
+            return {
+                category: dict(entry, frame=entry['frame'].copy(deep=False), top=entry['top'].copy(deep=False))
+                for category, entry in self._index.items()
+            }
+
+    def get_results_cube(self):
+        """
+        Returns:
+            dict: build_results_cube() of the current dataset, rebuilt only
+                  when the dataset is reloaded. Shared: treat as read-only.
+        """
+        with self._lock:
+            self._refresh()
+            if self._cube_version != self.version:
+                self._cube = build_results_cube(self._df)
+                self._cube_version = self.version
+            return self._cube
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'reloads': self.reloads,
+            'version': self.version
+        }
+
+
+# Module-level singleton: Streamlit re-runs app.py on every interaction but
+# keeps imported modules, so every session in the process shares this cache.
+_dataset_cache = DatasetCache()
+
+
+def get_dataset_cache():
+    return _dataset_cache
+
+
 def load_all_salaries():
     """
     Generates the Cross-Product of Cities X Careers.
     """
-    data = []
-    
-    for city in BASE_CITIES:
-        for career, base_salary in CAREER_BASE_SALARIES.items():
-            
-            # Calculate Localized Salary
-            tier_adjust = TIER_MULTIPLIERS.get(city['Tier'], 1.0)
-            projected_salary = int(base_salary * tier_adjust)
-            
-            data.append({
-                'City': city['City'],
-                'State': city['State'],
-                'Lat': city['Lat'],
-                'Lon': city['Lon'],
-                'Rent': city['Rent'],
-                'COL': city['COL'],
-                'Category': career,        # Replaces 'Role'
-                'Salary': projected_salary
-            })
-            
-    return pd.DataFrame(data)
\ No newline at end of file
+    return _dataset_cache.get()
+
+
+def load_category_index():
+    """
+    Per-career index of the shared dataset (see build_category_index).
+    """
+    return _dataset_cache.get_index()
+
+
+def load_results_cube():
+    """
+    Budget Lab results cube of the shared dataset (see build_results_cube).
+    """
+    return _dataset_cache.get_results_cube()
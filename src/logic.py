@@ -1,14 +1,47 @@
 # src/logic.py
+import numpy as np
+
+from src.taxes import get_tax_tables
+
+LIFESTYLE_COSTS = {
+    'Frugal': 800,
+    'Balanced': 1500,
+    'Boujee': 2500
+}
+
+# Growth assumptions used by project_5yr_wealth
+DEFAULT_GROWTH = {
+    'raise': 0.05,              # Annual salary raise
+    'rent_inflation': 0.03,     # Annual rent increase
+    'expense_inflation': 0.03,  # Annual living expense inflation
+    'investment_return': 0.00   # Annual return on accumulated savings
+}
+
+# Sensitivity scenarios for long-horizon projections
+GROWTH_SCENARIOS = {
+    'Pessimistic': {'raise': 0.02, 'rent_inflation': 0.05, 'expense_inflation': 0.04, 'investment_return': 0.02},
+    'Expected': {'raise': 0.04, 'rent_inflation': 0.035, 'expense_inflation': 0.03, 'investment_return': 0.05},
+    'Optimistic': {'raise': 0.06, 'rent_inflation': 0.025, 'expense_inflation': 0.025, 'investment_return': 0.08}
+}
 
 def format_currency(amount):
     return f"${int(amount):,}"
 
-def calculate_taxes(gross_salary, state):
-    # Same as before...
-    fed_tax = 0.22
-    no_tax_states = ['TX', 'FL', 'WA', 'NV', 'TN', 'NH', 'SD', 'WY', 'AK']
-    state_tax = 0.00 if state in no_tax_states else 0.05
-    monthly_net = (gross_salary * (1 - (fed_tax + state_tax))) / 12
+def calculate_taxes(gross_salary, state, city=None):
+    """
+    Returns monthly take-home pay after federal, FICA, state and local taxes
+    (progressive brackets from data/tax_tables.json).
+
+    Args:
+        gross_salary: Annual gross salary
+        state: Two-letter state code
+        city: Optional city name (for city income taxes such as NYC)
+
+    Returns:
+        int: Monthly net pay
+    """
+    annual_tax = get_tax_tables().annual_tax(gross_salary, state, city)[0]
+    monthly_net = (gross_salary - annual_tax) / 12
     return int(monthly_net)
 
 def calculate_thriving_score(monthly_net, rent, col_index):
@@ -51,12 +84,7 @@ def project_savings(monthly_net, rent, loan_payment, lifestyle):
     """
     # Handle lifestyle as either dict key or direct amount
     if isinstance(lifestyle, str):
-        lifestyle_map = {
-            'Frugal': 800,
-            'Balanced': 1500,
-            'Boujee': 2500
-        }
-        lifestyle_cost = lifestyle_map.get(lifestyle, 1500)
+        lifestyle_cost = LIFESTYLE_COSTS.get(lifestyle, 1500)
     else:
         lifestyle_cost = lifestyle
     
@@ -105,3 +133,343 @@ def project_5yr_wealth(monthly_net, rent, col_index):
         living_expenses *= 1.03  # 3% inflation
         
     return wealth_timeline[-1]  # Return total after 5 years
+
+
+# --- VECTORIZED ENGINE ---
+# Array-aware twins of the scalar functions above. They take NumPy arrays or
+# pandas Series (one entry per city/career row) and return NumPy arrays, so a
+# whole filtered DataFrame is scored in one pass instead of df.apply(axis=1).
+# Results match the scalar versions element for element (including int()
+# truncation toward zero).
+
+def _to_int_array(values):
+    return np.trunc(values).astype(np.int64)
+
+def calculate_taxes_vectorized(gross_salary, state, city=None):
+    """
+    Vectorized calculate_taxes.
+
+    Args:
+        gross_salary: Array/Series of annual gross salaries
+        state: Array/Series of two-letter state codes (same length)
+        city: Optional Array/Series of city names (same length)
+
+    Returns:
+        np.ndarray: Monthly net pay per row (int64)
+    """
+    gross_salary = np.asarray(gross_salary, dtype=np.float64)
+    annual_tax = get_tax_tables().annual_tax(gross_salary, state, city)
+    monthly_net = (gross_salary - annual_tax) / 12
+    return _to_int_array(monthly_net)
+
+def calculate_thriving_score_vectorized(monthly_net, rent, col_index):
+    """
+    Vectorized calculate_thriving_score.
+
+    Args:
+        monthly_net: Array/Series of monthly net income
+        rent: Array/Series of monthly rent
+        col_index: Array/Series of cost of living indexes
+
+    Returns:
+        np.ndarray: Thriving score (0-100) per row (int64)
+    """
+    monthly_net = np.asarray(monthly_net, dtype=np.float64)
+    rent = np.asarray(rent, dtype=np.float64)
+    col_index = np.asarray(col_index, dtype=np.float64)
+
+    rent_ratio = rent / monthly_net
+    penalty = np.where(rent_ratio > 0.30, (rent_ratio - 0.30) * 150, 0)
+    real_value_of_savings = (monthly_net - rent) / (col_index / 100)
+    score = 40 + (real_value_of_savings / 50) - penalty
+
+    return _to_int_array(np.clip(score, 0, 100))
+
+def project_savings_vectorized(monthly_net, rent, loan_payment, lifestyle):
+    """
+    Vectorized project_savings.
+
+    Args:
+        monthly_net: Array/Series of monthly net income
+        rent: Array/Series of monthly rent
+        loan_payment: Monthly loan payment (scalar or array)
+        lifestyle: Lifestyle cost amount(s) or lifestyle name(s)
+
+    Returns:
+        np.ndarray: Monthly savings per row (int64)
+    """
+    if isinstance(lifestyle, str):
+        lifestyle_cost = LIFESTYLE_COSTS.get(lifestyle, 1500)
+    else:
+        lifestyle_cost = np.asarray(lifestyle)
+        if lifestyle_cost.dtype.kind in 'OUS':
+            lifestyle_cost = np.array(
+                [LIFESTYLE_COSTS.get(name, 1500) for name in lifestyle_cost.ravel()]
+            ).reshape(lifestyle_cost.shape)
+
+    savings = (np.asarray(monthly_net, dtype=np.float64)
+               - np.asarray(rent, dtype=np.float64)
+               - np.asarray(loan_payment, dtype=np.float64)
+               - lifestyle_cost)
+    return _to_int_array(savings)
+
+def project_5yr_wealth_vectorized(monthly_net, rent, col_index):
+    """
+    Vectorized project_5yr_wealth (same 5%/3%/3% assumptions).
+
+    Args:
+        monthly_net: Array/Series of monthly net income
+        rent: Array/Series of monthly rent
+        col_index: Array/Series of cost of living indexes (0 falls back to 50)
+
+    Returns:
+        np.ndarray: Total projected wealth after 5 years per row (int64)
+    """
+    current_net = np.asarray(monthly_net, dtype=np.float64)
+    current_rent = np.asarray(rent, dtype=np.float64)
+    col_index = np.asarray(col_index, dtype=np.float64)
+
+    # Safety check
+    col_index = np.where(col_index == 0, 50, col_index)
+
+    cumulative_wealth = np.zeros(np.broadcast(current_net, current_rent, col_index).shape)
+    living_expenses = (col_index / 100) * 1200
+
+    for year in range(1, 6):
+        yearly_savings = (current_net - current_rent - living_expenses) * 12
+
+        # Don't accumulate negative savings
+        cumulative_wealth += np.maximum(yearly_savings, 0)
+
+        current_net = current_net * 1.05
+        current_rent = current_rent * 1.03
+        living_expenses = living_expenses * 1.03
+
+    return _to_int_array(np.maximum(cumulative_wealth, 0))
+
+def score_dataframe(df, loan_payment=0, lifestyle='Balanced'):
+    """
+    Scores every row of a city x career DataFrame in one batched pass.
+
+    Args:
+        df: DataFrame with 'Salary', 'State', 'Rent' and 'COL' columns
+            (and 'City' for local taxes)
+        loan_payment: Monthly loan payment applied to every row
+        lifestyle: Lifestyle cost amount or name ('Frugal', 'Balanced', 'Boujee')
+
+    Returns:
+        pd.DataFrame: Copy of df with 'Monthly_Net', 'Thriving_Score',
+                      'Monthly_Savings' and 'Wealth_5yr' columns added
+    """
+    monthly_net = calculate_taxes_vectorized(df['Salary'], df['State'], df.get('City'))
+
+    scored = df.copy()
+    scored['Monthly_Net'] = monthly_net
+    scored['Thriving_Score'] = calculate_thriving_score_vectorized(monthly_net, df['Rent'], df['COL'])
+    scored['Monthly_Savings'] = project_savings_vectorized(monthly_net, df['Rent'], loan_payment, lifestyle)
+    scored['Wealth_5yr'] = project_5yr_wealth_vectorized(monthly_net, df['Rent'], df['COL'])
+    return scored
+
+def project_wealth_timeline(monthly_net, rent, col_index, years=5, scenarios=None):
+    """
+    Projects cumulative wealth for every year, city and growth scenario at once.
+
+    Each yearly cash flow is a geometric sequence (value * (1 + growth) ** t),
+    so the whole (scenario, city, year) grid is built with broadcasting powers.
+    Savings compound at the scenario's investment return using the discounted
+    cumulative sum form of the annuity future value:
+        W_t = (1 + r) ** t * sum_{k <= t} s_k / (1 + r) ** k
+    As in project_5yr_wealth, negative yearly savings are not accumulated, and
+    the default scenario reproduces its 5%/3%/3% assumptions.
+
+    Args:
+        monthly_net: Monthly net income (scalar or array, one entry per city)
+        rent: Monthly rent (scalar or array)
+        col_index: Cost of living index (0 falls back to 50)
+        years: Projection horizon in years
+        scenarios: List of growth dicts, a {name: growth dict} mapping, or
+                   None for [DEFAULT_GROWTH]. Missing keys use DEFAULT_GROWTH.
+
+    Returns:
+        np.ndarray: Wealth with shape (n_scenarios, n_cities, years), where
+                    [..., t] is the total after year t + 1
+    """
+    if scenarios is None:
+        scenarios = [DEFAULT_GROWTH]
+    elif isinstance(scenarios, dict):
+        scenarios = list(scenarios.values())
+
+    def rates(key):
+        values = [scenario.get(key, DEFAULT_GROWTH[key]) for scenario in scenarios]
+        return np.asarray(values, dtype=np.float64)[:, None, None]
+
+    monthly_net = np.atleast_1d(np.asarray(monthly_net, dtype=np.float64))
+    rent = np.atleast_1d(np.asarray(rent, dtype=np.float64))
+    col_index = np.atleast_1d(np.asarray(col_index, dtype=np.float64))
+    col_index = np.where(col_index == 0, 50, col_index)
+    living_expenses = (col_index / 100) * 1200
+
+    # Shape (1, n_cities, 1) against (n_scenarios, 1, 1) against (1, 1, years)
+    net = monthly_net[None, :, None]
+    rent = rent[None, :, None]
+    living_expenses = living_expenses[None, :, None]
+    t = np.arange(years, dtype=np.float64)[None, None, :]
+
+    yearly_savings = 12 * (
+        net * (1 + rates('raise')) ** t
+        - rent * (1 + rates('rent_inflation')) ** t
+        - living_expenses * (1 + rates('expense_inflation')) ** t
+    )
+    yearly_savings = np.maximum(yearly_savings, 0)
+
+    growth = (1 + rates('investment_return')) ** t
+    return growth * np.cumsum(yearly_savings / growth, axis=-1)
+
+# --- RESULTS CUBE ---
+# Every Budget Lab answer, precomputed once per dataset version over
+# (career, city, lifestyle, debt bucket). Widget changes then index into the
+# cube instead of re-running the tax/savings/loan math.
+
+# Budget Lab's all-in monthly lifestyle estimates
+BUDGET_LIFESTYLE_COSTS = {
+    'Frugal': 900,
+    'Balanced': 1700,
+    'Boujee': 3000
+}
+
+# Monthly payment per $10,000 of student debt (10-year standard repayment)
+LOAN_PAYMENT_PER_10K = 115
+
+# Debt grid of the cube; values in between are linearly interpolated
+DEBT_BUCKETS = np.arange(0, 500_001, 10_000, dtype=np.float64)
+
+def city_key(city, state):
+    """
+    Unique city label, "City, ST" (city names repeat across states, e.g.
+    Columbus OH/GA). Works on scalars or aligned Series.
+    """
+    if isinstance(city, str):
+        return f"{city}, {state}"
+    return city.astype(str) + ', ' + state.astype(str)
+
+def build_results_cube(df, lifestyle_costs=None, debt_buckets=None):
+    """
+    Precomputes Budget Lab results for every career, city, lifestyle and debt bucket.
+
+    Args:
+        df: City x career grid with 'Category', 'City', 'Salary', 'State',
+            'Rent' and 'COL' columns
+        lifestyle_costs: {lifestyle name: monthly cost} (BUDGET_LIFESTYLE_COSTS
+                         if not provided)
+        debt_buckets: Ascending debt amounts (DEBT_BUCKETS if not provided)
+
+    Returns:
+        dict: {'careers', 'cities' (city_key() labels), 'lifestyles': axis labels,
+               'career_index', 'city_index', 'lifestyle_index': label -> position,
+               'debts': debt bucket values,
+               'loan_payment': monthly loan payment per debt bucket,
+               'lifestyle_cost': monthly cost per lifestyle,
+               'rent', 'taxes': (career, city) monthly amounts,
+               'Monthly_Net', 'Monthly_Savings', 'Thriving_Score', 'Wealth_5yr':
+               (career, city, lifestyle, debt) float64 arrays, NaN where the
+               grid has no row}
+    """
+    lifestyle_costs = BUDGET_LIFESTYLE_COSTS if lifestyle_costs is None else lifestyle_costs
+    debts = DEBT_BUCKETS if debt_buckets is None else np.asarray(debt_buckets, dtype=np.float64)
+
+    careers = [str(c) for c in df['Category'].unique()]
+    keys = city_key(df['City'], df['State'])
+    cities = list(keys.unique())
+    lifestyles = list(lifestyle_costs)
+    career_index = {career: i for i, career in enumerate(careers)}
+    city_index = {city: j for j, city in enumerate(cities)}
+
+    rows = df['Category'].astype(str).map(career_index).to_numpy()
+    cols = keys.map(city_index).to_numpy()
+
+    def grid(values):
+        out = np.full((len(careers), len(cities)), np.nan)
+        out[rows, cols] = values
+        return out
+
+    monthly_net = calculate_taxes_vectorized(df['Salary'], df['State'], df['City'])
+    net = grid(monthly_net)
+    rent = grid(df['Rent'])
+    taxes = grid(np.asarray(df['Salary'], dtype=np.float64) / 12) - net
+    score = grid(calculate_thriving_score_vectorized(monthly_net, df['Rent'], df['COL']))
+    wealth = grid(project_5yr_wealth_vectorized(monthly_net, df['Rent'], df['COL']))
+
+    loan_payment = debts / 10_000 * LOAN_PAYMENT_PER_10K
+    lifestyle_cost = np.asarray([lifestyle_costs[name] for name in lifestyles], dtype=np.float64)
+    shape = (len(careers), len(cities), len(lifestyles), len(debts))
+
+    # Only savings varies with lifestyle and debt; the rest are broadcast views
+    savings = (net[:, :, None, None] - rent[:, :, None, None]
+               - lifestyle_cost[None, None, :, None] - loan_payment[None, None, None, :])
+    savings = np.where(np.isnan(savings), np.nan, np.trunc(savings))
+
+    return {
+        'careers': careers,
+        'cities': cities,
+        'lifestyles': lifestyles,
+        'career_index': career_index,
+        'city_index': city_index,
+        'lifestyle_index': {name: k for k, name in enumerate(lifestyles)},
+        'debts': debts,
+        'loan_payment': loan_payment,
+        'lifestyle_cost': lifestyle_cost,
+        'rent': rent,
+        'taxes': taxes,
+        'Monthly_Net': np.broadcast_to(net[:, :, None, None], shape),
+        'Monthly_Savings': savings,
+        'Thriving_Score': np.broadcast_to(score[:, :, None, None], shape),
+        'Wealth_5yr': np.broadcast_to(wealth[:, :, None, None], shape)
+    }
+
+def lookup_results(cube, career, city, lifestyle, debt):
+    """
+    Reads one Budget Lab result from a build_results_cube() cube.
+
+    Debts between buckets are linearly interpolated (exact for the loan
+    payment, which is linear in debt); debts outside the grid extrapolate
+    along the nearest segment.
+
+    Args:
+        cube: build_results_cube() result
+        career: Career name
+        city: city_key() of the city ("City, ST")
+        lifestyle: Lifestyle name
+        debt: Student loan debt ($)
+
+    Returns:
+        dict: 'Monthly_Net', 'Monthly_Savings', 'Thriving_Score' and
+              'Wealth_5yr' (int, truncated like the scalar functions),
+              plus 'Loan_Payment', 'Lifestyle_Cost', 'Rent' and 'Taxes'
+
+    Raises:
+        KeyError: If the career, city or lifestyle is not in the cube
+    """
+    i = cube['career_index'][career]
+    j = cube['city_index'][city]
+    k = cube['lifestyle_index'][lifestyle]
+
+    debts = cube['debts']
+    if len(debts) == 1:
+        lo, weight = 0, 0.0
+    else:
+        lo = int(np.clip(np.searchsorted(debts, debt, side='right') - 1, 0, len(debts) - 2))
+        weight = (debt - debts[lo]) / (debts[lo + 1] - debts[lo])
+    hi = min(lo + 1, len(debts) - 1)
+
+    def interp(values):
+        return values[lo] * (1 - weight) + values[hi] * weight
+
+    results = {
+        name: int(interp(cube[name][i, j, k]))
+        for name in ('Monthly_Net', 'Monthly_Savings', 'Thriving_Score', 'Wealth_5yr')
+    }
+    results['Loan_Payment'] = float(interp(cube['loan_payment']))
+    results['Lifestyle_Cost'] = float(cube['lifestyle_cost'][k])
+    results['Rent'] = float(cube['rent'][i, j])
+    results['Taxes'] = float(cube['taxes'][i, j])
+    return results
@@ -1,47 +1,412 @@
+import logging
+import threading
+import time
+import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import OneHotEncoder
-from sklearn.pipeline import make_pipeline
-import joblib
+from src.model_artifact import load_model_artifact, save_model_artifact
 
-MODEL_PATH = 'data/salary_model.pkl'
+# sklearn is only imported inside train_model() so that serving from the
+# precomputed lookup table never pays for importing it.
 
-def train_model():
+MODEL_PATH = 'data/salary_model'  # Versioned artifact directory (see model_artifact.py)
+TABLE_PATH = 'data/salary_table.npz'
+FALLBACK_SALARY = 85000
+
+logger = logging.getLogger(__name__)
+
+# Columns expected in a real salary dump, mapped to the model's features
+CSV_COLUMNS = {'JobTitle': 'Role', 'State': 'State', 'Salary': 'Salary'}
+
+def load_training_data(csv_path: str, chunksize: int = 1_000_000) -> pd.DataFrame:
     """
-    Run this ONCE locally to generate the .pkl file.
+    Read a JobTitle, State, Salary CSV in typed chunks.
+
+    Text columns are parsed straight into categoricals and salaries into
+    float32, so multi-million-row dumps stay a few bytes per row.
+
+    Args:
+        csv_path: Path to the CSV file
+        chunksize: Rows per chunk
+
+    Returns:
+        pd.DataFrame: Columns ['Role', 'State', 'Salary'] with invalid rows dropped
     """
-    # Load your REAL downloaded CSV here
-    # Expected columns: ['JobTitle', 'State', 'Salary']
-    # If you don't have one yet, skip this step and use the synthetic data.
-    print("Training Random Forest...")
-    
-    # MOCK TRAINING DATA (Replace this with pd.read_csv)
+    from pandas.api.types import union_categoricals
+
+    chunks = pd.read_csv(
+        csv_path,
+        usecols=list(CSV_COLUMNS),
+        dtype={'JobTitle': 'category', 'State': 'category', 'Salary': 'float32'},
+        chunksize=chunksize
+    )
+
+    roles, states, salaries = [], [], []
+    for chunk in chunks:
+        chunk = chunk.dropna()
+        chunk = chunk[chunk['Salary'] > 0]
+        roles.append(chunk['JobTitle'])
+        states.append(chunk['State'])
+        salaries.append(chunk['Salary'].to_numpy())
+
+    if not salaries:
+        return pd.DataFrame({'Role': pd.Categorical([]), 'State': pd.Categorical([]),
+                             'Salary': np.array([], dtype=np.float32)})
+
+    # Each chunk infers its own categories, so merge them before concatenating
+    return pd.DataFrame({
+        'Role': union_categoricals(roles, ignore_order=True),
+        'State': union_categoricals(states, ignore_order=True),
+        'Salary': np.concatenate(salaries)
+    })
+
+def _mock_training_data() -> pd.DataFrame:
     data = {
         'Role': ['Software Engineer', 'Data Scientist', 'Product Manager'] * 100,
         'State': ['TX', 'CA', 'NY'] * 100,
         'Salary': [90000, 140000, 130000] * 100
     }
-    df = pd.DataFrame(data)
-    
-    # Pipeline: Encode categorical text -> Predict number
-    model = make_pipeline(
-        OneHotEncoder(handle_unknown='ignore'),
-        RandomForestRegressor(n_estimators=50)
-    )
-    
-    X = df[['Role', 'State']]
-    y = df['Salary']
-    
-    model.fit(X, y)
-    joblib.dump(model, MODEL_PATH)
+    return pd.DataFrame(data)
+
+def _make_pipeline(estimator: str, n_estimators: int, n_jobs: int):
+    from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+    from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder
+    from sklearn.pipeline import make_pipeline
+
+    if estimator == 'forest':
+        # Pipeline: Encode categorical text -> Predict number
+        return make_pipeline(
+            OneHotEncoder(handle_unknown='ignore'),
+            RandomForestRegressor(n_estimators=n_estimators, n_jobs=n_jobs)
+        )
+    if estimator == 'hgb':
+        # Native categorical splits need codes below max_bins (255), so rare
+        # titles are grouped and unknowns become -1 (treated as missing)
+        return make_pipeline(
+            OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=-1,
+                           max_categories=255),
+            HistGradientBoostingRegressor(categorical_features=[0, 1])
+        )
+    raise ValueError(f"Unknown estimator '{estimator}' (use 'forest' or 'hgb')")
+
+def _aggregate_pairs(X: pd.DataFrame, y: pd.Series):
+    """
+    Collapse duplicate (Role, State) rows into their mean salary and count.
+
+    Fitting on at most roles x states weighted rows is much faster, but it
+    is an approximation: forest bootstraps resample whole (Role, State)
+    groups instead of rows, so the holdout error is usually worse than the
+    raw fit. Check holdout_mae before shipping an aggregated model.
+    """
+    grouped = y.groupby([X['Role'], X['State']], observed=True).agg(['mean', 'count'])
+    pairs = grouped.index.to_frame(index=False)
+    return pairs, grouped['mean'].to_numpy(), grouped['count'].to_numpy()
+
+def train_model(csv_path: str = None, estimator: str = 'forest', n_estimators: int = 50,
+                n_jobs: int = -1, test_size: float = 0.2, aggregate: bool = False,
+                profile: bool = False) -> dict:
+    """
+    Run this ONCE locally to generate the model artifact.
+
+    Args:
+        csv_path: JobTitle, State, Salary CSV (uses mock data if None)
+        estimator: 'forest' (RandomForest) or 'hgb' (HistGradientBoosting)
+        n_estimators: Trees in the forest
+        n_jobs: Cores used to fit the forest (-1 = all cores)
+        test_size: Fraction of rows held out to report error
+        aggregate: Fit on count-weighted (Role, State) means instead of raw
+                   rows (faster, less accurate; see _aggregate_pairs)
+        profile: Trace Python allocations from CSV ingestion through fitting
+                 (slows allocation-heavy fits, so off by default)
+
+    Returns:
+        dict: Training report with rows, fit_rows, fit_seconds,
+              peak_memory_mb (None unless profile) and holdout_mae
+    """
+    import tracemalloc
+    from sklearn.model_selection import train_test_split
+
+    peak_bytes = None
+    if profile:
+        tracemalloc.start()
+    try:
+        if csv_path:
+            print(f"Loading {csv_path}...")
+            df = load_training_data(csv_path)
+        else:
+            # If you don't have a real CSV yet, use the synthetic data.
+            df = _mock_training_data()
+
+        print(f"Training {estimator} on {len(df):,} rows...")
+
+        X_train, X_test, y_train, y_test = train_test_split(
+            df[['Role', 'State']], df['Salary'], test_size=test_size, random_state=42
+        )
+        model = _make_pipeline(estimator, n_estimators, n_jobs)
+
+        start = time.perf_counter()
+        if aggregate:
+            X_fit, y_fit, counts = _aggregate_pairs(X_train, y_train)
+            model.fit(X_fit, y_fit, **{f"{model.steps[-1][0]}__sample_weight": counts})
+        else:
+            X_fit = X_train
+            model.fit(X_train, y_train)
+        fit_seconds = time.perf_counter() - start
+        if profile:
+            _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        # Never leave tracing on for the rest of the process
+        if profile:
+            tracemalloc.stop()
+
+    holdout_mae = float(np.mean(np.abs(model.predict(X_test) - y_test.to_numpy())))
+
+    save_model_artifact(model, MODEL_PATH, training_rows=len(X_train))
     print(f"Model saved to {MODEL_PATH}")
 
+    save_salary_table(model, TABLE_PATH)
+    print(f"Lookup table saved to {TABLE_PATH}")
+
+    report = {
+        'estimator': estimator,
+        'rows': len(df),
+        'fit_rows': len(X_fit),
+        'fit_seconds': fit_seconds,
+        'peak_memory_mb': peak_bytes / 1e6 if peak_bytes is not None else None,
+        'holdout_mae': holdout_mae
+    }
+    memory = f" | Peak memory: {report['peak_memory_mb']:.1f} MB" if profile else ""
+    print(f"Fit: {fit_seconds:.2f}s{memory} | Holdout MAE: ${holdout_mae:,.0f}")
+    return report
+
+def save_salary_table(model, path: str = TABLE_PATH):
+    """
+    Precompute every role x state prediction of a fitted pipeline.
+
+    The model only sees two categorical inputs, so its whole output space is
+    the grid of categories the encoder learned. Each cell stores the
+    prediction and, for forests, the spread across trees as an uncertainty
+    estimate (0 for gradient boosting).
+
+    Args:
+        model: Fitted encoder + regressor pipeline from train_model()
+        path: Destination .npz file
+    """
+    encoder, regressor = model.steps[0][1], model.steps[-1][1]
+    roles, states = encoder.categories_
+
+    grid = pd.DataFrame({
+        'Role': np.repeat(roles, len(states)),
+        'State': np.tile(states, len(roles))
+    })
+
+    if hasattr(regressor, 'estimators_'):
+        encoded = encoder.transform(grid)
+        per_tree = np.stack([tree.predict(encoded) for tree in regressor.estimators_])
+        salary, std = per_tree.mean(axis=0), per_tree.std(axis=0)
+    else:
+        salary = model.predict(grid)
+        std = np.zeros_like(salary)
+
+    shape = (len(roles), len(states))
+    np.savez(
+        path,
+        roles=np.asarray(roles, dtype=str),
+        states=np.asarray(states, dtype=str),
+        salary=salary.reshape(shape).astype(np.float32),
+        std=std.reshape(shape).astype(np.float32)
+    )
+
+    # Serve the new table on the next lookup
+    with _services_lock:
+        _tables.pop(path, None)
+
+class SalaryModelService:
+    """
+    Loads the salary pipeline once and serves batched predictions.
+
+    Use get_model_service() to share one instance per process (it survives
+    Streamlit reruns because the module stays imported).
+    """
+
+    def __init__(self, model_path: str = MODEL_PATH):
+        self.model_path = model_path
+        self.model = None
+        self.load_seconds = None
+        self.predict_calls = 0
+        self.predict_rows = 0
+        self.predict_seconds = 0.0
+        self.last_predict_seconds = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """
+        Open the model artifact (only the first call hits the disk).
+
+        Returns:
+            ForestArtifact or PipelineArtifact from load_model_artifact()
+        """
+        if self.model is None:
+            with self._lock:
+                if self.model is None:
+                    start = time.perf_counter()
+                    self.model = load_model_artifact(self.model_path)
+                    self.load_seconds = time.perf_counter() - start
+        return self.model
+
+    def predict(self, pairs: pd.DataFrame):
+        """
+        Predict salaries for many (Role, State) pairs in one call.
+
+        Args:
+            pairs: DataFrame with 'Role' and 'State' columns
+
+        Returns:
+            np.ndarray: Predicted salary per row (int64)
+        """
+        model = self.load()
+        start = time.perf_counter()
+        predictions = model.predict(pairs[['Role', 'State']]).astype('int64')
+        elapsed = time.perf_counter() - start
+
+        self.predict_calls += 1
+        self.predict_rows += len(pairs)
+        self.predict_seconds += elapsed
+        self.last_predict_seconds = elapsed
+        return predictions
+
+    def stats(self) -> dict:
+        """
+        Load and predict latency counters.
+
+        Returns:
+            dict: artifact metadata summary, load_seconds, predict_calls,
+                  predict_rows, predict_seconds, last_predict_seconds and
+                  avg_predict_seconds
+        """
+        metadata = self.model.metadata if self.model is not None else {}
+        return {
+            'artifact_kind': metadata.get('kind'),
+            'artifact_created_at': metadata.get('created_at'),
+            'training_rows': metadata.get('training_rows'),
+            'load_seconds': self.load_seconds,
+            'predict_calls': self.predict_calls,
+            'predict_rows': self.predict_rows,
+            'predict_seconds': self.predict_seconds,
+            'last_predict_seconds': self.last_predict_seconds,
+            'avg_predict_seconds': (self.predict_seconds / self.predict_calls
+                                    if self.predict_calls else None)
+        }
+
+
+class SalaryLookupTable:
+    """
+    O(1) salary lookups from the table written by save_salary_table().
+    """
+
+    def __init__(self, roles, states, salary, std):
+        self.role_index = {role: i for i, role in enumerate(roles)}
+        self.state_index = {state: i for i, state in enumerate(states)}
+        self.salary = salary
+        self.std = std
+
+    @classmethod
+    def load(cls, path: str = TABLE_PATH) -> 'SalaryLookupTable':
+        with np.load(path, allow_pickle=False) as table:
+            return cls(table['roles'].tolist(), table['states'].tolist(),
+                       table['salary'], table['std'])
+
+    def lookup(self, role, state):
+        """
+        Args:
+            role: Job title
+            state: Two-letter state code
+
+        Returns:
+            tuple: (salary, std) as ints, or None if the pair was not in
+                   the training data
+        """
+        i = self.role_index.get(role)
+        j = self.state_index.get(state)
+        if i is None or j is None:
+            return None
+        return int(self.salary[i, j]), int(self.std[i, j])
+
+    def lookup_many(self, roles, states):
+        """
+        Vectorized lookup for many pairs.
+
+        Returns:
+            tuple: (salary, std) float arrays, NaN where the pair is unknown
+        """
+        i = np.array([self.role_index.get(role, -1) for role in roles])
+        j = np.array([self.state_index.get(state, -1) for state in states])
+        known = (i >= 0) & (j >= 0)
+
+        salary = np.full(len(i), np.nan)
+        std = np.full(len(i), np.nan)
+        salary[known] = self.salary[i[known], j[known]]
+        std[known] = self.std[i[known], j[known]]
+        return salary, std
+
+
+_tables = {}
+_services = {}
+_services_lock = threading.Lock()
+
+def get_model_service(model_path: str = MODEL_PATH) -> SalaryModelService:
+    """
+    Process-wide SalaryModelService for model_path.
+    """
+    with _services_lock:
+        if model_path not in _services:
+            _services[model_path] = SalaryModelService(model_path)
+        return _services[model_path]
+
+def get_salary_table(path: str = TABLE_PATH):
+    """
+    Process-wide SalaryLookupTable for path, or None if it was never built.
+
+    A missing table is not cached, so one built later in the process is
+    picked up on the next call.
+    """
+    with _services_lock:
+        if path not in _tables:
+            try:
+                _tables[path] = SalaryLookupTable.load(path)
+            except FileNotFoundError:
+                return None
+        return _tables[path]
+
 def predict_salary(role, state):
+    # Fast path: answer from the precomputed table without touching sklearn
+    table = get_salary_table()
+    if table is not None:
+        hit = table.lookup(role, state)
+        if hit is not None:
+            return hit[0]
+
     try:
-        model = joblib.load(MODEL_PATH)
-        # Create a 1-row DataFrame for prediction
-        input_data = pd.DataFrame({'Role': [role], 'State': [state]})
-        return int(model.predict(input_data)[0])
-    except:
+        pairs = pd.DataFrame({'Role': [role], 'State': [state]})
+        return int(get_model_service().predict(pairs)[0])
+    except Exception as e:
         # Fallback if model fails or file missing
-        return 85000
\ No newline at end of file
+        logger.warning("Salary model failed for %s/%s: %s", role, state, e)
+        return FALLBACK_SALARY
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train the salary model")
+    parser.add_argument('csv_path', nargs='?', help="JobTitle, State, Salary CSV (mock data if omitted)")
+    parser.add_argument('--estimator', choices=['forest', 'hgb'], default='forest')
+    parser.add_argument('--n-estimators', type=int, default=50)
+    parser.add_argument('--n-jobs', type=int, default=-1)
+    parser.add_argument('--aggregate', action='store_true',
+                        help="Fit on weighted (Role, State) means (faster, less accurate)")
+    parser.add_argument('--profile', action='store_true',
+                        help="Report peak memory from CSV ingestion through fitting (slower)")
+    args = parser.parse_args()
+
+    train_model(args.csv_path, estimator=args.estimator, n_estimators=args.n_estimators,
+                n_jobs=args.n_jobs, aggregate=args.aggregate, profile=args.profile)
@@ -0,0 +1,253 @@
+# src/model_artifact.py
+"""
+Versioned on-disk format for the salary model.
+
+An artifact is a directory:
+
+    metadata.json    format version, kind, feature categories, training row
+                     count, creation time and a size and sha256 for every file
+    *.npy            (kind 'forest') flat node arrays for all trees, loaded
+                     with mmap_mode='r' so startup never unpickles the forest
+    pipeline.joblib  (kind 'pipeline') compressed pickle for estimators that
+                     have no array form, e.g. HistGradientBoosting
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+ARTIFACT_VERSION = 1
+METADATA_FILE = 'metadata.json'
+FEATURES = ['Role', 'State']
+FOREST_ARRAYS = ['children_left', 'children_right', 'feature', 'threshold', 'value', 'roots']
+
+
+class ArtifactError(Exception):
+    """Raised when an artifact is missing, from another version or corrupted."""
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _forest_arrays(forest) -> dict:
+    """
+    Concatenate every tree's node arrays. Child indices are rewritten to
+    global positions so one traversal loop can walk all trees at once.
+    """
+    arrays = {name: [] for name in FOREST_ARRAYS}
+    offset = 0
+    for estimator in forest.estimators_:
+        tree = estimator.tree_
+        is_leaf = tree.children_left == -1
+        arrays['children_left'].append(np.where(is_leaf, -1, tree.children_left + offset))
+        arrays['children_right'].append(np.where(is_leaf, -1, tree.children_right + offset))
+        arrays['feature'].append(tree.feature)
+        arrays['threshold'].append(tree.threshold)
+        arrays['value'].append(tree.value[:, 0, 0])
+        arrays['roots'].append([offset])
+        offset += tree.node_count
+
+    return {
+        'children_left': np.concatenate(arrays['children_left']).astype(np.int32),
+        'children_right': np.concatenate(arrays['children_right']).astype(np.int32),
+        'feature': np.concatenate(arrays['feature']).astype(np.int32),
+        'threshold': np.concatenate(arrays['threshold']).astype(np.float64),
+        'value': np.concatenate(arrays['value']).astype(np.float64),
+        'roots': np.concatenate(arrays['roots']).astype(np.int32)
+    }
+
+
+def save_model_artifact(model, path: str, training_rows: int) -> dict:
+    """
+    Write a fitted pipeline as a versioned artifact directory.
+
+    OneHotEncoder + RandomForestRegressor pipelines are stored as raw tree
+    arrays; anything else is stored as a compressed joblib pickle.
+
+    The artifact is written to a temporary sibling directory and renamed
+    into place, so files from a previous artifact at path never mix with the
+    new ones and readers never see a half-written artifact.
+
+    Args:
+        model: Fitted pipeline from train_model()
+        path: Artifact directory (replaced if it exists)
+        training_rows: Number of rows the model was trained on
+
+    Returns:
+        dict: The metadata that was written
+    """
+    import joblib
+    import sklearn
+
+    path = os.path.normpath(path)
+    parent = os.path.dirname(path) or '.'
+    os.makedirs(parent, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(prefix=f".{os.path.basename(path)}-", dir=parent)
+    old_path = None
+
+    try:
+        encoder, regressor = model.steps[0][1], model.steps[-1][1]
+        is_forest = (type(encoder).__name__ == 'OneHotEncoder' and hasattr(regressor, 'estimators_'))
+
+        files = []
+        if is_forest:
+            for name, array in _forest_arrays(regressor).items():
+                np.save(os.path.join(tmp_path, f"{name}.npy"), array)
+                files.append(f"{name}.npy")
+        else:
+            joblib.dump(model, os.path.join(tmp_path, 'pipeline.joblib'), compress=3)
+            files.append('pipeline.joblib')
+
+        metadata = {
+            'format_version': ARTIFACT_VERSION,
+            'kind': 'forest' if is_forest else 'pipeline',
+            'estimator': type(regressor).__name__,
+            'features': FEATURES,
+            'categories': {name: [str(c) for c in cats] for name, cats in zip(FEATURES, encoder.categories_)},
+            'training_rows': int(training_rows),
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'sklearn_version': sklearn.__version__,
+            'checksums': {name: _sha256(os.path.join(tmp_path, name)) for name in files},
+            'sizes': {name: os.path.getsize(os.path.join(tmp_path, name)) for name in files}
+        }
+        with open(os.path.join(tmp_path, METADATA_FILE), 'w') as f:
+            json.dump(metadata, f, indent=2)
+
+        # A directory can only be renamed over an empty one, so move the old
+        # artifact aside first; readers in between get ArtifactError, never
+        # a mix of old and new files
+        if os.path.exists(path):
+            old_path = tempfile.mkdtemp(prefix=f".{os.path.basename(path)}-old-", dir=parent)
+            os.replace(path, old_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if old_path is not None:
+            if os.path.exists(path):
+                shutil.rmtree(old_path, ignore_errors=True)
+            else:
+                os.replace(old_path, path)
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+
+    if old_path is not None:
+        shutil.rmtree(old_path, ignore_errors=True)
+    return metadata
+
+
+class ForestArtifact:
+    """
+    Random forest served straight from memory-mapped node arrays.
+
+    Predictions match the original OneHotEncoder(handle_unknown='ignore') +
+    RandomForestRegressor pipeline.
+    """
+
+    def __init__(self, metadata: dict, arrays: dict):
+        self.metadata = metadata
+        self.arrays = arrays
+        roles, states = (metadata['categories'][name] for name in FEATURES)
+        # One-hot column of each category, in the encoder's column order
+        self.role_column = {role: i for i, role in enumerate(roles)}
+        self.state_column = {state: len(roles) + i for i, state in enumerate(states)}
+
+    def predict(self, pairs: pd.DataFrame) -> np.ndarray:
+        """
+        Args:
+            pairs: DataFrame with 'Role' and 'State' columns
+
+        Returns:
+            np.ndarray: Predicted salary per row (float64)
+        """
+        a = self.arrays
+        # Unknown categories have no active column (-2 never matches a feature)
+        role_col = np.array([self.role_column.get(r, -2) for r in pairs['Role']], dtype=np.int32)
+        state_col = np.array([self.state_column.get(s, -2) for s in pairs['State']], dtype=np.int32)
+
+        # One row per tree, one column per sample; walk every tree in lockstep
+        node = np.repeat(np.asarray(a['roots'])[:, None], len(pairs), axis=1)
+        while True:
+            left = a['children_left'][node]
+            active = left != -1
+            if not active.any():
+                break
+            feature = a['feature'][node]
+            x = ((feature == role_col) | (feature == state_col)).astype(np.float64)
+            go_left = x <= a['threshold'][node]
+            next_node = np.where(go_left, left, a['children_right'][node])
+            node = np.where(active, next_node, node)
+
+        return a['value'][node].mean(axis=0)
+
+
+class PipelineArtifact:
+    """Compressed-pickle artifact for estimators without an array form."""
+
+    def __init__(self, metadata: dict, model):
+        self.metadata = metadata
+        self.model = model
+
+    def predict(self, pairs: pd.DataFrame) -> np.ndarray:
+        return self.model.predict(pairs[FEATURES])
+
+
+def load_model_artifact(path: str, verify: bool = False):
+    """
+    Validate and open an artifact directory.
+
+    Every load checks that each file exists with its recorded size, which
+    catches missing and truncated files without reading them. Hashing every
+    file would read the whole forest and defeat mmap startup, so the full
+    sha256 check is opt-in (use it once at deploy time).
+
+    Args:
+        path: Artifact directory written by save_model_artifact()
+        verify: Also check every file against its recorded sha256
+
+    Returns:
+        ForestArtifact or PipelineArtifact (both expose predict() and metadata)
+
+    Raises:
+        ArtifactError: If the metadata is missing, the version is unsupported,
+                       a file is missing or has the wrong size, or (with
+                       verify) a checksum does not match
+    """
+    metadata_path = os.path.join(path, METADATA_FILE)
+    try:
+        with open(metadata_path) as f:
+            metadata = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ArtifactError(f"Cannot read {metadata_path}: {e}") from e
+
+    version = metadata.get('format_version')
+    if version != ARTIFACT_VERSION:
+        raise ArtifactError(f"Unsupported artifact version {version} (expected {ARTIFACT_VERSION})")
+
+    sizes = metadata.get('sizes', {})
+    for name, expected in metadata['checksums'].items():
+        file_path = os.path.join(path, name)
+        try:
+            size = os.path.getsize(file_path)
+        except OSError as e:
+            raise ArtifactError(f"Missing artifact file {file_path}") from e
+        if name in sizes and size != sizes[name]:
+            raise ArtifactError(f"Size mismatch for {file_path}")
+        if verify and _sha256(file_path) != expected:
+            raise ArtifactError(f"Checksum mismatch for {file_path}")
+
+    if metadata['kind'] == 'forest':
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r')
+                  for name in FOREST_ARRAYS}
+        return ForestArtifact(metadata, arrays)
+
+    import joblib
+    return PipelineArtifact(metadata, joblib.load(os.path.join(path, 'pipeline.joblib')))
@@ -0,0 +1,153 @@
+# src/simulation.py
+"""
+Monte Carlo wealth simulator.
+
+Simulates many salary-growth / rent-shock / market-return paths per city with
+batched NumPy draws and summarizes them as percentile wealth bands.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Yearly shock distributions (normal, mean/std as annual rates)
+MONTE_CARLO_ASSUMPTIONS = {
+    'raise_mean': 0.04,
+    'raise_std': 0.03,
+    'rent_mean': 0.035,
+    'rent_std': 0.04,
+    'expense_mean': 0.03,
+    'expense_std': 0.01,
+    'return_mean': 0.06,
+    'return_std': 0.15
+}
+
+# Paths per independent random stream. Results only depend on the seed,
+# not on how many worker processes the chunks are spread over.
+CHUNK_SIZE = 25_000
+
+# Cap on paths x years per call: long horizons run fewer paths so a
+# simulation stays around half a second (100k paths at 5 years)
+MAX_PATH_YEARS = 500_000
+
+
+def _growth_factors(rates):
+    """
+    Turns yearly growth rates (..., years) into cumulative factors where
+    year 0 is 1.0 and year t is prod(1 + rate) over the previous t years.
+    """
+    factors = np.ones_like(rates)
+    np.cumprod(1 + rates[..., :-1], axis=-1, out=factors[..., 1:])
+    return factors
+
+
+def _simulate_chunk(monthly_net, rent, living_expenses, years, n_paths, seed_seq, assumptions):
+    """
+    Simulates one chunk of paths.
+
+    Salary raises, expense inflation and market returns are shared by every
+    city on a path (they describe the person and the market), while rent
+    shocks are drawn per city.
+
+    Returns:
+        np.ndarray: Wealth with shape (n_paths, n_cities, years), float32
+    """
+    rng = np.random.default_rng(seed_seq)
+    n_cities = monthly_net.shape[0]
+    a = assumptions
+
+    def draw(mean, std, shape):
+        return rng.standard_normal(shape, dtype=np.float32) * np.float32(std) + np.float32(mean)
+
+    salary_f = _growth_factors(draw(a['raise_mean'], a['raise_std'], (n_paths, years)))
+    expense_f = _growth_factors(draw(a['expense_mean'], a['expense_std'], (n_paths, years)))
+    rent_f = _growth_factors(draw(a['rent_mean'], a['rent_std'], (n_paths, n_cities, years)))
+
+    # A -100% year would zero the growth index, so floor returns at -90%
+    returns = np.maximum(draw(a['return_mean'], a['return_std'], (n_paths, years)), np.float32(-0.9))
+    returns[:, 0] = 0
+    market = np.cumprod(1 + returns, axis=1)[:, None, :]
+
+    yearly_savings = 12 * (
+        monthly_net[None, :, None] * salary_f[:, None, :]
+        - rent[None, :, None] * rent_f
+        - living_expenses[None, :, None] * expense_f[:, None, :]
+    )
+    np.maximum(yearly_savings, 0, out=yearly_savings)
+
+    # W_t = M_t * sum_{k <= t} s_k / M_k  (same form as project_wealth_timeline)
+    yearly_savings /= market
+    np.cumsum(yearly_savings, axis=-1, out=yearly_savings)
+    yearly_savings *= market
+    return yearly_savings
+
+
+def simulate_wealth(monthly_net, rent, col_index, years=5, n_paths=100_000,
+                    seed=None, percentiles=(10, 50, 90), n_jobs=1, assumptions=None,
+                    max_path_years=MAX_PATH_YEARS):
+    """
+    Runs a Monte Carlo wealth simulation for every city at once.
+
+    Args:
+        monthly_net: Monthly net income (scalar or array, one entry per city)
+        rent: Monthly rent (scalar or array)
+        col_index: Cost of living index (0 falls back to 50)
+        years: Projection horizon in years
+        n_paths: Number of simulated paths per city (at most
+                 max_path_years // years)
+        seed: Seed for reproducible results (None = fresh entropy)
+        percentiles: Percentiles to report
+        n_jobs: Worker processes (1 = run in-process, -1 = all cores)
+        assumptions: Overrides for MONTE_CARLO_ASSUMPTIONS
+        max_path_years: Cap on n_paths * years (None = no cap)
+
+    Returns:
+        dict: {'P10': array, 'P50': array, ...}, each with shape
+              (n_cities, years) where [..., t] is the wealth after year t + 1
+    """
+    a = dict(MONTE_CARLO_ASSUMPTIONS, **(assumptions or {}))
+
+    # Any of the three may be a scalar shared by every city
+    monthly_net, rent, col_index = (
+        np.atleast_1d(np.asarray(v, dtype=np.float32))
+        for v in np.broadcast_arrays(monthly_net, rent, col_index)
+    )
+    col_index = np.where(col_index == 0, 50, col_index)
+    living_expenses = (col_index / 100) * 1200
+
+    if max_path_years is not None and years > 0:
+        n_paths = min(n_paths, max(max_path_years // years, 1))
+
+    chunk_sizes = [CHUNK_SIZE] * (n_paths // CHUNK_SIZE)
+    if n_paths % CHUNK_SIZE:
+        chunk_sizes.append(n_paths % CHUNK_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    args = [(monthly_net, rent, living_expenses, years, size, seed_seq, a)
+            for size, seed_seq in zip(chunk_sizes, seeds)]
+
+    if n_paths <= 0:
+        empty = np.full((monthly_net.shape[0], years), np.nan, dtype=np.float32)
+        return {f"P{p}": empty.copy() for p in percentiles}
+
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+
+    # Percentiles partition along the last axis, which is much faster when
+    # the path axis is contiguous in memory, so chunks are written straight
+    # into a (cities, years, paths) buffer as they arrive
+    wealth = np.empty((monthly_net.shape[0], years, n_paths), dtype=np.float32)
+
+    def fill(chunks):
+        offset = 0
+        for chunk in chunks:
+            wealth[..., offset:offset + chunk.shape[0]] = np.moveaxis(chunk, 0, -1)
+            offset += chunk.shape[0]
+
+    if n_jobs > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(args))) as pool:
+            fill(pool.map(_simulate_chunk, *zip(*args)))
+    else:
+        fill(_simulate_chunk(*chunk_args) for chunk_args in args)
+
+    bands = np.percentile(wealth, percentiles, axis=-1, overwrite_input=True)
+    return {f"P{p}": band for p, band in zip(percentiles, bands)}
@@ -0,0 +1,141 @@
+# src/taxes.py
+"""
+Progressive tax engine.
+
+Federal, state and local brackets, standard deductions and FICA come from a
+versioned table file (data/tax_tables.json). Each bracket schedule stores the
+tax owed at every threshold, so the tax on any income is one searchsorted
+plus one multiply-add:
+
+    tax(x) = cumulative[i] + rate[i] * (x - threshold[i])
+
+where i is the bracket x falls in. Whole salary arrays are taxed at once;
+rows are grouped per state/city, never walked one by one.
+"""
+import json
+
+import numpy as np
+
+TAX_TABLES_PATH = 'data/tax_tables.json'
+
+
+class BracketSchedule:
+    """Marginal-rate schedule with precomputed tax at each threshold"""
+
+    def __init__(self, brackets, standard_deduction=0, annual_amount=0):
+        """
+        Args:
+            brackets: [[threshold, rate], ...] in ascending order, starting at 0
+            standard_deduction: Subtracted from gross income before the brackets
+            annual_amount: Fixed yearly tax on top (e.g. a head tax)
+        """
+        self.thresholds = np.asarray([b[0] for b in brackets], dtype=np.float64)
+        self.rates = np.asarray([b[1] for b in brackets], dtype=np.float64)
+        self.standard_deduction = float(standard_deduction)
+        self.annual_amount = float(annual_amount)
+
+        # Tax owed on income exactly at each threshold
+        widths = np.diff(self.thresholds)
+        self.cumulative = np.concatenate(([0.0], np.cumsum(widths * self.rates[:-1])))
+
+    def tax(self, gross_income):
+        """
+        Args:
+            gross_income: Scalar or array of annual gross incomes
+
+        Returns:
+            np.ndarray: Annual tax per income
+        """
+        taxable = np.maximum(np.asarray(gross_income, dtype=np.float64) - self.standard_deduction, 0)
+        i = np.searchsorted(self.thresholds, taxable, side='right') - 1
+        return self.cumulative[i] + self.rates[i] * (taxable - self.thresholds[i]) + self.annual_amount
+
+
+def _schedule(entry):
+    return BracketSchedule(entry['brackets'], entry.get('standard_deduction', 0), entry.get('annual_amount', 0))
+
+
+class TaxTables:
+    """Compiled view of a tax table file"""
+
+    def __init__(self, data):
+        """
+        Args:
+            data: Parsed table with 'version', 'tax_year', 'federal', 'fica',
+                  'default_state', 'states' (code -> schedule) and 'local'
+                  ("City, ST" -> schedule)
+        """
+        self.version = data.get('version', 1)
+        self.tax_year = data.get('tax_year')
+        self.federal = _schedule(data['federal'])
+        self.default_state = _schedule(data['default_state'])
+        self.states = {code: _schedule(entry) for code, entry in data['states'].items()}
+        self.local = {place: _schedule(entry) for place, entry in data.get('local', {}).items()}
+        self.fica = data['fica']
+
+    def fica_tax(self, gross_income):
+        """Social Security (up to the wage base) plus Medicare and Additional Medicare"""
+        gross_income = np.asarray(gross_income, dtype=np.float64)
+        f = self.fica
+        social_security = np.minimum(gross_income, f['social_security_wage_base']) * f['social_security_rate']
+        medicare = gross_income * f['medicare_rate']
+        additional = np.maximum(gross_income - f['additional_medicare_threshold'], 0) * f['additional_medicare_rate']
+        return social_security + medicare + additional
+
+    def _grouped_tax(self, gross_income, keys, schedules, default=None):
+        # One vectorized schedule evaluation per distinct state/city
+        tax = np.zeros(gross_income.shape)
+        codes, inverse = np.unique(keys, return_inverse=True)
+        for k, code in enumerate(codes):
+            schedule = schedules.get(code, default)
+            if schedule is not None:
+                rows = inverse == k
+                tax[rows] = schedule.tax(gross_income[rows])
+        return tax
+
+    def annual_tax(self, gross_salary, state, city=None):
+        """
+        Total annual tax: federal, FICA, state and local.
+
+        Args:
+            gross_salary: Scalar or array of annual gross salaries
+            state: Two-letter state code(s), same shape as gross_salary
+                   (unknown states use 'default_state')
+            city: Optional city name(s); local tax applies where
+                  "City, ST" is in the table
+
+        Returns:
+            np.ndarray: Annual tax per salary
+        """
+        gross_salary = np.atleast_1d(np.asarray(gross_salary, dtype=np.float64))
+        state = np.broadcast_to(np.asarray(state, dtype=str), gross_salary.shape)
+
+        tax = self.federal.tax(gross_salary) + self.fica_tax(gross_salary)
+        tax += self._grouped_tax(gross_salary, state, self.states, self.default_state)
+        if city is not None and self.local:
+            city = np.broadcast_to(np.asarray(city, dtype=str), gross_salary.shape)
+            places = np.char.add(np.char.add(city, ', '), state)
+            tax += self._grouped_tax(gross_salary, places, self.local)
+        return tax
+
+
+def load_tax_tables(path=TAX_TABLES_PATH):
+    """
+    Args:
+        path: JSON tax table file
+
+    Returns:
+        TaxTables
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return TaxTables(json.load(f))
+
+
+_tax_tables = {}
+
+
+def get_tax_tables(path=TAX_TABLES_PATH):
+    """Process-wide tax tables, loaded and compiled on first use"""
+    if path not in _tax_tables:
+        _tax_tables[path] = load_tax_tables(path)
+    return _tax_tables[path]
@@ -0,0 +1,237 @@
+"""
+Concurrent orchestration of the Gemini agents
+
+The resume analysis (which also returns the improvement suggestions), the
+lifestyle Reality Check and the career advice are independent network calls,
+so they run concurrently with asyncio and the wall-clock time becomes the
+slowest call instead of the sum. Only career advice waits for the resume
+analysis, because it is seeded with the detected skills.
+
+With an on_event callback (or through stream_agents()) the agents stream:
+text chunks and completed resume fields are reported as they arrive.
+"""
+
+import asyncio
+import functools
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from src.utils.job_matcher import (get_career_advice, get_lifestyle_reality_check,
+                                   stream_career_advice, stream_lifestyle_reality_check)
+from src.utils.llm_client import LLMClient, get_llm_client
+from src.utils.resume_parser import AIResumeParser
+
+AGENT_TIMEOUT_SECONDS = 30.0
+
+TIMEOUT_MESSAGES = {
+    "resume": {"error": "AI analysis timed out. Please try again."},
+    "suggestions": ["Unable to generate suggestions at this time"],
+    "reality_check": "⚠️ The Reality Check took too long. Please try again.",
+    "career_advice": "Focus on building a portfolio relevant to local industries."
+}
+
+
+async def _run_with_timeout(name: str, executor, fn, timeout: float, timings: Dict, timed_out: List,
+                            *args, **kwargs):
+    """
+    Run a blocking agent call in a worker thread with a timeout
+
+    fn is called as fn(cancel, *args, **kwargs) where cancel is a
+    threading.Event. On timeout the event is set and TIMEOUT_MESSAGES[name]
+    is returned; streaming agents check the event between chunks and close
+    their stream, so a timed-out call stops using quota and frees its worker
+    thread. A blocking (non-streaming) call still runs to completion in the
+    background and its result is discarded.
+    """
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    cancel = threading.Event()
+    try:
+        future = loop.run_in_executor(executor, functools.partial(fn, cancel, *args, **kwargs))
+        return await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        cancel.set()
+        timed_out.append(name)
+        return TIMEOUT_MESSAGES[name]
+    finally:
+        timings[name] = time.perf_counter() - start
+
+
+async def run_agents(uploaded_file=None, city: str = "", debt: int = 0, lifestyle: str = "Balanced",
+                     api_key: str = None, client: LLMClient = None,
+                     timeout: float = AGENT_TIMEOUT_SECONDS,
+                     on_event: Callable[[str, object], None] = None) -> Dict:
+    """
+    Run every agent for one "Calculate Future" click concurrently
+
+    Args:
+        uploaded_file: Streamlit UploadedFile object or file path (None skips the resume agents)
+        city: Target city for the Reality Check and career advice
+        debt: Student loan debt amount
+        lifestyle: Lifestyle preference (Frugal, Balanced, Boujee)
+        api_key: Google Gemini API key (loaded from environment if not provided)
+        client: LLMClient to use (shared Gemini client if not provided)
+        timeout: Per-call timeout in seconds
+        on_event: If given, agents stream and on_event(name, payload) is called
+                  from worker threads with ("reality_check", chunk),
+                  ("career_advice", chunk) and ("resume_field", (field, value))
+
+    Returns:
+        Dictionary with 'resume' (get_resume_summary() shape or None),
+        'suggestions', 'reality_check', 'career_advice', 'timings' (seconds
+        per agent plus 'total'), 'first_content' (seconds until each agent's
+        first streamed output, when streaming) and 'timed_out' (agent names)
+    """
+    if client is None:
+        client = get_llm_client(api_key)
+
+    timings, timed_out, first_content = {}, [], {}
+    start = time.perf_counter()
+
+    def emit(name, payload):
+        first_content.setdefault(name, time.perf_counter() - start)
+        on_event(name, payload)
+
+    def collect(name, chunks, cancel):
+        text = []
+        try:
+            for chunk in chunks:
+                if cancel.is_set():
+                    break
+                text.append(chunk)
+                emit(name, chunk)
+        finally:
+            # Stops the underlying model stream when cancelled
+            chunks.close()
+        return "".join(text)
+
+    def reality_check(cancel, **kwargs):
+        if on_event is None:
+            return get_lifestyle_reality_check(**kwargs)
+        return collect("reality_check", stream_lifestyle_reality_check(**kwargs), cancel)
+
+    def career_advice(cancel, **kwargs):
+        if on_event is None:
+            return get_career_advice(**kwargs)
+        return collect("career_advice", stream_career_advice(**kwargs), cancel)
+
+    def analyze(cancel, parser, text):
+        if on_event is None:
+            return parser.analyze(text)
+        fields = parser.stream_analysis(text, cancel=cancel)
+        try:
+            for field, value in fields:
+                if cancel.is_set():
+                    break
+                if field == "error":
+                    return {"error": value}
+                emit("resume_field", (field, value))
+        finally:
+            fields.close()
+        return parser.ai_analysis
+
+    def suggestions(cancel, parser):
+        return parser.get_improvement_suggestions()
+
+    # Private pool: asyncio.run() would otherwise wait for timed-out calls
+    # still running in the default executor before returning
+    executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="agent")
+
+    def call(name, fn, *args, **kwargs):
+        return _run_with_timeout(name, executor, fn, timeout, timings, timed_out, *args, **kwargs)
+
+    reality_task = asyncio.create_task(
+        call("reality_check", reality_check,
+             city=city, debt=debt, lifestyle=lifestyle, client=client)
+    )
+
+    async def resume_chain():
+        if uploaded_file is None:
+            advice = await call("career_advice", career_advice,
+                                resume_data={}, target_city=city, client=client)
+            return None, [], advice
+
+        parser = AIResumeParser(client=client)
+        text = await asyncio.get_running_loop().run_in_executor(
+            executor, parser.extract_text_from_pdf, uploaded_file
+        )
+        if text.startswith("Error"):
+            return {"error": text}, [], TIMEOUT_MESSAGES["career_advice"]
+
+        # Suggestions come back in the same call as the analysis; a separate
+        # request is only made if the analysis did not provide them
+        analysis = await call("resume", analyze, parser, text)
+        summary = parser.build_summary(text, analysis)
+        suggestions_task = asyncio.create_task(
+            call("suggestions", suggestions, parser)
+        )
+
+        resume_data = {}
+        if "error" not in summary:
+            resume_data = {
+                "skills": summary.get("tech_skills", []),
+                "major": (analysis.get("education") or {}).get("major") or "General"
+            }
+        advice = await call("career_advice", career_advice,
+                            resume_data=resume_data, target_city=city, client=client)
+        return summary, await suggestions_task, advice
+
+    try:
+        (summary, suggestions, advice), reality_check = await asyncio.gather(resume_chain(), reality_task)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    timings["total"] = time.perf_counter() - start
+
+    return {
+        "resume": summary,
+        "suggestions": suggestions,
+        "reality_check": reality_check,
+        "career_advice": advice,
+        "timings": timings,
+        "first_content": first_content,
+        "timed_out": timed_out
+    }
+
+
+def run_agents_sync(*args, **kwargs) -> Dict:
+    """
+    Blocking wrapper around run_agents() for the Streamlit script thread
+
+    Takes the same arguments as run_agents().
+    """
+    return asyncio.run(run_agents(*args, **kwargs))
+
+
+def stream_agents(*args, **kwargs) -> Iterator[Tuple[str, object]]:
+    """
+    Run the agents in the background and yield their output as it streams
+
+    Takes the same arguments as run_agents() (except on_event). Meant for the
+    Streamlit script thread, which must do all rendering itself.
+
+    Yields:
+        ("reality_check", chunk), ("career_advice", chunk),
+        ("resume_field", (field, value)) and finally ("done", results) where
+        results is the run_agents() dictionary
+    """
+    events = queue.Queue()
+
+    def worker():
+        try:
+            result = run_agents_sync(*args, on_event=lambda name, payload: events.put((name, payload)), **kwargs)
+            events.put(("done", result))
+        except Exception as e:
+            events.put(("failed", e))
+
+    threading.Thread(target=worker, daemon=True, name="agent-stream").start()
+
+    while True:
+        name, payload = events.get()
+        if name == "failed":
+            raise payload
+        yield name, payload
+        if name == "done":
+            return
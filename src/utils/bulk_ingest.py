@@ -0,0 +1,221 @@
+"""
+Bulk resume ingestion
+
+Takes a folder or a .zip of PDF resumes, extracts them across a process pool,
+and (optionally) runs the AI analysis on each one as soon as its text is
+ready. Results are yielded as they finish, in the get_resume_summary() shape.
+
+Pathological PDFs are bounded per file: only the first max_pages pages are
+read, and extraction is abandoned after time_limit seconds.
+
+Usage:
+    python -m src.utils.bulk_ingest resumes.zip --no-analyze
+"""
+
+import argparse
+import os
+import signal
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from io import BytesIO
+from typing import Dict, Iterator, Tuple
+
+from src.utils.llm_client import LLMClient, get_llm_client
+from src.utils.pdf_text import PdfReader
+from src.utils.resume_parser import AIResumeParser
+
+MAX_PAGES_PER_FILE = 10
+FILE_TIME_LIMIT_SECONDS = 20.0
+
+# Concurrent AI analyses (the LLM scheduler still enforces the rate limit)
+ANALYSIS_WORKERS = 4
+
+
+def iter_resume_files(path: str) -> Iterator[Tuple[str, bytes]]:
+    """
+    Yield every PDF in a folder (recursively) or a zip archive
+
+    Args:
+        path: Directory or .zip file
+
+    Yields:
+        (name, file bytes) tuples
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and info.filename.lower().endswith('.pdf'):
+                    yield info.filename, archive.read(info)
+        return
+
+    for root, _, files in os.walk(path):
+        for filename in sorted(files):
+            if filename.lower().endswith('.pdf'):
+                full_path = os.path.join(root, filename)
+                with open(full_path, 'rb') as f:
+                    yield os.path.relpath(full_path, path), f.read()
+
+
+def _raise_timeout(signum, frame):
+    raise TimeoutError("PDF extraction time limit exceeded")
+
+
+def _extract_file(name: str, data: bytes, max_pages: int, time_limit: float) -> Dict:
+    """
+    Worker: extract one PDF within the page and time limits
+
+    Returns:
+        Dictionary with 'file', 'text', 'pages', 'truncated', 'seconds' and
+        'error' (None on success)
+    """
+    start = time.perf_counter()
+    result = {"file": name, "text": "", "pages": 0, "truncated": False, "error": None}
+
+    # Hard limit where SIGALRM exists (pool workers run tasks on their main thread);
+    # elsewhere the limit is only checked between pages
+    use_alarm = hasattr(signal, 'setitimer')
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, time_limit)
+
+    pages = []
+    try:
+        reader = PdfReader(BytesIO(data))
+        for i, page in enumerate(reader.pages):
+            if i >= max_pages or time.perf_counter() - start > time_limit:
+                result["truncated"] = True
+                break
+            pages.append(page.extract_text() or "")
+    except TimeoutError as e:
+        # Keep the pages read before the limit hit
+        result["truncated"] = True
+        if not pages:
+            result["error"] = f"Error parsing PDF: {str(e)}"
+    except Exception as e:
+        result["error"] = f"Error parsing PDF: {str(e)}"
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+    if not result["error"]:
+        result["text"] = "".join(f"{page}\n" for page in pages)
+        result["pages"] = len(pages)
+
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def _analyze(extracted: Dict, client: LLMClient) -> Dict:
+    parser = AIResumeParser(client=client)
+    parser.raw_text = extracted["text"]
+    extracted["summary"] = parser.build_summary(extracted["text"], parser.analyze(extracted["text"]))
+    return extracted
+
+
+def ingest_resumes(path: str, analyze: bool = True, api_key: str = None, client: LLMClient = None,
+                   n_jobs: int = None, max_pages: int = MAX_PAGES_PER_FILE,
+                   time_limit: float = FILE_TIME_LIMIT_SECONDS, report: Dict = None) -> Iterator[Dict]:
+    """
+    Extract (and analyze) every resume in a folder or zip, yielding as they finish
+
+    Args:
+        path: Directory or .zip file of PDF resumes
+        analyze: Run the AI analysis on each resume
+        api_key: Google Gemini API key (loaded from environment if not provided)
+        client: LLMClient to use (shared Gemini client if not provided)
+        n_jobs: Extraction processes (CPU count if not provided)
+        max_pages: Pages read per file; longer files are marked truncated
+        time_limit: Seconds allowed per file before extraction is abandoned
+        report: Optional dictionary updated in place with 'files', 'failed',
+                'pages', 'seconds' and 'resumes_per_second'
+
+    Yields:
+        Dictionary per file with 'file', 'text', 'pages', 'truncated',
+        'seconds' (extraction time), 'error' and 'summary' (get_resume_summary()
+        shape; only the error dict when extraction failed, None when analyze
+        is False)
+    """
+    if analyze and client is None:
+        client = get_llm_client(api_key)
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if report is None:
+        report = {}
+    report.update({"files": 0, "failed": 0, "pages": 0, "seconds": 0.0, "resumes_per_second": 0.0})
+    start = time.perf_counter()
+
+    def finished(result):
+        report["files"] += 1
+        report["pages"] += result["pages"]
+        if result["error"] or "error" in (result["summary"] or {}):
+            report["failed"] += 1
+        report["seconds"] = time.perf_counter() - start
+        report["resumes_per_second"] = report["files"] / report["seconds"] if report["seconds"] else 0.0
+        return result
+
+    files = iter_resume_files(path)
+    # Bounded window of submitted files keeps memory flat for large archives
+    window = n_jobs * 4
+
+    with ProcessPoolExecutor(max_workers=n_jobs) as processes, \
+            ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS) as threads:
+        # Analysis futures map to their extraction result, so a failed
+        # analysis is still reported against its file
+        extracting, analyzing = set(), {}
+
+        def submit_next():
+            for name, data in files:
+                extracting.add(processes.submit(_extract_file, name, data, max_pages, time_limit))
+                if len(extracting) >= window:
+                    return
+
+        submit_next()
+        while extracting or analyzing:
+            done, _ = wait(extracting | analyzing.keys(), return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in analyzing:
+                    result = analyzing.pop(future)
+                    try:
+                        future.result()
+                    except Exception as e:
+                        # One bad resume must not stop the rest of the archive
+                        result["summary"] = {"error": f"AI analysis failed: {str(e)}"}
+                    yield finished(result)
+                    continue
+
+                extracting.discard(future)
+                result = future.result()
+                if result["error"]:
+                    result["summary"] = {"error": result["error"]}
+                    yield finished(result)
+                elif analyze:
+                    analyzing[threads.submit(_analyze, result, client)] = result
+                else:
+                    result["summary"] = None
+                    yield finished(result)
+            submit_next()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-ingest a folder or zip of PDF resumes")
+    parser.add_argument('path', help="Directory or .zip file of resumes")
+    parser.add_argument('--no-analyze', action='store_true', help="Only extract text (no Gemini calls)")
+    parser.add_argument('--jobs', type=int, default=None, help="Extraction processes")
+    parser.add_argument('--max-pages', type=int, default=MAX_PAGES_PER_FILE)
+    parser.add_argument('--time-limit', type=float, default=FILE_TIME_LIMIT_SECONDS)
+    args = parser.parse_args()
+
+    report = {}
+    for result in ingest_resumes(args.path, analyze=not args.no_analyze, n_jobs=args.jobs,
+                                 max_pages=args.max_pages, time_limit=args.time_limit, report=report):
+        status = result["error"] or ("truncated" if result["truncated"] else "ok")
+        print(f"{result['file']}: {result['pages']} pages, {result['seconds']:.2f}s ({status})")
+
+    print(f"\n{report['files']} resumes ({report['failed']} failed, {report['pages']} pages) "
+          f"in {report['seconds']:.1f}s - {report['resumes_per_second']:.1f} resumes/second")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""
+Resume keyword matching
+
+All careers' keywords (plus synonyms such as "k8s" for Kubernetes) are
+compiled once into an Aho-Corasick automaton, so a resume is scanned in a
+single pass no matter how many keywords there are. Matches respect word
+boundaries: "Java" does not match "JavaScript", "API" does not match
+"rapid" and "JS" does not match "Node.js". Plurals and version numbers
+still match ("APIs", "Python3").
+
+CareerScorer turns one scan into scores for every career at once: the
+taxonomy's sparse role x skill weight matrix times the resume's skill vector.
+Careers, keywords and synonyms come from the skills taxonomy
+(data/skills_taxonomy.json).
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from src.utils.skills_taxonomy import SkillsTaxonomy, get_taxonomy, normalize_skill
+
+
+class KeywordMatcher:
+    """Aho-Corasick matcher mapping many surface forms to canonical keywords"""
+
+    def __init__(self, keywords: Dict[str, Iterable[str]]):
+        """
+        Args:
+            keywords: Canonical keyword -> alternate spellings (the keyword
+                      itself always matches)
+        """
+        self.keywords = list(keywords)
+
+        # Trie: goto transitions, failure links, and output keywords per state
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[tuple]] = [[]]
+
+        for canonical, aliases in keywords.items():
+            for form in {normalize_skill(canonical), *(normalize_skill(a) for a in aliases)}:
+                if form:
+                    self._add(form, canonical)
+        self._build_failure_links()
+
+    def _add(self, pattern: str, canonical: str):
+        state = 0
+        for char in pattern:
+            if char not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[state][char] = len(self._goto) - 1
+            state = self._goto[state][char]
+        self._out[state].append((len(pattern), canonical))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                if state and char in self._goto[fallback]:
+                    self._fail[child] = self._goto[fallback][char]
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find(self, text: str) -> Set[str]:
+        """
+        Scan text once for every keyword
+
+        Args:
+            text: Resume text (any case)
+
+        Returns:
+            Set of canonical keywords found on word boundaries
+        """
+        text = normalize_skill(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        state = 0
+
+        for end, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for length, canonical in out[state]:
+                if canonical in found:
+                    continue
+                start = end - length + 1
+                # Word boundary before the match: not a letter/digit, and not a
+                # dot inside a word ("js" in "Node.js")
+                if start > 0 and (text[start - 1].isalnum()
+                                  or (text[start - 1] == '.' and start > 1 and text[start - 2].isalnum())):
+                    continue
+                if not _ends_word(text, end + 1, length):
+                    continue
+                found.add(canonical)
+
+        return found
+
+    def match_careers(self, text: str, careers: Dict[str, Iterable[str]] = None) -> Dict[str, Dict]:
+        """
+        Found and missing keywords for every career from one scan
+
+        Args:
+            text: Resume text
+            careers: Career -> keyword list or {keyword: weight} (the
+                     taxonomy's roles if not provided)
+
+        Returns:
+            Dictionary of career -> career_match() result
+        """
+        careers = get_taxonomy().roles if careers is None else careers
+        found = self.find(text)
+        return {career: career_match(found, keywords) for career, keywords in careers.items()}
+
+
+def _ends_word(text: str, i: int, length: int) -> bool:
+    """
+    Whether a match ending just before text[i] ends on a word boundary
+
+    Keywords of two or more characters may carry a plural "s" ("APIs") or a
+    version number ("Python3", "Python3.11").
+    """
+    if length >= 2 and i < len(text):
+        if text[i] == 's':
+            i += 1
+        elif text[i].isdigit():
+            while i < len(text) and (text[i].isdigit() or (text[i] == '.' and i + 1 < len(text) and text[i + 1].isdigit())):
+                i += 1
+    if i >= len(text):
+        return True
+    return not (text[i].isalnum() or (text[i] == '.' and i + 1 < len(text) and text[i + 1].isalnum()))
+
+
+def career_match(found: Set[str], keywords: Iterable[str]) -> Dict:
+    """
+    Found and missing keywords of one career
+
+    Args:
+        found: Canonical keywords found in the resume
+        keywords: The career's keywords, as a list or {keyword: weight}
+
+    Returns:
+        Dictionary with 'found', 'missing' (in keyword order) and 'score'
+        (weighted percentage of keywords found)
+    """
+    weights = keywords if isinstance(keywords, dict) else dict.fromkeys(keywords, 1.0)
+    hits = [k for k in weights if k in found]
+    total = sum(weights.values())
+    return {
+        "found": hits,
+        "missing": [k for k in weights if k not in found],
+        "score": sum(weights[k] for k in hits) / total * 100 if total else 0.0
+    }
+
+
+class CareerScorer:
+    """Score a resume against every career in one matrix-vector product"""
+
+    def __init__(self, taxonomy: SkillsTaxonomy, matcher: KeywordMatcher = None):
+        """
+        Args:
+            taxonomy: Skills taxonomy (its role x skill matrix is the scoring matrix)
+            matcher: KeywordMatcher over the taxonomy's skills (built if not provided)
+        """
+        self.taxonomy = taxonomy
+        self.matcher = matcher or KeywordMatcher(taxonomy.aliases)
+        self._totals = np.asarray(taxonomy.role_matrix.sum(axis=1)).ravel()
+        self._role_index = {role: i for i, role in enumerate(taxonomy.role_names)}
+
+    def _vector(self, found: Set[str]) -> np.ndarray:
+        index = self.taxonomy.skill_index
+        vector = np.zeros(len(index), dtype=np.float32)
+        vector[[index[k] for k in found if k in index]] = 1
+        return vector
+
+    def _scores(self, vector: np.ndarray) -> np.ndarray:
+        return self.taxonomy.role_matrix @ vector / np.maximum(self._totals, 1e-9) * 100
+
+    def _details(self, vector: np.ndarray, i: int):
+        # Found/missing straight from the role's matrix row (skill columns)
+        columns = self.taxonomy.role_columns[i]
+        hit = vector[columns] > 0
+        skills = self.taxonomy.skills
+        return [skills[j] for j in columns[hit]], [skills[j] for j in columns[~hit]]
+
+    def rank_found(self, found: Set[str], top_n: int = None) -> List[Dict]:
+        """
+        Rank every career for an already-scanned set of keywords
+
+        Args:
+            found: Canonical keywords found in the resume
+            top_n: Only list 'found'/'missing' for the best top_n careers
+                   (all careers if not provided); use match() for others
+
+        Returns:
+            List of {'career', 'score', 'found', 'missing'} dictionaries,
+            best match first (ties keep the taxonomy's role order)
+        """
+        vector = self._vector(found)
+        scores = self._scores(vector)
+        ranking = []
+        for rank, i in enumerate(np.argsort(-scores, kind='stable')):
+            entry = {"career": self.taxonomy.role_names[i], "score": float(scores[i])}
+            if top_n is None or rank < top_n:
+                entry["found"], entry["missing"] = self._details(vector, i)
+            ranking.append(entry)
+        return ranking
+
+    def match(self, found: Set[str], career: str) -> Optional[Dict]:
+        """
+        career_match() for one taxonomy career, from its matrix row
+
+        Returns:
+            Dictionary with 'found', 'missing' and 'score', or None if the
+            career is not in the taxonomy
+        """
+        i = self._role_index.get(career)
+        if i is None:
+            return None
+        vector = self._vector(found)
+        hits, missing = self._details(vector, i)
+        score = float((self.taxonomy.role_matrix[i] @ vector)[0] / max(self._totals[i], 1e-9) * 100)
+        return {"found": hits, "missing": missing, "score": score}
+
+    def rank(self, text: str, top_n: int = None) -> Dict:
+        """
+        Scan a resume once and rank every career
+
+        Args:
+            text: Resume text
+            top_n: See rank_found()
+
+        Returns:
+            Dictionary with 'ranking' (see rank_found()), 'by_career'
+            (career -> ranking entry) and 'found' (all keywords found)
+        """
+        found = self.matcher.find(text)
+        ranking = self.rank_found(found, top_n)
+        return {
+            "ranking": ranking,
+            "by_career": {entry["career"]: entry for entry in ranking},
+            "found": found
+        }
+
+
+def keywords_for_career(career: str) -> List[str]:
+    """Keyword list for a career (the taxonomy's default skills if it has none)"""
+    return get_taxonomy().role_skills(career)
+
+
+_matcher = None
+_scorer = None
+
+
+def get_keyword_matcher() -> KeywordMatcher:
+    """Process-wide matcher over every taxonomy skill and alias, compiled on first use"""
+    global _matcher
+    if _matcher is None:
+        _matcher = KeywordMatcher(get_taxonomy().aliases)
+    return _matcher
+
+
+def get_career_scorer() -> CareerScorer:
+    """Process-wide scorer over the taxonomy's roles, sharing the keyword matcher"""
+    global _scorer
+    if _scorer is None:
+        _scorer = CareerScorer(get_taxonomy(), get_keyword_matcher())
+    return _scorer
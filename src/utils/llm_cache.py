@@ -0,0 +1,161 @@
+"""
+Persistent cache for LLM responses.
+
+Responses are stored in SQLite, keyed by a hash of the normalized input text,
+the prompt version and the model name, with a TTL and a size-bounded LRU.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+DEFAULT_CACHE_PATH = os.path.join('data', 'llm_cache.sqlite')
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 1000
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so re-extracted copies of a document hash the same"""
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def make_cache_key(text: str, prompt_version: str, model_name: str) -> str:
+    """
+    Build a cache key for one LLM request
+
+    Args:
+        text: Document text sent in the prompt
+        prompt_version: Version tag of the prompt template
+        model_name: Model the request goes to
+
+    Returns:
+        str: Hex sha256 digest
+    """
+    digest = hashlib.sha256()
+    for part in (normalize_text(text), prompt_version, model_name):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed response cache with TTL and LRU eviction"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Initialize the cache
+
+        Args:
+            path: SQLite file (':memory:' for a throwaway cache)
+            ttl_seconds: Entries older than this are treated as misses
+            max_entries: Least recently used entries beyond this are evicted
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+        if path != ':memory:' and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                latency REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses (last_access)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[object]:
+        """
+        Look up a cached response
+
+        Args:
+            key: Key from make_cache_key()
+
+        Returns:
+            The cached (JSON-decoded) value, or None on a miss or expiry
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at, latency FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            self.saved_seconds += row[2]
+            return json.loads(row[0])
+
+    def put(self, key: str, value, latency: float = 0.0):
+        """
+        Store a response and evict least recently used entries over the limit
+
+        Args:
+            key: Key from make_cache_key()
+            value: JSON-serializable response
+            latency: Seconds the original call took (counted as saved on hits)
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, last_access, latency) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(value), now, now, latency)
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE key NOT IN "
+                "(SELECT key FROM responses ORDER BY last_access DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            Dictionary with hits, misses, hit_rate, saved_seconds and entries
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "saved_seconds": self.saved_seconds,
+            "entries": entries
+        }
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Process-wide ResponseCache at DEFAULT_CACHE_PATH"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ResponseCache()
+        return _shared_cache
@@ -0,0 +1,195 @@
+"""
+Shared LLM client used by all agents
+
+Configures Gemini once per process and reuses one GenerativeModel per model
+name for every call. Backends are pluggable so a local stub can stand in for
+Gemini in tests and benchmarks.
+
+google.generativeai keeps its API key in process-global state
+(genai.configure), so a process serves exactly one Gemini key; asking for a
+second one is an error rather than a silent switch of every client.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from typing import Callable, Iterator, List, Optional, Union
+
+from src.utils.llm_scheduler import LLMScheduler
+
+# Using Gemini 3 Flash Preview - Latest balanced model (Dec 2025)
+# https://ai.google.dev/gemini-api/docs/models#gemini-3-flash
+DEFAULT_MODEL = 'gemini-3-flash-preview'
+
+
+_configured_key = None
+_configure_lock = threading.Lock()
+
+
+def _configure_gemini(api_key: str):
+    """
+    Configure google.generativeai once per process
+
+    Raises:
+        ValueError: If the process is already configured with another key
+    """
+    global _configured_key
+    import google.generativeai as genai
+
+    with _configure_lock:
+        if _configured_key is None:
+            genai.configure(api_key=api_key)
+            _configured_key = api_key
+        elif api_key != _configured_key:
+            raise ValueError(
+                "Gemini is already configured with a different API key in this process "
+                "(google.generativeai supports one key per process)."
+            )
+
+
+class GeminiBackend:
+    """Google Gemini backend (uses the process-wide key, see _configure_gemini)"""
+
+    def __init__(self, api_key: str, model_name: str = DEFAULT_MODEL):
+        import google.generativeai as genai
+
+        _configure_gemini(api_key)
+        self.model_name = model_name
+        self.model = genai.GenerativeModel(model_name)
+
+    def generate(self, prompt: str) -> str:
+        return self.model.generate_content(prompt).text
+
+    def generate_stream(self, prompt: str) -> Iterator[str]:
+        for chunk in self.model.generate_content(prompt, stream=True):
+            if chunk.text:
+                yield chunk.text
+
+
+class StubBackend:
+    """
+    Local stand-in for Gemini
+
+    Returns canned text (or the result of a function of the prompt) after an
+    optional delay (seconds, or a function of the prompt to inject per-call
+    latency), and records every prompt it receives.
+    """
+
+    def __init__(self, response: Union[str, Callable[[str], str]] = "",
+                 delay: Union[float, Callable[[str], float]] = 0.0, model_name: str = 'stub'):
+        self.response = response
+        self.delay = delay
+        self.model_name = model_name
+        self.prompts: List[str] = []
+
+    def generate(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        delay = self.delay(prompt) if callable(self.delay) else self.delay
+        if delay:
+            time.sleep(delay)
+        return self.response(prompt) if callable(self.response) else self.response
+
+    def generate_stream(self, prompt: str, chunk_size: int = 16) -> Iterator[str]:
+        """Yield the canned response in chunks, spreading the delay across them"""
+        self.prompts.append(prompt)
+        text = self.response(prompt) if callable(self.response) else self.response
+        delay = self.delay(prompt) if callable(self.delay) else self.delay
+        chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)] or [""]
+        for chunk in chunks:
+            if delay:
+                time.sleep(delay / len(chunks))
+            yield chunk
+
+
+class LLMClient:
+    """Thin front door every agent calls instead of touching genai directly"""
+
+    def __init__(self, backend, scheduler: Optional[LLMScheduler] = None):
+        """
+        Args:
+            backend: GeminiBackend, StubBackend or anything with generate()
+            scheduler: Rate limiter / single-flight / retry layer (calls go
+                       straight to the backend if not provided)
+        """
+        self.backend = backend
+        self.scheduler = scheduler
+
+    @property
+    def model_name(self) -> str:
+        return self.backend.model_name
+
+    def generate(self, prompt: str) -> str:
+        """
+        Generate a completion
+
+        Args:
+            prompt: Full prompt text
+
+        Returns:
+            str: Model response text
+        """
+        if self.scheduler is None:
+            return self.backend.generate(prompt)
+
+        key = hashlib.sha256(f"{self.model_name}\0{prompt}".encode('utf-8')).hexdigest()
+        return self.scheduler.run(key, lambda: self.backend.generate(prompt))
+
+    def generate_stream(self, prompt: str) -> Iterator[str]:
+        """
+        Generate a completion as a stream of text chunks
+
+        Args:
+            prompt: Full prompt text
+
+        Returns:
+            Iterator of text chunks (a single chunk if the backend cannot stream)
+        """
+        if not hasattr(self.backend, 'generate_stream'):
+            return iter([self.generate(prompt)])
+        if self.scheduler is None:
+            return self.backend.generate_stream(prompt)
+        return self.scheduler.stream(lambda: self.backend.generate_stream(prompt))
+
+
+_clients = {}
+_scheduler = None
+_clients_lock = threading.Lock()
+
+
+def resolve_api_key(api_key: Optional[str] = None) -> str:
+    """Return api_key, falling back to the GEMINI_API_KEY environment variable"""
+    return api_key or os.getenv('GEMINI_API_KEY', '')
+
+
+def get_llm_client(api_key: Optional[str] = None, model_name: str = DEFAULT_MODEL) -> LLMClient:
+    """
+    Process-wide Gemini client for a model
+
+    Args:
+        api_key: Google Gemini API key (loaded from environment if not provided)
+        model_name: Gemini model to use
+
+    Returns:
+        LLMClient: Created on first use, then shared. All clients share one
+                   LLMScheduler (one quota for the process's key).
+
+    Raises:
+        ValueError: If no API key is available, or it differs from the key
+                    the process is already configured with
+    """
+    api_key = resolve_api_key(api_key)
+    if not api_key:
+        raise ValueError(
+            "GEMINI_API_KEY not found. Please provide api_key parameter or set GEMINI_API_KEY environment variable."
+        )
+
+    global _scheduler
+    with _clients_lock:
+        if model_name not in _clients:
+            if _scheduler is None:
+                _scheduler = LLMScheduler()
+            _clients[model_name] = LLMClient(GeminiBackend(api_key, model_name), _scheduler)
+        elif api_key != _configured_key:
+            _configure_gemini(api_key)
+        return _clients[model_name]
@@ -0,0 +1,332 @@
+"""
+JSON helpers for LLM responses
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Tuple
+
+
+def _load_value(text: str) -> Tuple[Any, bool]:
+    """Parse one streamed field value, repairing objects and arrays if needed"""
+    try:
+        return json.loads(text), True
+    except ValueError:
+        pass
+    if text.strip()[:1] in ('{', '['):
+        try:
+            return json.loads(repair_json(text.strip())), True
+        except ValueError:
+            pass
+    return None, False
+
+
+class IncrementalJSONParser:
+    """
+    Parse a streamed JSON object field by field
+
+    Feed text chunks as they arrive; every top-level field of the outermost
+    object is returned as soon as its value is complete, long before the
+    closing brace. Text before the first '{' (e.g. a ```json fence) is ignored.
+    Object and array values with trailing commas or unquoted keys are repaired;
+    values that still do not parse are skipped.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.result: Dict[str, Any] = {}
+        self.done = False
+
+        self._pos = 0
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key = None
+        self._key_start = None
+        self._value_start = None
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Add a chunk of streamed text
+
+        Args:
+            chunk: Next piece of the model output
+
+        Returns:
+            List of (key, value) pairs completed by this chunk
+        """
+        self.text += chunk
+        completed = []
+        text = self.text
+
+        while self._pos < len(text) and not self.done:
+            i, c = self._pos, text[self._pos]
+            self._pos += 1
+
+            if not self._started:
+                if c == '{':
+                    self._started = True
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == '\\':
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        self._key = json.loads(text[self._key_start:i + 1])
+                        self._key_start = None
+                continue
+
+            if c == '"':
+                self._in_string = True
+                if self._depth == 1 and self._key is None and self._value_start is None:
+                    self._key_start = i
+            elif c in '{[':
+                self._depth += 1
+            elif c in '}]':
+                self._depth -= 1
+            elif c == ':' and self._depth == 1 and self._key is not None and self._value_start is None:
+                self._value_start = i + 1
+
+            # A top-level ',' or the outermost '}' ends the current value
+            if (c == ',' and self._depth == 1) or self._depth == 0:
+                if self._key is not None and self._value_start is not None:
+                    value, ok = _load_value(text[self._value_start:i])
+                    if ok:
+                        self.result[self._key] = value
+                        completed.append((self._key, value))
+                self._key = None
+                self._value_start = None
+                if self._depth == 0:
+                    self.done = True
+
+        return completed
+
+
+# Opening brackets tried per response before giving up
+MAX_JSON_CANDIDATES = 8
+
+
+def find_json(text: str, start: int = 0, openers: str = '{[') -> str:
+    """
+    Locate a JSON object or array in model output
+
+    Skips anything before the first opening bracket at or after start
+    (prose, ```json fences) and stops at its matching bracket. If the value
+    is cut off, everything from the opening bracket on is returned.
+
+    Args:
+        text: Raw model response
+        start: Position to search from
+        openers: Opening brackets to look for ('{' for objects only)
+
+    Returns:
+        The JSON text, or "" if there is no opening bracket
+    """
+    starts = [i for i in (text.find(c, start) for c in openers) if i != -1]
+    if not starts:
+        return ""
+    start = min(starts)
+
+    depth, in_string, escape = 0, False, False
+    for i in range(start, len(text)):
+        c = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif c == '\\':
+                escape = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c in '{[':
+            depth += 1
+        elif c in '}]':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return text[start:]
+
+
+def _json_candidates(text: str, openers: str) -> List[str]:
+    """find_json() from each opening bracket in turn ("see [1] then {...}")"""
+    candidates, start = [], 0
+    while len(candidates) < MAX_JSON_CANDIDATES:
+        candidate = find_json(text, start, openers)
+        if not candidate:
+            break
+        candidates.append(candidate)
+        start = text.index(candidate, start) + 1
+    return candidates
+
+
+BARE_WORDS = {'None': 'null', 'True': 'true', 'False': 'false',
+              'null': 'null', 'true': 'true', 'false': 'false'}
+
+
+def repair_json(text: str) -> str:
+    """
+    Fix the defects LLMs commonly produce in JSON
+
+    - trailing commas before '}' or ']'
+    - unquoted object keys ({name: "x"})
+    - Python literals (None, True, False)
+    - truncation: an unterminated string is closed, a literal or number cut
+      off mid-token is dropped, a dangling key or comma is dropped, and open
+      brackets are closed
+
+    Args:
+        text: JSON-ish text (see find_json())
+
+    Returns:
+        Repaired JSON text (not guaranteed valid for arbitrary input)
+    """
+    out = []
+    stack = []
+    in_string, escape = False, False
+    expect_key = False
+    # Where the current object key started in out (None once its ':' is seen)
+    key_start = None
+    i = 0
+
+    def drop_trailing_comma():
+        j = len(out) - 1
+        while j >= 0 and out[j].isspace():
+            j -= 1
+        if j >= 0 and out[j] == ',':
+            del out[j]
+
+    while i < len(text):
+        c = text[i]
+        if in_string:
+            out.append(c)
+            if escape:
+                escape = False
+            elif c == '\\':
+                escape = True
+            elif c == '"':
+                in_string = False
+            i += 1
+            continue
+
+        if c == '"':
+            in_string = True
+            if expect_key:
+                key_start = len(out)
+            expect_key = False
+        elif c == ':':
+            key_start = None
+        elif c in '{[':
+            stack.append('}' if c == '{' else ']')
+            expect_key = c == '{'
+        elif c in '}]':
+            drop_trailing_comma()
+            if stack:
+                stack.pop()
+            expect_key = False
+        elif c == ',':
+            expect_key = bool(stack) and stack[-1] == '}'
+        elif (c.isalpha() or c == '_') and not (c in 'eE' and i and text[i - 1] in '0123456789.'):
+            # Bare word (not a number's exponent): an unquoted key or a literal
+            j = i
+            while j < len(text) and (text[j].isalnum() or text[j] in '_-'):
+                j += 1
+            word = text[i:j]
+            if expect_key:
+                key_start = len(out)
+                out.append(f'"{word}"')
+            elif j < len(text) or word in BARE_WORDS:
+                out.append(BARE_WORDS.get(word, f'"{word}"'))
+            # else: cut off mid-word ("tru"), so the value is dropped
+            expect_key = False
+            i = j
+            continue
+        out.append(c)
+        i += 1
+
+    # Truncated output: drop a key that never got its ':', close an open
+    # string, then drop whatever cannot stand alone
+    if key_start is not None:
+        del out[key_start:]
+    elif in_string:
+        if escape:
+            out.pop()
+        out.append('"')
+    repaired = "".join(out).rstrip()
+    # A number cut off after '.', 'e' or a sign
+    number = re.search(r'[-\d][-+\d.eE]*$', repaired)
+    if number:
+        repaired = (repaired[:number.start()] + number.group().rstrip('.eE+-')).rstrip()
+    while repaired and repaired[-1] in ',:':
+        if repaired[-1] == ':':
+            # Key without a value: remove the key too
+            repaired = repaired[:-1].rstrip()
+            key_start = repaired.rfind('"', 0, len(repaired) - 1)
+            repaired = repaired[:key_start].rstrip()
+        else:
+            repaired = repaired[:-1].rstrip()
+    return repaired + "".join(reversed(stack))
+
+
+def parse_json_lenient(text: str, expected: type = None) -> Tuple[Any, bool]:
+    """
+    Parse model output that should contain one JSON value
+
+    Bracketed candidates are tried in order, each as-is and then with
+    repair_json(), so prose such as "see [1]" before the real value is
+    skipped while a truncated outer object still wins over a complete
+    object nested inside it.
+
+    Args:
+        text: Raw model response
+        expected: dict or list to only accept that kind of value (objects
+                  are then only looked for from '{')
+
+    Returns:
+        (value, repaired): value is None if nothing could be parsed;
+        repaired is True if the text needed fixing first
+    """
+    openers = {dict: '{', list: '['}.get(expected, '{[')
+    candidates = _json_candidates(text, openers)
+
+    for candidate in candidates:
+        for repaired in (False, True):
+            try:
+                value = json.loads(repair_json(candidate) if repaired else candidate)
+            except ValueError:
+                continue
+            if expected is None or isinstance(value, expected):
+                return value, repaired
+    return None, bool(candidates)
+
+
+def validate_fields(value: Any, schema: Dict[str, type], fields: List[str] = None) -> List[str]:
+    """
+    Check a parsed object against the expected top-level fields
+
+    Args:
+        value: Parsed JSON
+        schema: Field -> expected type (dict, list, str or (int, float));
+                null is accepted for scalar fields but not for dict or list
+                fields, which callers iterate and index
+        fields: Fields to check (all of schema if not provided)
+
+    Returns:
+        Fields that are missing or have the wrong type
+    """
+    fields = list(schema) if fields is None else fields
+    if not isinstance(value, dict):
+        return fields
+    return [
+        field for field in fields
+        if field not in value or not (
+            isinstance(value[field], schema[field])
+            or (value[field] is None and schema[field] not in (dict, list))
+        )
+    ]
@@ -0,0 +1,208 @@
+"""
+Rate-limit-aware scheduler for LLM calls
+
+Every generate call goes through a scheduler shared per API key:
+
+- a token bucket caps the request rate so bursts queue instead of hitting quota
+- identical prompts already in flight are coalesced (single-flight): later
+  callers wait for the first call's result instead of sending a duplicate
+- 429 / 5xx errors are retried with exponential backoff and full jitter
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Iterator
+
+# Default budget per API key
+DEFAULT_RATE_PER_SECOND = 2.0
+DEFAULT_BURST = 5
+
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_BASE_DELAY = 0.5
+DEFAULT_MAX_DELAY = 8.0
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+RETRYABLE_ERROR_NAMES = {
+    'ResourceExhausted', 'TooManyRequests', 'ServiceUnavailable',
+    'InternalServerError', 'BadGateway', 'GatewayTimeout', 'DeadlineExceeded'
+}
+
+
+def is_retryable(error: Exception) -> bool:
+    """True for rate-limit (429) and server-side (5xx) errors"""
+    code = getattr(error, 'code', None)
+    if isinstance(code, int) and code in RETRYABLE_STATUS_CODES:
+        return True
+    return type(error).__name__ in RETRYABLE_ERROR_NAMES
+
+
+class TokenBucket:
+    """Thread-safe token bucket"""
+
+    def __init__(self, rate_per_second: float, capacity: int):
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Take one token, sleeping until one is available
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                sleep_for = (1 - self._tokens) / self.rate
+            time.sleep(sleep_for)
+            waited += sleep_for
+
+
+class LLMScheduler:
+    """Token bucket + single-flight + retry front for one API key"""
+
+    def __init__(self, rate_per_second: float = DEFAULT_RATE_PER_SECOND, burst: int = DEFAULT_BURST,
+                 max_retries: int = DEFAULT_MAX_RETRIES, base_delay: float = DEFAULT_BASE_DELAY,
+                 max_delay: float = DEFAULT_MAX_DELAY):
+        self.bucket = TokenBucket(rate_per_second, burst)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+        self.calls = 0
+        self.coalesced = 0
+        self.retries = 0
+        self.failures = 0
+        self.waiting = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: uniform over [0, min(max_delay, base * 2^attempt)]
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _wait_for_token(self):
+        with self._lock:
+            self.waiting += 1
+        try:
+            waited = self.bucket.acquire()
+        finally:
+            with self._lock:
+                self.waiting -= 1
+                self.total_wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def _call_with_retries(self, fn: Callable[[], object]):
+        attempt = 0
+        while True:
+            self._wait_for_token()
+            with self._lock:
+                self.calls += 1
+            try:
+                return fn()
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    with self._lock:
+                        self.failures += 1
+                    raise
+                with self._lock:
+                    self.retries += 1
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+
+    def run(self, key: str, fn: Callable[[], object]):
+        """
+        Run fn under the rate limit, sharing the result with identical calls
+
+        Args:
+            key: Identity of the request (e.g. hash of model + prompt)
+            fn: Zero-argument callable performing the request
+
+        Returns:
+            Whatever fn returns (the same object for coalesced callers)
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                future = Future()
+                self._in_flight[key] = future
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(self._call_with_retries(fn))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+        return future.result()
+
+    def stream(self, open_stream: Callable[[], Iterator[str]]) -> Iterator[str]:
+        """
+        Rate-limit a streaming call
+
+        Streams are not coalesced, and they are only retried if they fail
+        before the first chunk (later chunks have already been shown).
+
+        Args:
+            open_stream: Zero-argument callable returning a chunk iterator
+        """
+        attempt = 0
+        while True:
+            self._wait_for_token()
+            with self._lock:
+                self.calls += 1
+            started = False
+            try:
+                for chunk in open_stream():
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                if started or attempt >= self.max_retries or not is_retryable(e):
+                    with self._lock:
+                        self.failures += 1
+                    raise
+                with self._lock:
+                    self.retries += 1
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            Dictionary with queue_depth (callers waiting for a token),
+            in_flight, calls, coalesced, retries, failures and wait times
+        """
+        with self._lock:
+            return {
+                "queue_depth": self.waiting,
+                "in_flight": len(self._in_flight),
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "retries": self.retries,
+                "failures": self.failures,
+                "total_wait_seconds": self.total_wait_seconds,
+                "max_wait_seconds": self.max_wait_seconds,
+                "avg_wait_seconds": self.total_wait_seconds / self.calls if self.calls else 0.0
+            }
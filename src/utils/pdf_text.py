@@ -0,0 +1,111 @@
+"""
+Single-pass PDF text extraction
+
+Each upload is parsed once and cached by file hash, so the AI resume parser
+and the Resume Pivot keyword matcher share the same extraction instead of
+parsing the PDF twice.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from typing import List
+
+try:
+    from pypdf import PdfReader
+except ImportError:
+    from PyPDF2 import PdfReader
+
+# Extractions kept per process (one Streamlit session uploads a handful)
+MAX_CACHED_FILES = 32
+
+
+class PDFText:
+    """Text extracted from one PDF"""
+
+    def __init__(self, sha256: str, pages: List[str]):
+        """
+        Args:
+            sha256: Hash of the file bytes
+            pages: Extracted text of each page
+        """
+        self.sha256 = sha256
+        self.pages = pages
+        # Same layout the parser always used: every page followed by a newline
+        self.raw = "".join(f"{page}\n" for page in pages)
+        # Upper-cased, whitespace-collapsed form for keyword matching
+        self.normalized = " ".join(self.raw.split()).upper()
+
+
+_cache: "OrderedDict[str, PDFText]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def read_pdf_bytes(source) -> bytes:
+    """
+    Get the bytes of a PDF without consuming the upload stream
+
+    Args:
+        source: File path, raw bytes, or file-like object (e.g. Streamlit UploadedFile)
+
+    Returns:
+        bytes: File contents
+    """
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            return f.read()
+    if hasattr(source, 'getvalue'):
+        return source.getvalue()
+
+    position = source.tell()
+    source.seek(0)
+    data = source.read()
+    source.seek(position)
+    return data
+
+
+def parse_pdf_bytes(data: bytes) -> List[str]:
+    """
+    Extract the text of every page
+
+    Args:
+        data: PDF file contents
+
+    Returns:
+        List of page texts (empty string for pages without text)
+    """
+    reader = PdfReader(BytesIO(data))
+    return [page.extract_text() or "" for page in reader.pages]
+
+
+def extract_pdf_text(source) -> PDFText:
+    """
+    Extract text from a PDF, reusing the result for files already seen
+
+    Args:
+        source: File path, raw bytes, or file-like object (e.g. Streamlit UploadedFile)
+
+    Returns:
+        PDFText: Pages plus raw and normalized text
+
+    Raises:
+        Exception: Whatever the PDF library raises for unreadable files
+    """
+    data = read_pdf_bytes(source)
+    sha256 = hashlib.sha256(data).hexdigest()
+
+    with _cache_lock:
+        if sha256 in _cache:
+            _cache.move_to_end(sha256)
+            return _cache[sha256]
+
+    extracted = PDFText(sha256, parse_pdf_bytes(data))
+
+    with _cache_lock:
+        _cache[sha256] = extracted
+        while len(_cache) > MAX_CACHED_FILES:
+            _cache.popitem(last=False)
+    return extracted
@@ -4,43 +4,307 @@ Person C - Feature Specialist
 Uses Gemini AI to intelligently extract skills, experience, and insights from resumes
 """
 
-import os
-import json
-from typing import Dict, List, Set
-import PyPDF2
-from io import BytesIO
-import google.generativeai as genai
+import re
+import threading
+import time
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from src.utils.llm_cache import ResponseCache, get_response_cache, make_cache_key
+from src.utils.llm_client import LLMClient, get_llm_client
+from src.utils.llm_json import IncrementalJSONParser, parse_json_lenient, validate_fields
+from src.utils.pdf_text import extract_pdf_text
+from src.utils.resume_text import DEFAULT_TOKEN_BUDGET, compact_resume
+from src.utils.keyword_matcher import KeywordMatcher, get_career_scorer, get_keyword_matcher
+from src.utils.skills_taxonomy import get_taxonomy
+
+# Bump when the analysis prompt changes so cached responses are not reused
+ANALYSIS_PROMPT_VERSION = 'analysis-v3'
+
+# Analysis fields and how the prompt describes them (in output order)
+ANALYSIS_FIELDS = {
+    'personal_info': "{name ('Unknown' if absent), email, phone, location (\"city, state\")}",
+    'education': "{highest_degree (PhD|Master's|Bachelor's|Associate's|High School|Unknown), major, university, graduation_year}",
+    'experience': "{total_years (number, estimated from date ranges), current_title, previous_titles [], companies []}",
+    'technical_skills': "[programming languages, tools, technologies, certifications]",
+    'soft_skills': "[leadership, communication, teamwork, ...]",
+    'projects': "[brief descriptions]",
+    'achievements': "[awards, metrics]",
+    'career_summary': "2-3 sentences on their trajectory and strengths",
+    'recommended_roles': "[3-5 job titles they qualify for]",
+    'skill_level': "Entry|Mid|Senior|Expert",
+    'industries': "[industries they have experience in or would fit]",
+    'improvement_suggestions': "[3-5 specific, actionable resume improvements: missing sections, skills to highlight, quantifiable achievements, ATS keywords, formatting]"
+}
+
+# Expected JSON type of each field (validated before use; null is only
+# accepted for the string fields)
+ANALYSIS_SCHEMA = {
+    'personal_info': dict,
+    'education': dict,
+    'experience': dict,
+    'technical_skills': list,
+    'soft_skills': list,
+    'projects': list,
+    'achievements': list,
+    'career_summary': str,
+    'recommended_roles': list,
+    'skill_level': str,
+    'industries': list,
+    'improvement_suggestions': list
+}
+
+# Follow-up requests for fields missing from (or malformed in) a response
+MAX_FIELD_RETRIES = 1
+
+# Fields get_resume_summary() needs; the local parser must be confident in
+# all of them to skip the LLM
+REQUIRED_FIELDS = [
+    'personal_info', 'education', 'experience', 'technical_skills',
+    'soft_skills', 'career_summary', 'recommended_roles', 'skill_level'
+]
+
+# Minimum local confidence (0-1) for a field to be used without the LLM
+LOCAL_CONFIDENCE_THRESHOLD = 0.6
+
+SOFT_SKILLS = [
+    'Leadership', 'Communication', 'Teamwork', 'Collaboration', 'Problem Solving',
+    'Time Management', 'Critical Thinking', 'Adaptability', 'Mentoring', 'Public Speaking',
+    'Project Management', 'Attention to Detail', 'Creativity', 'Negotiation'
+]
+
+EMAIL_RE = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[a-z]{2,}', re.IGNORECASE)
+PHONE_RE = re.compile(r'(?<!\d)(?:\+?1[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}(?!\d)')
+LOCATION_RE = re.compile(r'\b([A-Z][a-zA-Z.]+(?: [A-Z][a-zA-Z.]+)*), ([A-Z]{2})\b')
+YEAR_RE = re.compile(r'\b(19[5-9]\d|20\d\d)\b')
+
+# Highest degree first
+DEGREE_PATTERNS = [
+    ("PhD", re.compile(r'\b(ph\.?\s?d\.?|doctor of|doctorate)', re.IGNORECASE)),
+    ("Master's", re.compile(r"\b(master'?s?\b|m\.s\.|m\.sc\b|mba\b|m\.eng\b|ms in\b)", re.IGNORECASE)),
+    ("Bachelor's", re.compile(r"\b(bachelor'?s?\b|b\.s\.|b\.a\.|b\.sc\b|b\.eng\b|bs in\b|ba in\b)", re.IGNORECASE)),
+    ("Associate's", re.compile(r"\bassociate'?s?\s+(degree|of|in)\b", re.IGNORECASE)),
+    ("High School", re.compile(r'\bhigh school\b', re.IGNORECASE))
+]
+MAJOR_RE = re.compile(r'\bin ([A-Z][A-Za-z&/ ]+?)(?=\s*(?:[,|(;]|\s-\s|\d|$))')
+SCHOOL_RE = re.compile(r'\b(University|College|Institute|School of)\b')
+
+MONTHS = {m: i for i, m in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], 1)}
+DATE_RANGE_RE = re.compile(
+    r'(?:(?P<m1>jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+)?(?P<y1>(?:19|20)\d\d)'
+    r'\s*(?:-|–|—|to)\s*'
+    r'(?:(?P<present>present|current|now)|(?:(?P<m2>jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+)?(?P<y2>(?:19|20)\d\d))',
+    re.IGNORECASE
+)
+
+_soft_skill_matcher = None
+
+
+def _find_soft_skills(text: str) -> List[str]:
+    global _soft_skill_matcher
+    if _soft_skill_matcher is None:
+        _soft_skill_matcher = KeywordMatcher({skill: [] for skill in SOFT_SKILLS})
+    found = _soft_skill_matcher.find(text)
+    return [skill for skill in SOFT_SKILLS if skill in found]
+
+
+def _segments(line: str) -> List[str]:
+    """Non-empty parts of a line split on separators (comma, dash, pipe, parens, ' at ')"""
+    parts = re.split(r'\s*(?:,|\(|\)|\s[-–|]\s| at |;)\s*', line.strip())
+    return [part.strip(' |') for part in parts if part.strip(' |')]
+
+
+def _experience_years(text: str) -> Tuple[float, List[Tuple[str, Optional[str]]]]:
+    """
+    Total years covered by date ranges (overlaps merged) and the
+    (title, company) of each range, most recent first
+
+    The title is the first segment of the text before the dates and the
+    company the second one, if any.
+    """
+    today = date.today()
+    spans, roles = [], []
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    for i, line in enumerate(lines):
+        # Study periods are not work experience
+        if SCHOOL_RE.search(line) or any(pattern.search(line) for _, pattern in DEGREE_PATTERNS):
+            continue
+        for match in DATE_RANGE_RE.finditer(line):
+            start = int(match['y1']) * 12 + MONTHS.get((match['m1'] or 'jan')[:3].lower(), 1)
+            if match['present']:
+                end = today.year * 12 + today.month
+            else:
+                end = int(match['y2']) * 12 + MONTHS.get((match['m2'] or 'dec')[:3].lower(), 12)
+            if end < start:
+                continue
+            spans.append((start, end))
+            # Title / company come from the text before the dates on that line
+            # (or the line above when the dates stand alone)
+            before = line[:match.start()].strip() or (lines[i - 1] if i else "")
+            parts = _segments(before)
+            if parts:
+                roles.append((end, parts[0], parts[1] if len(parts) > 1 else None))
+
+    months, current_end = 0, None
+    for start, end in sorted(spans):
+        if current_end is None or start > current_end:
+            months += end - start
+            current_end = end
+        elif end > current_end:
+            months += end - current_end
+            current_end = end
+    roles.sort(key=lambda role: role[0], reverse=True)
+    return round(months / 12, 1), [(title, company) for _, title, company in roles]
+
+
+def extract_resume_locally(text: str) -> Tuple[Dict, Dict[str, float]]:
+    """
+    Rule-based resume extraction (regexes + the skills taxonomy), no LLM
+
+    Args:
+        text: Extracted resume text
+
+    Returns:
+        Tuple of (analysis in the analyze_with_ai() shape, confidence per
+        field from 0 to 1); fields it cannot derive are left empty with low
+        confidence
+    """
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    header = lines[:5]
+    confidence = {}
+
+    # Contact details
+    email = EMAIL_RE.search(text)
+    phone = PHONE_RE.search(text)
+    location = next((m for m in map(LOCATION_RE.search, header) if m), None)
+    name = None
+    if lines and 2 <= len(lines[0].split()) <= 4 and not re.search(r'[\d@|]', lines[0]):
+        name = lines[0]
+    personal_info = {
+        "name": name or 'Unknown',
+        "email": email.group(0) if email else None,
+        "phone": phone.group(0) if phone else None,
+        "location": f"{location[1]}, {location[2]}" if location else None
+    }
+    confidence['personal_info'] = round(0.3 + 0.35 * bool(name) + 0.35 * bool(email), 2)
+
+    # Education: highest degree mentioned, with major / school / year from its line
+    education = {"highest_degree": 'Unknown', "major": None, "university": None, "graduation_year": None}
+    for degree, pattern in DEGREE_PATTERNS:
+        line = next((line for line in lines if pattern.search(line)), None)
+        if line is None:
+            continue
+        education["highest_degree"] = degree
+        major = MAJOR_RE.search(line[pattern.search(line).end():])
+        school = next((part for part in re.split(r'\s+[-–|]\s+|[,;]\s*', line) if SCHOOL_RE.search(part)), None)
+        years = YEAR_RE.findall(line)
+        education["major"] = major.group(1).strip() if major else None
+        education["university"] = school.strip() if school else None
+        education["graduation_year"] = years[-1] if years else None
+        break
+    confidence['education'] = 0.3 if education["highest_degree"] == 'Unknown' else (0.9 if education["major"] else 0.7)
+
+    # Experience from date ranges
+    total_years, roles = _experience_years(text)
+    current_title = roles[0][0] if roles else None
+    experience = {
+        "total_years": total_years,
+        "current_title": current_title,
+        "previous_titles": list(dict.fromkeys(title for title, _ in roles[1:] if title != current_title)),
+        "companies": list(dict.fromkeys(company for _, company in roles if company))
+    }
+    # Confident only when the sub-fields could be filled too (a single job
+    # legitimately has no previous titles, but every job has a company)
+    if current_title and experience["companies"]:
+        confidence['experience'] = 0.7
+    else:
+        confidence['experience'] = 0.5 if current_title else 0.3
+
+    # Skills from the taxonomy matcher
+    taxonomy = get_taxonomy()
+    found = get_keyword_matcher().find(text)
+    soft_skills = _find_soft_skills(text)
+    technical_skills = [skill for skill in taxonomy.skills if skill in found and skill not in SOFT_SKILLS]
+    confidence['technical_skills'] = 0.8 if len(technical_skills) >= 3 else (0.5 if technical_skills else 0.2)
+    # Finding none is as likely a miss as a real absence
+    confidence['soft_skills'] = 0.7 if soft_skills else 0.4
+
+    # Roles from the career scorer
+    ranking = [entry for entry in get_career_scorer().rank_found(found, top_n=3) if entry['score'] > 0]
+    recommended_roles = [entry['career'] for entry in ranking[:3]]
+    confidence['recommended_roles'] = 0.7 if ranking and ranking[0]['score'] >= 30 else 0.4
+
+    if total_years < 2:
+        skill_level = 'Entry'
+    elif total_years < 5:
+        skill_level = 'Mid'
+    elif total_years < 10:
+        skill_level = 'Senior'
+    else:
+        skill_level = 'Expert'
+    # Skill level only depends on total_years
+    confidence['skill_level'] = 0.7 if current_title else 0.3
+
+    # Templated summary from what was found
+    background = education["major"] or "technical"
+    summary = f"{skill_level}-level candidate with a {background} background"
+    if total_years:
+        summary += f" and about {total_years:g} years of experience"
+    if technical_skills:
+        summary += f", skilled in {', '.join(technical_skills[:4])}"
+    summary += "."
+    if recommended_roles:
+        summary += f" Best aligned with {recommended_roles[0]} roles."
+    confidence['career_summary'] = 0.6 if confidence['technical_skills'] >= 0.8 and confidence['education'] >= 0.7 else 0.3
+
+    analysis = {
+        "personal_info": personal_info,
+        "education": education,
+        "experience": experience,
+        "technical_skills": technical_skills,
+        "soft_skills": soft_skills,
+        "projects": [],
+        "achievements": [],
+        "career_summary": summary,
+        "recommended_roles": recommended_roles,
+        "skill_level": skill_level,
+        "industries": []
+    }
+    return analysis, confidence
 
 
 class AIResumeParser:
     """AI-powered resume analysis using Gemini Flash"""
 
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, cache: ResponseCache = None, client: LLMClient = None,
+                 token_budget: int = DEFAULT_TOKEN_BUDGET, offline: bool = False):
         """
         Initialize the AI Resume Parser
 
         Args:
             api_key: Google Gemini API key (loaded from environment if not provided)
+            cache: Response cache for analyses (shared on-disk cache if not provided)
+            client: LLMClient to use (shared Gemini client for api_key if not provided)
+            token_budget: Estimated tokens of resume text sent per prompt
+            offline: Only use the local rule-based parser (no client needed)
+
+        Raises:
+            ValueError: If no client is given, not offline, and no API key is available
         """
-        # Load API key from parameter or environment variable
-        if api_key:
-            self.api_key = api_key
-        else:
-            # Try to load from environment
-            self.api_key = os.getenv('GEMINI_API_KEY', '')
-            if not self.api_key:
-                raise ValueError(
-                    "GEMINI_API_KEY not found. Please provide api_key parameter or set GEMINI_API_KEY environment variable."
-                )
-
-        # Configure Gemini
-        genai.configure(api_key=self.api_key)
-        # Using Gemini 3 Flash Preview - Latest balanced model (Dec 2025)
-        # https://ai.google.dev/gemini-api/docs/models#gemini-3-flash
-        self.model = genai.GenerativeModel('gemini-3-flash-preview')
+        # Reuse the process-wide Gemini client instead of configuring per parse
+        if client is None and not offline:
+            client = get_llm_client(api_key)
+        self.client = client
+        self.offline = offline
+        self.cache = cache if cache is not None else get_response_cache()
+
+        self.token_budget = token_budget
+        self.confidence = {}
 
         self.raw_text = ""
+        self.pages = []
         self.ai_analysis = {}
+        self.suggestions = []
 
     def extract_text_from_pdf(self, uploaded_file) -> str:
         """
@@ -53,33 +317,99 @@ class AIResumeParser:
             str: Extracted text from PDF
         """
         try:
-            # Handle different input types
-            if isinstance(uploaded_file, str):
-                # File path
-                with open(uploaded_file, 'rb') as f:
-                    pdf_reader = PyPDF2.PdfReader(f)
-                    text = ""
-                    for page in pdf_reader.pages:
-                        text += page.extract_text() + "\n"
-            else:
-                # Streamlit UploadedFile
-                pdf_reader = PyPDF2.PdfReader(BytesIO(uploaded_file.read()))
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-
-            self.raw_text = text
-            return text
+            # Shared, cached extraction (does not consume the upload stream)
+            extracted = extract_pdf_text(uploaded_file)
+            self.pages = extracted.pages
+            self.raw_text = extracted.raw
+            return extracted.raw
 
         except Exception as e:
             return f"Error parsing PDF: {str(e)}"
 
-    def analyze_with_ai(self, text: str = None) -> Dict:
+    def _compact_text(self, text: str) -> str:
+        """Normalized resume text within the token budget"""
+        # Page boundaries let repeated headers/footers be stripped
+        pages = self.pages if self.pages and text == self.raw_text else [text]
+        return compact_resume(pages, self.token_budget)["text"]
+
+    def _analysis_key(self, text: str, fields: List[str] = None) -> str:
+        version = f"{ANALYSIS_PROMPT_VERSION}-{self.token_budget}"
+        if fields is not None:
+            version += "-" + ",".join(fields)
+        return make_cache_key(text, version, self.client.model_name)
+
+    def _set_analysis(self, analysis: Dict):
+        self.ai_analysis = analysis
+        self.suggestions = analysis.get('improvement_suggestions') or []
+
+    def _analysis_prompt(self, text: str, fields: List[str] = None) -> str:
+        """
+        Build the structured-analysis prompt for a resume
+
+        One call returns both the analysis and the improvement suggestions,
+        so the resume text is only sent once.
+
+        Args:
+            text: Resume text
+            fields: Subset of ANALYSIS_FIELDS to ask for (all if not provided)
+        """
+        fields = list(ANALYSIS_FIELDS) if fields is None else fields
+        schema = "\n".join(f"{field}: {ANALYSIS_FIELDS[field]}" for field in fields)
+        return f"""You are an expert resume analyzer and career counselor. Analyze the resume below.
+Return ONLY a JSON object (no markdown, no explanations) with these keys, using [] or {{}} for missing lists and objects and null for other missing values:
+
+{schema}
+
+RESUME:
+{self._compact_text(text)}"""
+
+    def analyze(self, text: str = None, offline: bool = None) -> Dict:
+        """
+        Local rule-based parse, escalating only low-confidence fields to the LLM
+
+        Fields the local parser is confident about (LOCAL_CONFIDENCE_THRESHOLD)
+        are used as-is; the rest, plus the fields it cannot produce (projects,
+        achievements, industries, suggestions), are requested from Gemini in
+        one call. If that call fails, the local values are kept.
+
+        Args:
+            text: Resume text (uses self.raw_text if not provided)
+            offline: Never call the LLM (defaults to the parser's offline setting)
+
+        Returns:
+            Dictionary in the analyze_with_ai() shape; per-field confidence is
+            stored in self.confidence (1.0 for LLM-provided fields)
+        """
+        if text is None:
+            text = self.raw_text
+        offline = self.offline if offline is None else offline
+
+        if not text or len(text.strip()) < 50:
+            return {"error": "Resume text too short or empty"}
+
+        analysis, confidence = extract_resume_locally(text)
+        escalate = [field for field in REQUIRED_FIELDS if confidence[field] < LOCAL_CONFIDENCE_THRESHOLD]
+
+        if not offline and escalate:
+            escalate += [field for field in ANALYSIS_FIELDS if field not in REQUIRED_FIELDS]
+            remote = self.analyze_with_ai(text, fields=escalate)
+            if "error" not in remote:
+                for field in escalate:
+                    if field in remote:
+                        analysis[field] = remote[field]
+                        confidence[field] = 1.0
+
+        self.confidence = confidence
+        self._set_analysis(analysis)
+        return analysis
+
+    def analyze_with_ai(self, text: str = None, fields: List[str] = None) -> Dict:
         """
         Use Gemini 3 Flash AI to analyze resume and extract structured information
 
         Args:
             text: Resume text (uses self.raw_text if not provided)
+            fields: Subset of ANALYSIS_FIELDS to request (all if not provided)
 
         Returns:
             Dictionary with AI-extracted information
@@ -90,107 +420,185 @@ class AIResumeParser:
         if not text or len(text.strip()) < 50:
             return {"error": "Resume text too short or empty"}
 
+        # Same document + prompt + model -> reuse the earlier analysis
+        cache_key = self._analysis_key(text, fields)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            self._set_analysis(cached)
+            return cached
+
         # Craft the AI prompt
-        prompt = f"""You are an expert resume analyzer and career counselor. Analyze the following resume and extract key information in JSON format.
-
-RESUME TEXT:
-{text}
-
-INSTRUCTIONS:
-Extract the following information and return ONLY a valid JSON object (no markdown, no explanations):
-
-{{
-    "personal_info": {{
-        "name": "candidate's full name or 'Unknown'",
-        "email": "email address or null",
-        "phone": "phone number or null",
-        "location": "city, state or null"
-    }},
-    "education": {{
-        "highest_degree": "PhD, Master's, Bachelor's, Associate's, High School, or Unknown",
-        "major": "field of study or null",
-        "university": "school name or null",
-        "graduation_year": "year or null"
-    }},
-    "experience": {{
-        "total_years": estimated total years of professional experience (number),
-        "current_title": "most recent job title or null",
-        "previous_titles": ["list of previous job titles"],
-        "companies": ["list of companies worked at"]
-    }},
-    "technical_skills": [
-        "list of all technical/hard skills mentioned (programming languages, tools, technologies, certifications)"
-    ],
-    "soft_skills": [
-        "list of soft skills mentioned (leadership, communication, teamwork, etc.)"
-    ],
-    "projects": [
-        "notable projects mentioned (brief description)"
-    ],
-    "achievements": [
-        "key achievements, awards, or metrics mentioned"
-    ],
-    "career_summary": "2-3 sentence summary of this person's career trajectory and strengths",
-    "recommended_roles": [
-        "3-5 job titles this person would be qualified for"
-    ],
-    "skill_level": "Entry, Mid, Senior, or Expert based on experience and skills",
-    "industries": [
-        "industries they have experience in or would fit well in"
-    ]
-}}
-
-Be thorough but accurate. If information is not present, use null or empty arrays. For years of experience, analyze date ranges mentioned."""
+        prompt = self._analysis_prompt(text, fields)
+
+        requested = list(ANALYSIS_FIELDS) if fields is None else fields
 
         try:
             # Call Gemini 3 Flash API
-            response = self.model.generate_content(prompt)
+            start = time.perf_counter()
+            raw_response = self.client.generate(prompt)
+
+            # Tolerant parse: finds the object inside fences/prose and repairs
+            # trailing commas, unquoted keys and truncation
+            analysis, _ = parse_json_lenient(raw_response, dict)
+            if not isinstance(analysis, dict):
+                analysis = {}
+            missing = validate_fields(analysis, ANALYSIS_SCHEMA, requested)
+
+            # Ask again for just the fields that are missing or malformed
+            for _ in range(MAX_FIELD_RETRIES):
+                if not missing:
+                    break
+                retry, _ = parse_json_lenient(self.client.generate(self._analysis_prompt(text, missing)), dict)
+                if isinstance(retry, dict):
+                    for field in missing:
+                        if not validate_fields(retry, ANALYSIS_SCHEMA, [field]):
+                            analysis[field] = retry[field]
+                missing = validate_fields(analysis, ANALYSIS_SCHEMA, requested)
+            latency = time.perf_counter() - start
 
-            # Parse the JSON response
-            response_text = response.text.strip()
-
-            # Remove markdown code blocks if present
-            if response_text.startswith('```json'):
-                response_text = response_text.replace(
-                    '```json', '').replace('```', '').strip()
-            elif response_text.startswith('```'):
-                response_text = response_text.replace('```', '').strip()
-
-            # Parse JSON
-            analysis = json.loads(response_text)
-            self.ai_analysis = analysis
+        except Exception as e:
+            return {"error": f"AI analysis failed: {str(e)}"}
 
-            return analysis
+        # Drop fields that are still malformed
+        for field in missing:
+            analysis.pop(field, None)
 
-        except json.JSONDecodeError as e:
-            # If JSON parsing fails, return raw response for debugging
+        if not analysis:
+            # Return the raw response for debugging
             return {
                 "error": "Failed to parse AI response as JSON",
-                "raw_response": response.text,
-                "parse_error": str(e)
+                "raw_response": raw_response
             }
-        except Exception as e:
-            return {"error": f"AI analysis failed: {str(e)}"}
+
+        self._set_analysis(analysis)
+        if not missing:
+            self.cache.put(cache_key, analysis, latency)
+        return analysis
+
+    def stream_analysis(self, text: str = None, cancel: threading.Event = None) -> Iterator[Tuple[str, object]]:
+        """
+        Streaming version of analyze
+
+        Confident locally-parsed fields are yielded immediately; the rest are
+        streamed from the model, each top-level field as soon as its JSON
+        value is complete. The complete analysis is stored in self.ai_analysis
+        once the stream ends. If the model call fails, the local values of the
+        remaining fields are yielded instead.
+
+        Args:
+            text: Resume text (uses self.raw_text if not provided)
+            cancel: Event checked between chunks; once set, the model stream
+                    is closed and no follow-up request is made
+
+        Yields:
+            (field, value) tuples, or ("error", message) if the text is unusable
+        """
+        if text is None:
+            text = self.raw_text
+
+        if not text or len(text.strip()) < 50:
+            yield "error", "Resume text too short or empty"
+            return
+
+        analysis, confidence = extract_resume_locally(text)
+        escalate = [field for field in REQUIRED_FIELDS if confidence[field] < LOCAL_CONFIDENCE_THRESHOLD]
+
+        if self.offline or not escalate:
+            yield from analysis.items()
+            self.confidence = confidence
+            self._set_analysis(analysis)
+            return
+
+        escalate += [field for field in ANALYSIS_FIELDS if field not in REQUIRED_FIELDS]
+        for field, value in analysis.items():
+            if field not in escalate:
+                yield field, value
+        remote = {}
+        cache_key = self._analysis_key(text, escalate)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            remote = cached
+            yield from ((field, cached[field]) for field in escalate if field in cached)
+        else:
+            parser = IncrementalJSONParser()
+            failed = False
+            stream = None
+            try:
+                start = time.perf_counter()
+                stream = self.client.generate_stream(self._analysis_prompt(text, escalate))
+                for chunk in stream:
+                    if cancel is not None and cancel.is_set():
+                        failed = True
+                        break
+                    for field, value in parser.feed(chunk):
+                        # Malformed values (e.g. null lists) are re-requested below
+                        if field in ANALYSIS_SCHEMA and not validate_fields({field: value}, ANALYSIS_SCHEMA, [field]):
+                            yield field, value
+            except Exception as e:
+                print(f"RESUME ANALYSIS ERROR: {e}")
+                failed = True
+            finally:
+                close = getattr(stream, 'close', None)
+                if close is not None:
+                    close()
+            remote = dict(parser.result)
+
+            if not parser.done:
+                # Recover what the field-by-field parser could not (truncation, unquoted keys)
+                recovered, _ = parse_json_lenient(parser.text, dict)
+                if isinstance(recovered, dict):
+                    for field, value in recovered.items():
+                        usable = field in ANALYSIS_SCHEMA and not validate_fields(recovered, ANALYSIS_SCHEMA, [field])
+                        if usable and field not in remote:
+                            remote[field] = value
+                            yield field, value
+
+            missing = validate_fields(remote, ANALYSIS_SCHEMA, escalate)
+            if missing and not failed:
+                # Re-request only what is still missing
+                retry = self.analyze_with_ai(text, fields=missing)
+                if "error" not in retry:
+                    for field in missing:
+                        if field in retry:
+                            remote[field] = retry[field]
+                            yield field, retry[field]
+                missing = validate_fields(remote, ANALYSIS_SCHEMA, escalate)
+
+            for field in missing:
+                remote.pop(field, None)
+            if not missing:
+                self.cache.put(cache_key, remote, time.perf_counter() - start)
+
+        for field in escalate:
+            if field in remote:
+                analysis[field] = remote[field]
+                confidence[field] = 1.0
+            elif field in analysis:
+                # Model failed before this field: fall back to the local value
+                yield field, analysis[field]
+
+        self.confidence = confidence
+        self._set_analysis(analysis)
 
     def get_skills_for_matching(self) -> Set[str]:
         """
         Extract all skills in a format suitable for job matching
 
+        Skills are mapped to their canonical taxonomy name where one exists
+        (e.g. "k8s" -> "kubernetes"), so they line up with the keyword matcher.
+
         Returns:
             Set of all skills (technical + soft) in lowercase
         """
         if not self.ai_analysis:
             return set()
 
+        taxonomy = get_taxonomy()
         skills = set()
 
-        # Add technical skills
-        tech_skills = self.ai_analysis.get('technical_skills', [])
-        skills.update([skill.lower() for skill in tech_skills])
-
-        # Add soft skills
-        soft_skills = self.ai_analysis.get('soft_skills', [])
-        skills.update([skill.lower() for skill in soft_skills])
+        # Technical + soft skills, canonicalized where the taxonomy knows them
+        for skill in self.ai_analysis.get('technical_skills', []) + self.ai_analysis.get('soft_skills', []):
+            skills.add((taxonomy.canonical(skill) or skill).lower())
 
         return skills
 
@@ -210,9 +618,22 @@ Be thorough but accurate. If information is not present, use null or empty array
         if text.startswith("Error"):
             return {"error": text}
 
-        # Analyze with AI
-        analysis = self.analyze_with_ai(text)
+        # Local parse, with Gemini only for the low-confidence fields
+        analysis = self.analyze(text)
+
+        return self.build_summary(text, analysis)
+
+    def build_summary(self, text: str, analysis: Dict) -> Dict:
+        """
+        Format an AI analysis into the get_resume_summary() output shape
+
+        Args:
+            text: Extracted resume text
+            analysis: Result of analyze_with_ai()
 
+        Returns:
+            Dictionary with comprehensive resume analysis (or the error dict)
+        """
         if "error" in analysis:
             return analysis
 
@@ -229,7 +650,8 @@ Be thorough but accurate. If information is not present, use null or empty array
             "skill_level": analysis.get('skill_level', 'Unknown'),
             "name": analysis.get('personal_info', {}).get('name', 'Unknown'),
             "current_title": analysis.get('experience', {}).get('current_title', 'Unknown'),
-            "raw_text_preview": text[:300] + "..." if len(text) > 300 else text
+            "raw_text_preview": text[:300] + "..." if len(text) > 300 else text,
+            "confidence": self.confidence
         }
 
     def get_improvement_suggestions(self) -> List[str]:
@@ -239,13 +661,17 @@ Be thorough but accurate. If information is not present, use null or empty array
         Returns:
             List of suggestions to improve the resume
         """
-        if not self.raw_text:
+        # Already returned by the combined analysis call
+        if self.suggestions:
+            return self.suggestions
+
+        if not self.raw_text or self.client is None:
             return []
 
         prompt = f"""You are a professional resume coach. Review this resume and provide 3-5 specific, actionable suggestions to improve it.
 
 RESUME:
-{self.raw_text}
+{self._compact_text(self.raw_text)}
 
 Provide suggestions in JSON array format:
 ["suggestion 1", "suggestion 2", "suggestion 3"]
@@ -258,31 +684,27 @@ Focus on:
 - Formatting improvements"""
 
         try:
-            response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
-
-            # Clean up markdown
-            if '```' in response_text:
-                response_text = response_text.replace(
-                    '```json', '').replace('```', '').strip()
-
-            suggestions = json.loads(response_text)
-            return suggestions
-
-        except:
-            return ["Unable to generate suggestions at this time"]
+            suggestions, _ = parse_json_lenient(self.client.generate(prompt), list)
+            if isinstance(suggestions, list):
+                return suggestions
+        except Exception as e:
+            print(f"SUGGESTIONS ERROR: {e}")
+        return ["Unable to generate suggestions at this time"]
 
 
-def parse_resume_with_ai(uploaded_file, api_key: str = None) -> Dict:
+def parse_resume_with_ai(uploaded_file, api_key: str = None, client: LLMClient = None,
+                         offline: bool = False) -> Dict:
     """
     Convenience function for AI-powered resume parsing
 
     Args:
         uploaded_file: Streamlit UploadedFile object or file path
-        api_key: Google Gemini API key (uses hardcoded key if not provided)
+        api_key: Google Gemini API key (loaded from environment if not provided)
+        client: LLMClient to use (shared Gemini client if not provided)
+        offline: Use only the local rule-based parser
 
     Returns:
         Dictionary with parsed resume data
     """
-    parser = AIResumeParser(api_key=api_key)
+    parser = AIResumeParser(api_key=api_key, client=client, offline=offline)
     return parser.get_resume_summary(uploaded_file)
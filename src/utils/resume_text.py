@@ -0,0 +1,198 @@
+"""
+Resume text preprocessing for LLM prompts
+
+Extracted PDF text is noisy: headers and footers repeat on every page,
+whitespace is ragged and boilerplate ("References available upon request")
+adds tokens without information. compact_resume() cleans the text and
+fits it into a token budget, dropping the least useful sections first.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+# Resume text budget per prompt (the instructions and schema come on top)
+DEFAULT_TOKEN_BUDGET = 1500
+
+# Rough English average for Gemini-style tokenizers
+CHARS_PER_TOKEN = 4
+
+# Header/footer candidates: this many lines at the top and bottom of each page
+EDGE_LINES = 3
+
+# Page numbers ("Page 2 of 3", "Jane Doe - Page 2", "2 / 3"); only dropped in
+# the first/last EDGE_LINES lines of a page, so "2023" or "Landing page 2"
+# in the body survive
+PAGE_NUMBER_PATTERNS = [
+    re.compile(r'^(.{0,60}[-|•·,:]\s*)?page \d+( of \d+)?$', re.IGNORECASE),
+    re.compile(r'^\d{1,3}( ?/ ?\d{1,3})?$')
+]
+
+BOILERPLATE_PATTERNS = [
+    re.compile(r'^references (are )?available (upon|on) request\.?$', re.IGNORECASE),
+    re.compile(r'^curriculum vitae$|^resume$|^résumé$', re.IGNORECASE),
+    re.compile(r'^confidential\.?$', re.IGNORECASE)
+]
+
+# Section headings, mapped to a section name
+SECTION_HEADINGS = {
+    'summary': 'summary', 'professional summary': 'summary', 'profile': 'summary', 'objective': 'summary',
+    'education': 'education',
+    'experience': 'experience', 'work experience': 'experience', 'professional experience': 'experience',
+    'employment': 'experience', 'employment history': 'experience', 'internships': 'experience',
+    'skills': 'skills', 'technical skills': 'skills', 'core competencies': 'skills',
+    'projects': 'projects', 'personal projects': 'projects', 'academic projects': 'projects',
+    'certifications': 'certifications', 'licenses & certifications': 'certifications',
+    'awards': 'awards', 'honors': 'awards', 'honors & awards': 'awards', 'achievements': 'awards',
+    'leadership': 'activities', 'activities': 'activities', 'volunteer': 'activities',
+    'volunteering': 'activities', 'extracurricular activities': 'activities',
+    'publications': 'publications',
+    'interests': 'interests', 'hobbies': 'interests',
+    'references': 'references'
+}
+
+# Lower number = kept first when the text is over budget
+SECTION_PRIORITY = {
+    'header': 0, 'skills': 1, 'experience': 2, 'education': 3, 'projects': 4,
+    'certifications': 5, 'summary': 6, 'awards': 7, 'activities': 8,
+    'publications': 9, 'interests': 10, 'references': 11
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of text"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _clean_line(line: str) -> str:
+    return " ".join(line.split())
+
+
+def strip_repeated_lines(pages: List[str]) -> List[List[str]]:
+    """
+    Remove headers/footers repeated across pages and collapse whitespace
+
+    A line counts as a header/footer when it sits in the first or last
+    EDGE_LINES lines of at least two pages; it is kept on the first page it
+    appears on (where it is usually the candidate's name and contact line).
+
+    Args:
+        pages: Raw text per page
+
+    Returns:
+        Cleaned, non-empty lines per page
+    """
+    page_lines = [[_clean_line(line) for line in page.splitlines()] for page in pages]
+    page_lines = [[line for line in lines if line] for lines in page_lines]
+
+    edge_counts = Counter()
+    for lines in page_lines:
+        edge_counts.update(set(lines[:EDGE_LINES] + lines[-EDGE_LINES:]))
+    repeated = {line for line, count in edge_counts.items() if count >= 2}
+
+    seen_repeated = set()
+    cleaned = []
+    for lines in page_lines:
+        kept = []
+        for line in lines:
+            if line in repeated:
+                if line in seen_repeated:
+                    continue
+                seen_repeated.add(line)
+            kept.append(line)
+        cleaned.append(kept)
+    return cleaned
+
+
+def normalize_resume(pages: List[str]) -> List[str]:
+    """
+    Clean extracted resume text
+
+    Strips repeated headers/footers, page numbers and boilerplate and
+    collapses whitespace. Other repeated lines are kept (two jobs can share a
+    bullet).
+
+    Args:
+        pages: Raw text per page (a single-element list for unpaged text)
+
+    Returns:
+        Cleaned lines in document order
+    """
+    lines = []
+    for page in strip_repeated_lines(pages):
+        for i, line in enumerate(page):
+            if any(pattern.match(line) for pattern in BOILERPLATE_PATTERNS):
+                continue
+            at_edge = i < EDGE_LINES or i >= len(page) - EDGE_LINES
+            if at_edge and any(pattern.match(line) for pattern in PAGE_NUMBER_PATTERNS):
+                continue
+            lines.append(line)
+    return lines
+
+
+def split_sections(lines: List[str]) -> List[Tuple[str, List[str]]]:
+    """
+    Group lines under the resume section headings
+
+    Returns:
+        List of (section name, lines) in document order; lines before the
+        first heading form the 'header' section
+    """
+    sections = [('header', [])]
+    for line in lines:
+        name = SECTION_HEADINGS.get(line.lower().rstrip(':').strip())
+        if name is not None:
+            sections.append((name, [line]))
+        else:
+            sections[-1][1].append(line)
+    return [(name, section) for name, section in sections if section]
+
+
+def compact_resume(pages: List[str], token_budget: int = DEFAULT_TOKEN_BUDGET) -> Dict:
+    """
+    Normalize resume text and fit it into a token budget
+
+    Sections are admitted in SECTION_PRIORITY order; the first one that does
+    not fit is cut at a line boundary and everything less important is
+    dropped. The kept sections stay in document order.
+
+    Args:
+        pages: Raw text per page (a single-element list for unpaged text)
+        token_budget: Maximum estimated tokens of resume text
+
+    Returns:
+        Dictionary with 'text', 'tokens', 'original_tokens' and
+        'dropped_sections' (names of sections cut or dropped)
+    """
+    original_tokens = estimate_tokens("\n".join(pages))
+    sections = split_sections(normalize_resume(pages))
+
+    order = sorted(range(len(sections)), key=lambda i: SECTION_PRIORITY.get(sections[i][0], len(SECTION_PRIORITY)))
+    kept, dropped, remaining = {}, [], token_budget
+    for i in order:
+        name, lines = sections[i]
+        cost = estimate_tokens("\n".join(lines)) + 1
+        if cost <= remaining:
+            kept[i] = lines
+            remaining -= cost
+            continue
+
+        partial = []
+        for line in lines:
+            line_cost = estimate_tokens(line) + 1
+            if line_cost > remaining:
+                break
+            partial.append(line)
+            remaining -= line_cost
+        if partial:
+            kept[i] = partial
+        dropped.append(name)
+        remaining = 0
+
+    text = "\n".join(line for i in sorted(kept) for line in kept[i])
+    return {
+        "text": text,
+        "tokens": estimate_tokens(text),
+        "original_tokens": original_tokens,
+        "dropped_sections": dropped
+    }
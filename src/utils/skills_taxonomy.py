@@ -0,0 +1,204 @@
+"""
+Skills taxonomy
+
+Roles, skills, aliases and weights live in data/skills_taxonomy.json and are
+compiled once per process into lookup indexes:
+
+- alias -> canonical skill
+- skill -> roles that list it
+- role -> weighted skill vector (rows of a sparse role x skill matrix)
+
+Usage (load time / memory benchmark on a synthetic taxonomy):
+    python -m src.utils.skills_taxonomy --benchmark 50000
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+import numpy as np
+from scipy import sparse
+
+TAXONOMY_PATH = 'data/skills_taxonomy.json'
+
+
+def normalize_skill(text: str) -> str:
+    """Lower-case and collapse whitespace (the form skills and aliases are matched in)"""
+    return " ".join(text.lower().split())
+
+
+class SkillsTaxonomy:
+    """Indexed view of a skills taxonomy file"""
+
+    def __init__(self, data: Dict):
+        """
+        Args:
+            data: Parsed taxonomy with 'version', 'skills' (name -> {'aliases'}),
+                  'roles' (role -> {skill: weight}) and 'default_role_skills'
+
+        Raises:
+            ValueError: If a role lists a skill missing from 'skills'
+        """
+        self.version = data.get('version', 1)
+        self.skills: List[str] = list(data['skills'])
+        self.skill_index = {skill: i for i, skill in enumerate(self.skills)}
+        self.aliases: Dict[str, List[str]] = {
+            skill: entry.get('aliases', []) for skill, entry in data['skills'].items()
+        }
+        self.roles: Dict[str, Dict[str, float]] = data['roles']
+        self.role_names: List[str] = list(self.roles)
+        self.default_role_skills: List[str] = data.get('default_role_skills', [])
+
+        # alias -> canonical skill (canonical names map to themselves)
+        self.alias_index: Dict[str, str] = {}
+        for skill, aliases in self.aliases.items():
+            for form in [skill, *aliases]:
+                self.alias_index.setdefault(normalize_skill(form), skill)
+
+        # skill -> roles, and the role x skill weight matrix (plus each row's
+        # skill columns in file order, for listing found/missing skills)
+        self.skill_roles: Dict[str, List[str]] = {}
+        self.role_columns: List[np.ndarray] = []
+        rows, cols, weights = [], [], []
+        for i, (role, skills) in enumerate(self.roles.items()):
+            start = len(cols)
+            for skill, weight in skills.items():
+                if skill not in self.skill_index:
+                    raise ValueError(f"Unknown skill '{skill}' in role '{role}'")
+                self.skill_roles.setdefault(skill, []).append(role)
+                rows.append(i)
+                cols.append(self.skill_index[skill])
+                weights.append(weight)
+            self.role_columns.append(np.asarray(cols[start:], dtype=np.int64))
+        self.role_matrix = sparse.csr_matrix(
+            (np.asarray(weights, dtype=np.float32), (rows, cols)),
+            shape=(len(self.role_names), len(self.skills))
+        )
+
+    def canonical(self, name: str) -> Optional[str]:
+        """Canonical skill for a name or alias (None if unknown)"""
+        return self.alias_index.get(normalize_skill(name))
+
+    def role_skills(self, role: str) -> List[str]:
+        """Skills of a role in file order (default_role_skills if the role is unknown)"""
+        if role in self.roles:
+            return list(self.roles[role])
+        return list(self.default_role_skills)
+
+
+def load_taxonomy(path: str = TAXONOMY_PATH) -> SkillsTaxonomy:
+    """
+    Load and index a taxonomy file
+
+    Args:
+        path: JSON taxonomy file
+
+    Returns:
+        SkillsTaxonomy
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return SkillsTaxonomy(json.load(f))
+
+
+_taxonomies = {}
+
+
+def get_taxonomy(path: str = TAXONOMY_PATH) -> SkillsTaxonomy:
+    """Process-wide taxonomy, loaded and indexed on first use"""
+    if path not in _taxonomies:
+        _taxonomies[path] = load_taxonomy(path)
+    return _taxonomies[path]
+
+
+def _synthetic_taxonomy(n_skills: int, n_roles: int, skills_per_role: int, seed: int = 0) -> Dict:
+    rng = random.Random(seed)
+    skills = {
+        f"skill {i:06d}": {"aliases": [f"sk{i}"] if i % 3 == 0 else []}
+        for i in range(n_skills)
+    }
+    names = list(skills)
+    roles = {
+        f"Role {r}": {skill: round(rng.uniform(0.5, 2.0), 2) for skill in rng.sample(names, skills_per_role)}
+        for r in range(n_roles)
+    }
+    return {"version": 1, "skills": skills, "roles": roles, "default_role_skills": names[:5]}
+
+
+def benchmark(n_skills: int = 50_000, n_roles: int = 500, skills_per_role: int = 40) -> Dict:
+    """
+    Time and measure loading a synthetic taxonomy and compiling the matchers
+
+    Args:
+        n_skills: Skills in the synthetic taxonomy (a third get an alias)
+        n_roles: Roles
+        skills_per_role: Skills per role
+
+    Returns:
+        Dictionary with file size, load/index and matcher compile seconds,
+        peak traced memory (MB) and the time to rank one 5,000-word resume
+    """
+    from src.utils.keyword_matcher import CareerScorer, KeywordMatcher
+
+    data = _synthetic_taxonomy(n_skills, n_roles, skills_per_role)
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+        json.dump(data, f)
+        path = f.name
+
+    try:
+        start = time.perf_counter()
+        taxonomy = load_taxonomy(path)
+        load_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scorer = CareerScorer(taxonomy, KeywordMatcher(taxonomy.aliases))
+        compile_seconds = time.perf_counter() - start
+
+        # Second, traced pass for memory (tracing slows the timings above)
+        tracemalloc.start()
+        traced = load_taxonomy(path)
+        CareerScorer(traced, KeywordMatcher(traced.aliases))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del traced
+
+        resume = " ".join(random.Random(1).choice(taxonomy.skills + ["experience", "team"]) for _ in range(5000))
+        start = time.perf_counter()
+        scorer.rank(resume)
+        rank_seconds = time.perf_counter() - start
+
+        return {
+            "skills": n_skills,
+            "roles": n_roles,
+            "file_mb": os.path.getsize(path) / 1e6,
+            "load_seconds": load_seconds,
+            "compile_seconds": compile_seconds,
+            "peak_memory_mb": peak / 1e6,
+            "rank_seconds": rank_seconds
+        }
+    finally:
+        os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Skills taxonomy tools")
+    parser.add_argument('--benchmark', type=int, metavar='N_SKILLS', default=None,
+                        help="Benchmark loading a synthetic taxonomy with N_SKILLS skills")
+    parser.add_argument('--roles', type=int, default=500)
+    args = parser.parse_args()
+
+    if args.benchmark:
+        report = benchmark(args.benchmark, args.roles)
+        for key, value in report.items():
+            print(f"{key}: {value:.3f}" if isinstance(value, float) else f"{key}: {value}")
+    else:
+        taxonomy = get_taxonomy()
+        print(f"{TAXONOMY_PATH}: {len(taxonomy.skills)} skills, {len(taxonomy.role_names)} roles")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import threading
+import time
+
+from src.utils.agent_runner import TIMEOUT_MESSAGES, run_agents_sync
+from src.utils.llm_client import LLMClient, StubBackend
+
+
+class CountingBackend(StubBackend):
+    """StubBackend that records how many stream chunks were produced"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.chunks = 0
+        self.closed = 0
+
+    def generate_stream(self, prompt, chunk_size=16):
+        try:
+            for chunk in super().generate_stream(prompt, chunk_size):
+                self.chunks += 1
+                yield chunk
+        finally:
+            self.closed += 1
+
+
+def agent_threads():
+    return [t for t in threading.enumerate() if t.name.startswith('agent')]
+
+
+def test_timed_out_streams_are_closed():
+    # 40 chunks at 50ms each: far longer than the timeout
+    backend = CountingBackend('x' * 640, delay=2.0)
+    events = []
+    result = run_agents_sync(city='Austin', client=LLMClient(backend), timeout=0.3,
+                             on_event=lambda name, payload: events.append(name))
+
+    assert result['reality_check'] == TIMEOUT_MESSAGES['reality_check']
+    assert result['career_advice'] == TIMEOUT_MESSAGES['career_advice']
+    assert sorted(result['timed_out']) == ['career_advice', 'reality_check']
+
+    deadline = time.monotonic() + 2
+    while agent_threads() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not agent_threads()
+    assert backend.closed == 2
+    assert backend.chunks < 20
+
+
+def test_fast_streams_complete():
+    backend = CountingBackend('Austin is affordable.')
+    result = run_agents_sync(city='Austin', client=LLMClient(backend), timeout=5,
+                             on_event=lambda name, payload: None)
+    assert result['reality_check'] == 'Austin is affordable.'
+    assert result['timed_out'] == []
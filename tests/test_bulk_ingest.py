@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from src.utils import bulk_ingest
+from src.utils.llm_client import LLMClient, StubBackend
+from src.utils.resume_parser import AIResumeParser
+
+RESUME = ("Jane Doe jane@example.com Austin, TX. Senior Data Scientist, Acme Corp 2021 - Present. "
+          "Skills: Python, SQL, Machine Learning.")
+
+
+def make_pdf(pages):
+    """Minimal single-font PDF with one line of text per page"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 10 Tf 20 700 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out, offsets = b"%PDF-1.4\n", []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode()
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return out
+
+
+@pytest.fixture
+def resume_folder(tmp_path):
+    (tmp_path / 'good.pdf').write_bytes(make_pdf([RESUME]))
+    (tmp_path / 'long.pdf').write_bytes(make_pdf([RESUME, 'Page two', 'Page three']))
+    (tmp_path / 'corrupt.pdf').write_bytes(b'%PDF-1.4 this is not really a pdf')
+    (tmp_path / 'broken.pdf').write_bytes(make_pdf([RESUME + ' BROKEN']))
+    (tmp_path / 'notes.txt').write_text('ignored')
+    return tmp_path
+
+
+def test_ingest_reports_every_file(resume_folder, monkeypatch):
+    build_summary = AIResumeParser.build_summary
+
+    def flaky_build_summary(self, text, analysis):
+        if 'BROKEN' in text:
+            raise RuntimeError('model returned garbage')
+        return build_summary(self, text, analysis)
+
+    monkeypatch.setattr(AIResumeParser, 'build_summary', flaky_build_summary)
+    backend = StubBackend(json.dumps({'soft_skills': ['Teamwork'], 'projects': []}))
+    report = {}
+    results = {r['file']: r for r in bulk_ingest.ingest_resumes(
+        str(resume_folder), client=LLMClient(backend), n_jobs=2, max_pages=2, report=report)}
+
+    assert sorted(results) == ['broken.pdf', 'corrupt.pdf', 'good.pdf', 'long.pdf']
+    assert report['files'] == 4 and report['failed'] == 2
+
+    assert results['good.pdf']['pages'] == 1 and not results['good.pdf']['truncated']
+    assert 'python' in [s.lower() for s in results['good.pdf']['summary']['tech_skills']]
+    assert results['long.pdf']['pages'] == 2 and results['long.pdf']['truncated']
+    assert 'error' not in results['long.pdf']['summary']
+    assert results['corrupt.pdf']['error'].startswith('Error parsing PDF')
+    assert results['broken.pdf']['error'] is None
+    assert 'model returned garbage' in results['broken.pdf']['summary']['error']
+
+
+def test_extract_only(resume_folder):
+    results = list(bulk_ingest.ingest_resumes(str(resume_folder), analyze=False, n_jobs=1))
+    assert len(results) == 4
+    assert all(r['summary'] is None for r in results if not r['error'])
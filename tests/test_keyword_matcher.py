@@ -0,0 +1,61 @@
+import pytest
+
+from src.utils.keyword_matcher import KeywordMatcher, career_match, get_career_scorer, get_keyword_matcher
+
+
+@pytest.fixture(scope='module')
+def matcher():
+    return get_keyword_matcher()
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("Built APIs in Node.js and Express", {'API', 'Node.js'}),
+    ("Python3 and REST APIs", {'Python', 'API'}),
+    ("Scripting in Python3.11", {'Python'}),
+    ("Wrote JS and Java daily", {'JavaScript', 'Java'}),
+    ("Shipped a JavaScript app", {'JavaScript'}),
+    ("Rapid prototyping", {'Prototyping'}),
+    ("I know Python.", {'Python'}),
+    ("Deployed with k8s on Amazon Web Services", {'Kubernetes', 'AWS'}),
+])
+def test_find_respects_word_boundaries(matcher, text, expected):
+    assert matcher.find(text) == expected
+
+
+def test_dotted_names_do_not_leak_aliases(matcher):
+    assert 'JavaScript' not in matcher.find("Vue.js and Node.js")
+    assert 'Java' not in matcher.find("import java.util.List")
+
+
+def test_single_letter_keywords_take_no_suffix():
+    matcher = KeywordMatcher({'R': []})
+    assert matcher.find("Reported R2 and Rs") == set()
+    assert matcher.find("Statistics in R") == {'R'}
+
+
+def test_career_match_weights():
+    result = career_match({'Python', 'SQL'}, {'Python': 2.0, 'SQL': 1.0, 'Spark': 1.0})
+    assert result['found'] == ['Python', 'SQL']
+    assert result['missing'] == ['Spark']
+    assert result['score'] == pytest.approx(75.0)
+
+
+def test_career_scorer_matches_career_match():
+    scorer = get_career_scorer()
+    found = {'Python', 'SQL', 'Git', 'Figma', 'Machine Learning'}
+    ranking = scorer.rank_found(found)
+
+    assert [entry['score'] for entry in ranking] == sorted((entry['score'] for entry in ranking), reverse=True)
+    for entry in ranking:
+        expected = career_match(found, scorer.taxonomy.roles[entry['career']])
+        assert entry['found'] == expected['found']
+        assert entry['missing'] == expected['missing']
+        assert entry['score'] == pytest.approx(expected['score'])
+        assert scorer.match(found, entry['career']) == {**expected, 'score': pytest.approx(expected['score'])}
+
+
+def test_rank_found_lists_keywords_for_top_n_only():
+    ranking = get_career_scorer().rank_found({'Python', 'SQL'}, top_n=2)
+    assert all('found' in entry for entry in ranking[:2])
+    assert not any('found' in entry for entry in ranking[2:])
+    assert get_career_scorer().match({'Python'}, 'Not A Career') is None
@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils import llm_cache
+from src.utils.llm_cache import ResponseCache, make_cache_key
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(llm_cache, 'time', SimpleNamespace(time=fake))
+    return fake
+
+
+def test_cache_key_depends_on_text_prompt_and_model():
+    key = make_cache_key("Jane Doe\nPython", "v1-4000", "gemini-flash")
+    assert key == make_cache_key("  Jane   Doe Python ", "v1-4000", "gemini-flash")
+    assert len({
+        key,
+        make_cache_key("Jane Doe Java", "v1-4000", "gemini-flash"),
+        make_cache_key("Jane Doe Python", "v2-4000", "gemini-flash"),
+        make_cache_key("Jane Doe Python", "v1-2000", "gemini-flash"),
+        make_cache_key("Jane Doe Python", "v1-4000", "gemini-pro"),
+    }) == 5
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'), ttl_seconds=60)
+    cache.put('k', {'a': 1})
+    clock.now += 60
+    assert cache.get('k') == {'a': 1}
+    clock.now += 1
+    assert cache.get('k') is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'), max_entries=2)
+    cache.put('a', 1)
+    clock.now += 1
+    cache.put('b', 2)
+    clock.now += 1
+    assert cache.get('a') == 1  # 'a' is now more recent than 'b'
+    clock.now += 1
+    cache.put('c', 3)
+
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    assert cache.stats()['entries'] == 2
+
+
+def test_counters_and_persistence(tmp_path, clock):
+    path = str(tmp_path / 'cache.sqlite')
+    cache = ResponseCache(path)
+    assert cache.get('k') is None
+    cache.put('k', ['x'], latency=2.5)
+    assert cache.get('k') == ['x']
+    assert cache.get('k') == ['x']
+    assert cache.stats() == {'hits': 2, 'misses': 1, 'hit_rate': pytest.approx(2 / 3),
+                             'saved_seconds': 5.0, 'entries': 1}
+
+    reopened = ResponseCache(path)
+    assert reopened.get('k') == ['x']
+    assert reopened.stats()['hits'] == 1
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from src.utils.llm_json import IncrementalJSONParser, find_json, parse_json_lenient, repair_json, validate_fields
+
+
+@pytest.mark.parametrize('broken, expected', [
+    ('{"a": 1, "b": [1, 2,],}', {"a": 1, "b": [1, 2]}),
+    ('{name: "x", skills: ["Python"]}', {"name": "x", "skills": ["Python"]}),
+    ('{"a": None, "b": True, "c": False}', {"a": None, "b": True, "c": False}),
+    ('{"summary": "cut off mid', {"summary": "cut off mid"}),
+    ('{"a": 1, "flag": tru', {"a": 1}),
+    ('{"a": 1, "flag": true', {"a": 1, "flag": True}),
+    ('{"a": 1, "b": nul', {"a": 1}),
+    ('{"a": 1, "n": 12.', {"a": 1, "n": 12}),
+    ('{"a": 1, "n": -', {"a": 1}),
+    ('{"a": 1.5e3, "b": 2e', {"a": 1500.0, "b": 2}),
+    ('{"a": 1, "dangling', {"a": 1}),
+    ('{"a": 1, "b":', {"a": 1}),
+    ('{"a": [1, 2', {"a": [1, 2]}),
+    ('{"a": {"b": "c"}, ', {"a": {"b": "c"}}),
+])
+def test_repair_json(broken, expected):
+    assert json.loads(repair_json(broken)) == expected
+
+
+def test_find_json_skips_fences_and_prose():
+    text = 'Sure! ```json\n{"a": {"b": "}"}}\n``` done'
+    assert find_json(text) == '{"a": {"b": "}"}}'
+    assert find_json("no json here") == ""
+
+
+def test_parse_json_lenient_tries_later_candidates():
+    text = 'Here is the text [not json] then {"a": 1}'
+    assert parse_json_lenient(text) == ({"a": 1}, False)
+    assert parse_json_lenient('See [1] for details: {"a": [1]}', dict) == ({"a": [1]}, False)
+    assert parse_json_lenient('Note {"a": 1}: ["x", "y"]', list) == (["x", "y"], False)
+
+
+def test_parse_json_lenient_repairs_and_reports():
+    assert parse_json_lenient('```json\n{"a": 1,}\n```') == ({"a": 1}, True)
+    assert parse_json_lenient('{"a": 1, "flag": tru') == ({"a": 1}, True)
+    assert parse_json_lenient("nothing") == (None, False)
+
+
+def test_parse_json_lenient_prefers_truncated_outer_object():
+    text = '{"info": {"name": "Jane"}, "years": 2, "summary": "Builds'
+    assert parse_json_lenient(text, dict) == ({"info": {"name": "Jane"}, "years": 2, "summary": "Builds"}, True)
+
+
+def test_validate_fields():
+    schema = {"name": str, "skills": list, "years": (int, float)}
+    assert validate_fields({"name": "x", "skills": [], "years": 2.5}, schema) == []
+    assert validate_fields({"name": None, "skills": "Python"}, schema) == ["skills", "years"]
+    assert validate_fields(["not", "a", "dict"], schema, ["name"]) == ["name"]
+
+
+def test_validate_fields_rejects_null_lists_and_objects():
+    schema = {"technical_skills": list, "experience": dict, "career_summary": str}
+    value = {"technical_skills": None, "experience": None, "career_summary": None}
+    assert validate_fields(value, schema) == ["technical_skills", "experience"]
+
+
+def test_incremental_parser_yields_fields_as_they_complete():
+    parser = IncrementalJSONParser()
+    assert parser.feed('```json\n{"a": 1, "b": [1, ') == [("a", 1)]
+    assert parser.feed('2,], "c": "x"}') == [("b", [1, 2]), ("c", "x")]
+    assert parser.done
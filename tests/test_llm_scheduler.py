@@ -0,0 +1,136 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils import llm_client, llm_scheduler
+from src.utils.llm_client import LLMClient, StubBackend
+from src.utils.llm_scheduler import LLMScheduler, TokenBucket
+
+
+class FakeClock:
+    """monotonic()/sleep() pair where sleeping just advances the clock"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(llm_scheduler, 'time', SimpleNamespace(monotonic=fake.monotonic, sleep=fake.sleep))
+    return fake
+
+
+class ResourceExhausted(Exception):
+    """Named like google.api_core's 429 error"""
+
+
+class FlakyBackend(StubBackend):
+    """Fails with the given errors first, then answers"""
+
+    def __init__(self, errors, response='ok'):
+        super().__init__(response)
+        self.errors = list(errors)
+
+    def generate(self, prompt):
+        self.prompts.append(prompt)
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.response
+
+    def generate_stream(self, prompt, chunk_size=16):
+        self.prompts.append(prompt)
+        if self.errors:
+            raise self.errors.pop(0)
+        yield from ['o', 'k']
+
+
+def test_token_bucket_paces_after_burst(clock):
+    bucket = TokenBucket(rate_per_second=2, capacity=2)
+    waits = [bucket.acquire() for _ in range(4)]
+    assert waits == [0, 0, pytest.approx(0.5), pytest.approx(0.5)]
+    assert clock.now == pytest.approx(1.0)
+
+    # A long idle period refills only up to capacity
+    clock.now += 60
+    assert [bucket.acquire() for _ in range(3)] == [0, 0, pytest.approx(0.5)]
+
+
+def test_identical_prompts_in_flight_are_coalesced():
+    backend = StubBackend(lambda prompt: f"answer to {prompt}", delay=0.2)
+    scheduler = LLMScheduler(rate_per_second=100, burst=100)
+    client = LLMClient(backend, scheduler)
+    barrier = threading.Barrier(5)
+    results = []
+
+    def call():
+        barrier.wait()
+        results.append(client.generate('same prompt'))
+
+    threads = [threading.Thread(target=call) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == ['answer to same prompt'] * 5
+    assert backend.prompts == ['same prompt']
+    assert scheduler.stats()['coalesced'] == 4
+    assert scheduler.stats()['in_flight'] == 0
+
+    client.generate('other prompt')
+    assert len(backend.prompts) == 2
+
+
+def test_transient_errors_retry_with_jittered_backoff(clock, monkeypatch):
+    bounds = []
+    monkeypatch.setattr(llm_scheduler, 'random',
+                        SimpleNamespace(uniform=lambda low, high: bounds.append((low, high)) or high / 2))
+    scheduler = LLMScheduler(rate_per_second=100, burst=100, base_delay=0.5, max_delay=1.5)
+    backend = FlakyBackend([ResourceExhausted(), ResourceExhausted(), ResourceExhausted()])
+
+    assert LLMClient(backend, scheduler).generate('p') == 'ok'
+    # Full jitter over [0, min(max_delay, base * 2^attempt)]
+    assert bounds == [(0, 0.5), (0, 1.0), (0, 1.5)]
+    assert clock.sleeps == [0.25, 0.5, 0.75]
+    assert scheduler.stats()['retries'] == 3
+    assert scheduler.stats()['calls'] == 4
+
+
+def test_permanent_errors_and_exhausted_retries_raise(clock):
+    scheduler = LLMScheduler(rate_per_second=100, burst=100, max_retries=1)
+    with pytest.raises(ValueError):
+        LLMClient(FlakyBackend([ValueError('bad key')]), scheduler).generate('p')
+    with pytest.raises(ResourceExhausted):
+        LLMClient(FlakyBackend([ResourceExhausted(), ResourceExhausted()]), scheduler).generate('q')
+    assert scheduler.stats()['failures'] == 2
+    assert scheduler.stats()['retries'] == 1
+
+
+def test_streams_retry_only_before_the_first_chunk(clock):
+    scheduler = LLMScheduler(rate_per_second=100, burst=100)
+    backend = FlakyBackend([ResourceExhausted()])
+    assert list(LLMClient(backend, scheduler).generate_stream('p')) == ['o', 'k']
+    assert scheduler.stats()['retries'] == 1
+
+
+def test_clients_share_one_scheduler_and_key(monkeypatch):
+    monkeypatch.setattr(llm_client, '_clients', {})
+    monkeypatch.setattr(llm_client, '_scheduler', None)
+    monkeypatch.setattr(llm_client, '_configured_key', None)
+
+    flash = llm_client.get_llm_client('test-key', 'model-a')
+    pro = llm_client.get_llm_client('test-key', 'model-b')
+    assert flash is llm_client.get_llm_client('test-key', 'model-a')
+    assert flash is not pro and flash.scheduler is pro.scheduler
+    with pytest.raises(ValueError):
+        llm_client.get_llm_client('other-key', 'model-a')
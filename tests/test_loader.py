@@ -0,0 +1,71 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import loader
+from src.loader import apply_model_salaries, apply_salary_csv, build_salary_grid
+from src.model import SalaryModelService, _make_pipeline
+from src.model_artifact import save_model_artifact
+
+
+@pytest.fixture
+def model_service(tmp_path):
+    pairs = pd.DataFrame({'Role': ['Software Engineer', 'Data Scientist'] * 50,
+                          'State': ['TX', 'TX', 'CA', 'CA'] * 25})
+    salary = np.where(pairs['State'] == 'TX', 100_000, 150_000) + np.where(pairs['Role'] == 'Data Scientist', 7_000, 0)
+    model = _make_pipeline('forest', n_estimators=5, n_jobs=1).fit(pairs, salary)
+    save_model_artifact(model, str(tmp_path / 'model'), training_rows=len(pairs))
+    return SalaryModelService(str(tmp_path / 'model'))
+
+
+def test_model_salaries_replace_known_pairs_in_one_call(model_service):
+    grid = build_salary_grid()
+    scored = apply_model_salaries(grid, model_service)
+
+    assert model_service.predict_calls == 1
+    assert scored.dtypes.equals(grid.dtypes)
+    austin = scored[(scored['City'] == 'Austin') & (scored['Category'] == 'Software Engineer')]
+    assert austin['Salary'].item() == pytest.approx(100_000, rel=0.01)
+
+    known = (scored['Category'].isin(['Software Engineer', 'Data Scientist'])
+             & scored['State'].isin(['TX', 'CA'])).to_numpy()
+    unchanged = grid[~known].reset_index(drop=True)
+    pd.testing.assert_frame_equal(scored[~known].reset_index(drop=True), unchanged)
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(loader, 'DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(loader, 'SALARIES_CSV', str(tmp_path / 'salaries.csv'))
+    return tmp_path
+
+
+def test_new_grid_replaces_stale_grids(data_dir):
+    stale = data_dir / 'salary_grid-000000000000.parquet'
+    stale.write_bytes(b'old')
+    (data_dir / 'other.parquet').write_bytes(b'keep')
+
+    loader.load_dataset()
+    assert sorted(p.name for p in data_dir.iterdir()) == ['other.parquet', os.path.basename(loader.grid_path())]
+
+
+def test_malformed_csv_falls_back_to_built_grid(data_dir):
+    (data_dir / 'salaries.csv').write_text('Category,Salary\nSoftware Engineer,not a number\n')
+    grid = loader.load_dataset(csv_hash='bad')
+    pd.testing.assert_frame_equal(grid, build_salary_grid())
+    assert not os.path.exists(loader.grid_path('bad'))
+
+
+def test_csv_overrides_match_on_state():
+    grid = pd.concat([build_salary_grid(), build_salary_grid().query("City == 'Columbus'").assign(State='GA')],
+                     ignore_index=True).astype(loader.GRID_DTYPES)
+    salaries = pd.DataFrame({'Category': ['Data Scientist'], 'City': ['Columbus'], 'State': ['GA'],
+                             'Salary': [123_456]})
+    merged = apply_salary_csv(grid, salaries)
+
+    columbus = merged[(merged['City'] == 'Columbus') & (merged['Category'] == 'Data Scientist')]
+    assert len(merged) == len(grid)
+    assert dict(zip(columbus['State'], columbus['Salary'])) == {
+        'OH': grid.loc[columbus.index[0], 'Salary'], 'GA': 123_456}
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.logic import (
+    GROWTH_SCENARIOS,
+    LIFESTYLE_COSTS,
+    calculate_taxes,
+    calculate_thriving_score,
+    calculate_thriving_score_vectorized,
+    project_5yr_wealth,
+    project_5yr_wealth_vectorized,
+    project_savings,
+    project_savings_vectorized,
+    project_wealth_timeline,
+    score_dataframe,
+)
+
+
+@pytest.fixture
+def rows():
+    rng = np.random.default_rng(0)
+    n = 500
+    return {
+        'monthly_net': rng.integers(1_000, 20_000, n),
+        'rent': rng.integers(500, 6_000, n),
+        'col': np.concatenate([[0, 0], rng.integers(40, 180, n - 2)]),
+        'loan': rng.uniform(0, 2_000, n),
+    }
+
+
+def test_thriving_score_matches_scalar(rows):
+    col = np.where(rows['col'] == 0, 100, rows['col'])
+    vectorized = calculate_thriving_score_vectorized(rows['monthly_net'], rows['rent'], col)
+    expected = [calculate_thriving_score(n, r, c) for n, r, c in zip(rows['monthly_net'], rows['rent'], col)]
+    assert vectorized.tolist() == expected
+
+
+@pytest.mark.parametrize('lifestyle', [*LIFESTYLE_COSTS, 1234, 'Unknown'])
+def test_project_savings_matches_scalar(rows, lifestyle):
+    vectorized = project_savings_vectorized(rows['monthly_net'], rows['rent'], rows['loan'], lifestyle)
+    expected = [project_savings(n, r, l, lifestyle) for n, r, l in zip(rows['monthly_net'], rows['rent'], rows['loan'])]
+    assert vectorized.tolist() == expected
+
+
+def test_project_savings_accepts_lifestyle_names_per_row(rows):
+    names = np.resize(list(LIFESTYLE_COSTS), len(rows['rent']))
+    vectorized = project_savings_vectorized(rows['monthly_net'], rows['rent'], 0, names)
+    expected = [project_savings(n, r, 0, name) for n, r, name in zip(rows['monthly_net'], rows['rent'], names)]
+    assert vectorized.tolist() == expected
+
+
+def test_project_5yr_wealth_matches_scalar(rows):
+    # Includes COL index 0, which both versions treat as 50
+    vectorized = project_5yr_wealth_vectorized(rows['monthly_net'], rows['rent'], rows['col'])
+    expected = [project_5yr_wealth(n, r, c) for n, r, c in zip(rows['monthly_net'], rows['rent'], rows['col'])]
+    assert vectorized.tolist() == expected
+
+
+def test_score_dataframe_matches_scalar():
+    df = pd.DataFrame({
+        'City': ['Austin', 'New York', 'Columbus', 'Seattle'],
+        'State': ['TX', 'NY', 'OH', 'WA'],
+        'Salary': [95_000, 150_000, 72_000, 210_000],
+        'Rent': [1_600, 3_800, 1_200, 2_600],
+        'COL': [65, 100, 55, 90],
+    })
+    scored = score_dataframe(df, loan_payment=300, lifestyle='Frugal')
+
+    for row in scored.itertuples():
+        net = calculate_taxes(row.Salary, row.State, row.City)
+        assert row.Monthly_Net == net
+        assert row.Thriving_Score == calculate_thriving_score(net, row.Rent, row.COL)
+        assert row.Monthly_Savings == project_savings(net, row.Rent, 300, 'Frugal')
+        assert row.Wealth_5yr == project_5yr_wealth(net, row.Rent, row.COL)
+
+
+def test_wealth_timeline_default_growth_matches_5yr_wealth(rows):
+    timeline = project_wealth_timeline(rows['monthly_net'], rows['rent'], rows['col'])
+    expected = [project_5yr_wealth(n, r, c) for n, r, c in zip(rows['monthly_net'], rows['rent'], rows['col'])]
+    assert [max(0, int(w)) for w in timeline[0, :, 4]] == expected
+
+
+def test_wealth_timeline_shape():
+    # (scenarios, cities, years); [..., t] is the total after year t + 1
+    assert project_wealth_timeline(5_000, 1_500, 80, years=12).shape == (1, 1, 12)
+    assert project_wealth_timeline([5_000, 7_000, 9_000], [1_500, 2_500, 3_000], 80, years=30,
+                                   scenarios=GROWTH_SCENARIOS).shape == (3, 3, 30)
+    assert project_wealth_timeline(5_000, 1_500, 80, years=0).shape == (1, 1, 0)
+
+
+def test_wealth_timeline_compounds_investment_return():
+    no_growth = {'raise': 0, 'rent_inflation': 0, 'expense_inflation': 0}
+    r = 0.07
+    # Living expenses at COL 100 are 1,200/month, so 4,000 - 1,800 - 1,200 = 1,000/month saved
+    timeline = project_wealth_timeline(4_000, 1_800, 100, years=10,
+                                       scenarios=[no_growth, dict(no_growth, investment_return=r)])
+    t = np.arange(1, 11)
+    np.testing.assert_allclose(timeline[0, 0], 12_000 * t)
+    # Savings added at the end of each year, then grown at r: annuity future value
+    np.testing.assert_allclose(timeline[1, 0], 12_000 * ((1 + r) ** t - 1) / r)
+
+
+def test_wealth_timeline_scenarios_keep_their_order():
+    timeline = project_wealth_timeline(6_000, 2_000, 90, years=20, scenarios=GROWTH_SCENARIOS)
+    pessimistic, expected, optimistic = timeline[:, 0, -1]
+    assert pessimistic < expected < optimistic
+    np.testing.assert_array_equal(timeline[1], project_wealth_timeline(6_000, 2_000, 90, years=20,
+                                                                        scenarios=[GROWTH_SCENARIOS['Expected']])[0])
@@ -0,0 +1,28 @@
+import tracemalloc
+
+import pytest
+
+from src import model
+
+
+@pytest.fixture
+def model_paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(model, 'MODEL_PATH', str(tmp_path / 'salary_model'))
+    monkeypatch.setattr(model, 'TABLE_PATH', str(tmp_path / 'salary_table.npz'))
+    return tmp_path
+
+
+def test_memory_profile_is_opt_in(model_paths):
+    report = model.train_model(n_estimators=3, n_jobs=1)
+    assert report['peak_memory_mb'] is None
+    assert not tracemalloc.is_tracing()
+
+    report = model.train_model(n_estimators=3, n_jobs=1, profile=True)
+    assert report['peak_memory_mb'] > 0
+    assert not tracemalloc.is_tracing()
+
+
+def test_tracing_stops_when_training_fails(model_paths):
+    with pytest.raises(ValueError):
+        model.train_model(estimator='unknown', profile=True)
+    assert not tracemalloc.is_tracing()
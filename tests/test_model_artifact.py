@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.model import _make_pipeline
+from src.model_artifact import ArtifactError, ForestArtifact, PipelineArtifact, load_model_artifact, save_model_artifact
+
+
+@pytest.fixture
+def training_data():
+    rng = np.random.default_rng(0)
+    roles = rng.choice(['Software Engineer', 'Data Scientist', 'UX Designer', 'Nurse'], 400)
+    states = rng.choice(['TX', 'CA', 'NY', 'OH', 'WA'], 400)
+    salary = (80_000 + 30_000 * (roles == 'Software Engineer') + 20_000 * (states == 'CA')
+              + rng.normal(0, 5_000, 400))
+    return pd.DataFrame({'Role': roles, 'State': states}), salary
+
+
+def queries():
+    # Includes categories the model never saw
+    return pd.DataFrame({'Role': ['Software Engineer', 'Nurse', 'Pilot', 'UX Designer'],
+                         'State': ['CA', 'TX', 'NY', 'ZZ']})
+
+
+def test_forest_round_trip_matches_sklearn(tmp_path, training_data):
+    X, y = training_data
+    model = _make_pipeline('forest', n_estimators=8, n_jobs=1).fit(X, y)
+    save_model_artifact(model, str(tmp_path / 'model'), training_rows=len(X))
+
+    artifact = load_model_artifact(str(tmp_path / 'model'), verify=True)
+    assert isinstance(artifact, ForestArtifact)
+    np.testing.assert_allclose(artifact.predict(queries()), model.predict(queries()))
+    np.testing.assert_allclose(artifact.predict(X), model.predict(X))
+
+
+def test_overwrite_leaves_no_stale_files(tmp_path, training_data):
+    X, y = training_data
+    path = tmp_path / 'model'
+    save_model_artifact(_make_pipeline('forest', n_estimators=4, n_jobs=1).fit(X, y), str(path), len(X))
+    hgb = _make_pipeline('hgb', n_estimators=0, n_jobs=1).fit(X, y)
+    save_model_artifact(hgb, str(path), len(X))
+
+    assert sorted(p.name for p in path.iterdir()) == ['metadata.json', 'pipeline.joblib']
+    assert [p.name for p in tmp_path.iterdir()] == ['model']
+    artifact = load_model_artifact(str(path))
+    assert isinstance(artifact, PipelineArtifact)
+    np.testing.assert_allclose(artifact.predict(queries()), hgb.predict(queries()))
+
+
+def test_truncated_file_is_rejected(tmp_path, training_data):
+    X, y = training_data
+    path = tmp_path / 'model'
+    save_model_artifact(_make_pipeline('forest', n_estimators=2, n_jobs=1).fit(X, y), str(path), len(X))
+    with open(path / 'value.npy', 'r+b') as f:
+        f.truncate(64)
+    with pytest.raises(ArtifactError):
+        load_model_artifact(str(path))
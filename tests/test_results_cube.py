@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.logic import (
+    BUDGET_LIFESTYLE_COSTS,
+    LOAN_PAYMENT_PER_10K,
+    build_results_cube,
+    calculate_taxes,
+    calculate_thriving_score,
+    city_key,
+    lookup_results,
+    project_5yr_wealth,
+    project_savings,
+)
+
+
+@pytest.fixture
+def grid():
+    # Columbus appears in two states: the cube must keep both
+    cities = [('New York', 'NY', 2900, 100), ('Columbus', 'OH', 1200, 72),
+              ('Columbus', 'GA', 1000, 68), ('Austin', 'TX', 1600, 65),
+              ('Denver', 'CO', 1800, 88)]
+    careers = {'Software': 120_000, 'Teaching': 52_000, 'Nursing': 81_500}
+    rows = [
+        {'Category': career, 'City': city, 'State': state, 'Rent': rent, 'COL': col,
+         'Salary': salary * (1 + 0.1 * n)}
+        for career, salary in careers.items()
+        for n, (city, state, rent, col) in enumerate(cities)
+    ]
+    return pd.DataFrame(rows)
+
+
+def scalar_results(row, lifestyle, debt):
+    """The Budget Lab numbers as the app computed them before the cube"""
+    monthly_net = calculate_taxes(row['Salary'], row['State'], row['City'])
+    loan_payment = (debt / 10000) * LOAN_PAYMENT_PER_10K
+    return {
+        'Monthly_Net': monthly_net,
+        'Monthly_Savings': project_savings(monthly_net, row['Rent'], loan_payment, BUDGET_LIFESTYLE_COSTS[lifestyle]),
+        'Thriving_Score': calculate_thriving_score(monthly_net, row['Rent'], row['COL']),
+        'Wealth_5yr': project_5yr_wealth(monthly_net, row['Rent'], row['COL']),
+        'Loan_Payment': loan_payment,
+        'Rent': row['Rent'],
+    }
+
+
+@pytest.mark.parametrize('debt', [0, 10_000, 50_000, 120_000, 500_000])
+@pytest.mark.parametrize('lifestyle', list(BUDGET_LIFESTYLE_COSTS))
+def test_lookup_matches_scalar_on_buckets(grid, lifestyle, debt):
+    cube = build_results_cube(grid)
+    for _, row in grid.iterrows():
+        results = lookup_results(cube, row['Category'], city_key(row['City'], row['State']), lifestyle, debt)
+        expected = scalar_results(row, lifestyle, debt)
+        for name, value in expected.items():
+            assert results[name] == pytest.approx(value), (row['Category'], row['City'], name)
+
+
+def test_duplicate_city_names_stay_separate(grid):
+    cube = build_results_cube(grid)
+    assert 'Columbus, OH' in cube['cities'] and 'Columbus, GA' in cube['cities']
+    ohio = lookup_results(cube, 'Software', 'Columbus, OH', 'Balanced', 0)
+    georgia = lookup_results(cube, 'Software', 'Columbus, GA', 'Balanced', 0)
+    assert ohio['Rent'] == 1200 and georgia['Rent'] == 1000
+    assert ohio['Monthly_Net'] != georgia['Monthly_Net']
+
+
+def test_lookup_interpolates_between_debt_buckets(grid):
+    cube = build_results_cube(grid)
+    low = lookup_results(cube, 'Nursing', 'Austin, TX', 'Frugal', 20_000)
+    high = lookup_results(cube, 'Nursing', 'Austin, TX', 'Frugal', 30_000)
+    mid = lookup_results(cube, 'Nursing', 'Austin, TX', 'Frugal', 25_000)
+    assert mid['Loan_Payment'] == pytest.approx(25_000 / 10_000 * LOAN_PAYMENT_PER_10K)
+    assert low['Monthly_Savings'] > mid['Monthly_Savings'] > high['Monthly_Savings']
+    assert mid['Monthly_Net'] == low['Monthly_Net'] == high['Monthly_Net']
+
+    row = grid[(grid['Category'] == 'Nursing') & (grid['City'] == 'Austin')].iloc[0]
+    assert abs(mid['Monthly_Savings'] - scalar_results(row, 'Frugal', 25_000)['Monthly_Savings']) <= 1
+
+
+def test_cube_fields_are_read_only_views(grid):
+    cube = build_results_cube(grid)
+    assert cube['Monthly_Net'].shape == cube['Monthly_Savings'].shape
+    assert not cube['Monthly_Net'].flags.writeable
+    with pytest.raises(KeyError):
+        lookup_results(cube, 'Software', 'Columbus', 'Balanced', 0)
@@ -0,0 +1,61 @@
+import json
+
+from src.utils.llm_cache import ResponseCache
+from src.utils.llm_client import LLMClient, StubBackend
+from src.utils.resume_parser import ANALYSIS_FIELDS, LOCAL_CONFIDENCE_THRESHOLD, AIResumeParser, extract_resume_locally
+
+RESUME = """Jane Doe
+jane@example.com | Austin, TX
+Experience
+Senior Data Scientist, Acme Corp  Jan 2021 - Present
+Data Analyst at Initech  Jun 2018 - Dec 2020
+Education
+B.S. in Computer Science, University of Texas, 2018
+Skills: Python, SQL, Machine Learning, Tableau. Leadership and communication."""
+
+
+def test_experience_sub_fields_are_filled_locally():
+    analysis, confidence = extract_resume_locally(RESUME)
+    assert analysis['experience']['current_title'] == 'Senior Data Scientist'
+    assert analysis['experience']['previous_titles'] == ['Data Analyst']
+    assert analysis['experience']['companies'] == ['Acme Corp', 'Initech']
+    assert confidence['experience'] >= LOCAL_CONFIDENCE_THRESHOLD
+
+
+def test_unfilled_fields_are_escalated():
+    text = RESUME.replace(', Acme Corp', '').replace(' at Initech', '').replace(' Leadership and communication.', '')
+    analysis, confidence = extract_resume_locally(text)
+    assert analysis['experience']['companies'] == []
+    assert analysis['soft_skills'] == []
+    assert confidence['experience'] < LOCAL_CONFIDENCE_THRESHOLD
+    assert confidence['soft_skills'] < LOCAL_CONFIDENCE_THRESHOLD
+
+
+def test_null_technical_skills_are_requested_again(tmp_path):
+    def respond(prompt):
+        asked = [line.split(':')[0] for line in prompt.split('RESUME:')[0].splitlines()
+                 if line.split(':')[0] in ANALYSIS_FIELDS]
+        if 'soft_skills' in asked:
+            return json.dumps({'technical_skills': None, 'soft_skills': ['Teamwork'], 'career_summary': None})
+        assert 'technical_skills' in asked
+        return json.dumps({'technical_skills': ['Python', 'SQL']})
+
+    backend = StubBackend(respond)
+    parser = AIResumeParser(client=LLMClient(backend), cache=ResponseCache(str(tmp_path / 'cache.sqlite')))
+    analysis = parser.analyze_with_ai(RESUME)
+
+    assert len(backend.prompts) == 2
+    assert analysis['technical_skills'] == ['Python', 'SQL']
+    summary = parser.build_summary(RESUME, analysis)
+    assert summary['total_skills'] == 3
+    assert 'python' in parser.get_skills_for_matching()
+
+
+def test_null_lists_left_after_retry_are_dropped(tmp_path):
+    backend = StubBackend(json.dumps({'technical_skills': None, 'soft_skills': ['Teamwork']}))
+    parser = AIResumeParser(client=LLMClient(backend), cache=ResponseCache(str(tmp_path / 'cache.sqlite')))
+    analysis = parser.analyze_with_ai(RESUME)
+
+    assert 'technical_skills' not in analysis
+    assert parser.build_summary(RESUME, analysis)['total_skills'] == 1
+    assert parser.get_skills_for_matching() == {'teamwork'}
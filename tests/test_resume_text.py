@@ -0,0 +1,42 @@
+from src.utils.resume_text import compact_resume, estimate_tokens, normalize_resume
+
+
+def _page(*lines):
+    return "\n".join(lines)
+
+
+PAGES = [
+    _page("Jane Doe | jane@example.com", "Experience", "Software Engineer, Acme",
+          "2023", "Built the landing page", "Landing page 2", "Wrote unit tests", "Page 1 of 2"),
+    _page("Jane Doe | jane@example.com", "Intern, Initech", "2024", "Wrote unit tests",
+          "Education", "B.S. Computer Science", "Jane Doe - Page 2"),
+]
+
+
+def test_keeps_years_body_text_and_repeated_bullets():
+    lines = normalize_resume(PAGES)
+    assert "2023" in lines and "2024" in lines
+    assert "Landing page 2" in lines
+    assert lines.count("Wrote unit tests") == 2
+
+
+def test_drops_headers_and_page_numbers():
+    lines = normalize_resume(PAGES)
+    assert lines.count("Jane Doe | jane@example.com") == 1
+    assert "Page 1 of 2" not in lines
+    assert "Jane Doe - Page 2" not in lines
+    assert normalize_resume([_page("Summary", "Python developer", "3")]) == ["Summary", "Python developer"]
+
+
+def test_compact_resume_keeps_dates_within_budget():
+    result = compact_resume(PAGES)
+    assert "2023" in result["text"] and "2024" in result["text"]
+    assert result["dropped_sections"] == []
+
+
+def test_compact_resume_drops_low_priority_sections_first():
+    pages = [_page("Jane Doe", "Skills", "Python, SQL", "Interests", *["Hiking and chess"] * 50)]
+    result = compact_resume(pages, token_budget=20)
+    assert "Python, SQL" in result["text"]
+    assert result["dropped_sections"] == ["interests"]
+    assert estimate_tokens(result["text"]) <= 20
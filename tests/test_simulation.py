@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from src.simulation import CHUNK_SIZE, simulate_wealth
+
+NET = np.array([4000.0, 6500.0, 9000.0])
+RENT = np.array([1200.0, 2400.0, 3100.0])
+COL = np.array([65.0, 100.0, 0.0])
+
+
+def assert_same_bands(a, b):
+    assert a.keys() == b.keys()
+    for name in a:
+        np.testing.assert_array_equal(a[name], b[name])
+
+
+def test_same_seed_gives_identical_percentiles():
+    first = simulate_wealth(NET, RENT, COL, years=4, n_paths=5_000, seed=7)
+    assert_same_bands(first, simulate_wealth(NET, RENT, COL, years=4, n_paths=5_000, seed=7))
+    assert first['P10'].shape == (3, 4)
+    assert np.all(first['P10'] <= first['P50']) and np.all(first['P50'] <= first['P90'])
+
+
+def test_worker_count_does_not_change_results():
+    n_paths = 2 * CHUNK_SIZE + 1_000
+    single = simulate_wealth(NET, RENT, COL, years=3, n_paths=n_paths, seed=3, n_jobs=1)
+    assert_same_bands(single, simulate_wealth(NET, RENT, COL, years=3, n_paths=n_paths, seed=3, n_jobs=2))
+
+
+def test_scalars_broadcast_against_city_arrays():
+    mixed = simulate_wealth(5000, RENT, 80, years=3, n_paths=2_000, seed=1)
+    full = simulate_wealth(np.full(3, 5000.0), RENT, np.full(3, 80.0), years=3, n_paths=2_000, seed=1)
+    assert mixed['P50'].shape == (3, 3)
+    assert_same_bands(mixed, full)
+    assert simulate_wealth(5000, 1500, 90, years=2, n_paths=1_000, seed=1)['P50'].shape == (1, 2)
+
+
+def test_long_horizons_are_capped():
+    capped = simulate_wealth(NET, RENT, COL, years=10, n_paths=10_000, seed=5, max_path_years=20_000)
+    assert_same_bands(capped, simulate_wealth(NET, RENT, COL, years=10, n_paths=2_000, seed=5, max_path_years=None))
+
+
+def test_no_paths_gives_nan_bands():
+    bands = simulate_wealth(NET, RENT, COL, years=2, n_paths=0)
+    assert bands['P50'].shape == (3, 2) and np.isnan(bands['P50']).all()
@@ -0,0 +1,57 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.utils.skills_taxonomy import TAXONOMY_PATH, SkillsTaxonomy, get_taxonomy
+
+SMALL = {
+    "version": 1,
+    "default_role_skills": ["Python", "Communication"],
+    "skills": {
+        "Python": {"aliases": ["py"]},
+        "Machine Learning": {"aliases": ["ml", "Machine  learning"]},
+        "Communication": {},
+    },
+    "roles": {
+        "Data Scientist": {"Python": 1.0, "Machine Learning": 2.0},
+        "Analyst": {"Communication": 0.5},
+    },
+}
+
+
+def test_unknown_role_skill_is_rejected():
+    data = dict(SMALL, roles={"Data Scientist": {"Python": 1.0, "Spark": 1.0}})
+    with pytest.raises(ValueError, match="Spark"):
+        SkillsTaxonomy(data)
+
+
+def test_canonical_resolves_aliases():
+    taxonomy = SkillsTaxonomy(SMALL)
+    assert taxonomy.canonical("PY") == "Python"
+    assert taxonomy.canonical("  machine   LEARNING ") == "Machine Learning"
+    assert taxonomy.canonical("ml") == "Machine Learning"
+    assert taxonomy.canonical("Rust") is None
+
+
+def test_role_skills_fall_back_to_defaults():
+    taxonomy = SkillsTaxonomy(SMALL)
+    assert taxonomy.role_skills("Data Scientist") == ["Python", "Machine Learning"]
+    assert taxonomy.role_skills("Astronaut") == ["Python", "Communication"]
+    assert taxonomy.skill_roles["Python"] == ["Data Scientist"]
+
+
+def test_role_matrix_matches_taxonomy_file():
+    with open(TAXONOMY_PATH, encoding='utf-8') as f:
+        data = json.load(f)
+    taxonomy = get_taxonomy()
+    matrix = taxonomy.role_matrix.toarray()
+
+    assert matrix.shape == (len(data["roles"]), len(data["skills"]))
+    for i, (role, skills) in enumerate(data["roles"].items()):
+        assert taxonomy.role_names[i] == role
+        expected = np.zeros(len(taxonomy.skills), dtype=np.float32)
+        for skill, weight in skills.items():
+            expected[taxonomy.skill_index[skill]] = weight
+        np.testing.assert_array_equal(matrix[i], expected)
+        assert [taxonomy.skills[j] for j in taxonomy.role_columns[i]] == list(skills)
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from src.logic import calculate_taxes, calculate_taxes_vectorized
+from src.taxes import BracketSchedule, get_tax_tables
+
+
+def bracket_walk(income, brackets, standard_deduction=0):
+    """Reference: tax each bracket slice in turn"""
+    taxable = max(income - standard_deduction, 0)
+    tax = 0.0
+    for n, (threshold, rate) in enumerate(brackets):
+        top = brackets[n + 1][0] if n + 1 < len(brackets) else float('inf')
+        if taxable > threshold:
+            tax += (min(taxable, top) - threshold) * rate
+    return tax
+
+
+FEDERAL = [[0, 0.10], [11925, 0.12], [48475, 0.22], [103350, 0.24],
+           [197300, 0.32], [250525, 0.35], [626350, 0.37]]
+
+
+def test_bracket_schedule_matches_bracket_walk():
+    schedule = BracketSchedule(FEDERAL, standard_deduction=15000)
+    thresholds = np.array([b[0] for b in FEDERAL]) + 15000
+    incomes = np.concatenate([[0, 1, 14999, 15000, 15001], thresholds - 1, thresholds, thresholds + 1,
+                              np.random.default_rng(0).uniform(0, 1_000_000, 500)])
+    expected = [bracket_walk(x, FEDERAL, 15000) for x in incomes]
+    np.testing.assert_allclose(schedule.tax(incomes), expected, atol=1e-6)
+
+
+def test_bracket_schedule_below_deduction_and_flat_amount():
+    schedule = BracketSchedule([[0, 0.0]], annual_amount=69)
+    assert schedule.tax([0, 50_000]).tolist() == [69, 69]
+    assert BracketSchedule(FEDERAL, 15000).tax(10_000) == 0
+
+
+def test_federal_plus_fica_in_no_tax_state():
+    # Federal on $85k taxable is $13,614; FICA on $100k is $7,650
+    assert get_tax_tables().annual_tax(100_000, 'TX')[0] == pytest.approx(21_264)
+    assert calculate_taxes(100_000, 'TX') == int((100_000 - 21_264) / 12)
+    assert get_tax_tables().annual_tax(0, 'TX')[0] == 0
+
+
+def test_fica_wage_base_and_additional_medicare():
+    tables = get_tax_tables()
+    assert tables.fica_tax(176_100) == pytest.approx(176_100 * 0.0765)
+    assert tables.fica_tax(190_000) == pytest.approx(176_100 * 0.062 + 190_000 * 0.0145)
+    assert tables.fica_tax(250_000) == pytest.approx(176_100 * 0.062 + 250_000 * 0.0145 + 50_000 * 0.009)
+
+
+def test_local_taxes():
+    tables = get_tax_tables()
+    gross = 90_000
+    ny_state = tables.annual_tax(gross, 'NY')[0]
+    assert tables.annual_tax(gross, 'NY', 'New York')[0] - ny_state == pytest.approx(
+        bracket_walk(gross, [[0, 0.03078], [12000, 0.03762], [25000, 0.03819], [50000, 0.03876]], 8000))
+    assert tables.annual_tax(gross, 'NY', 'Buffalo')[0] == ny_state
+    assert tables.annual_tax(gross, 'OH', 'Columbus')[0] - tables.annual_tax(gross, 'OH')[0] == pytest.approx(2250)
+    assert tables.annual_tax(gross, 'GA', 'Columbus')[0] == tables.annual_tax(gross, 'GA')[0]
+    assert tables.annual_tax(gross, 'CO', 'Denver')[0] - tables.annual_tax(gross, 'CO')[0] == pytest.approx(69)
+
+
+def test_unknown_state_uses_default_rate():
+    tables = get_tax_tables()
+    assert tables.annual_tax(80_000, 'ZZ')[0] - tables.annual_tax(80_000, 'TX')[0] == pytest.approx(4_000)
+
+
+def test_vectorized_matches_scalar():
+    rng = np.random.default_rng(1)
+    n = 300
+    states = rng.choice(['TX', 'CA', 'NY', 'OH', 'CO', 'GA', 'MA', 'ZZ'], n)
+    cities = rng.choice(['New York', 'Columbus', 'Denver', 'Austin'], n)
+    salaries = np.round(rng.uniform(0, 700_000, n), 2)
+
+    vectorized = calculate_taxes_vectorized(salaries, states, cities)
+    expected = [calculate_taxes(s, st, c) for s, st, c in zip(salaries, states, cities)]
+    assert vectorized.tolist() == expected
+    assert calculate_taxes_vectorized(salaries, states).tolist() == [
+        calculate_taxes(s, st) for s, st in zip(salaries, states)]